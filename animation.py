@@ -1,7 +1,6 @@
 import math
-import time
-import threading
-from config import ANIMATION_DELAY
+from config import ANIMATION_DELAY, MAX_PLAYBACK_SPEED
+from utils.frame_scheduler import FrameScheduler
 
 
 class AnimationController:
@@ -14,28 +13,32 @@ class AnimationController:
     """
 
     def __init__(self, canvas_component, update_callback=None, toggle_run_callback=None, on_complete_callback=None):
-        # canvas_component may be a SimulationCanvas instance or a tk.Canvas
+        # canvas_component may be a SimulationCanvas instance, a drawing backend or a tk.Canvas
         self.canvas_component = canvas_component
         self.canvas = getattr(canvas_component, 'canvas', canvas_component)
+        # Frames are scheduled with the Tk widget's `after`, not through the drawing backend
+        self.widget = getattr(self.canvas, 'widget', None) or self.canvas
         self.update_callback = update_callback
         self.toggle_run_callback = toggle_run_callback
         self.on_complete_callback = on_complete_callback
         self.is_animating = False
-        self.animation_thread = None
+        self.scheduler = None
+        self.results = None
         self.object_refs = None
 
     def start_animation(self, results, anim_speed, object_refs):
-        """Start animation in separate thread"""
+        """Start animation on the Tk main loop
+
+        `anim_speed` may be a number or a callable (e.g. a Scale's `get`),
+        in which case speed changes apply while the animation runs.
+        """
         if self.is_animating:
             return False
 
         self.object_refs = object_refs
+        self.results = results
         self.is_animating = True
-        self.animation_thread = threading.Thread(
-            target=self._animate_motion,
-            args=(results, anim_speed)
-        )
-        self.animation_thread.start()
+        self._animate_motion(results, anim_speed)
         return True
 
     # Compatibility wrapper expected by app.py
@@ -55,13 +58,17 @@ class AnimationController:
     def stop_animation(self):
         """Stop ongoing animation"""
         self.is_animating = False
+        if self.scheduler and self.scheduler.running:
+            # A stopped run still re-enables the UI and reports completion
+            self.scheduler.stop()
+            self._finish(self.results)
 
     # Compatibility wrapper expected by app.py
     def stop(self):
         self.stop_animation()
 
     def _animate_motion(self, results, anim_speed):
-        """Animation loop running in separate thread"""
+        """Drive the animation with a fixed-timestep FrameScheduler"""
         params = results['params']
         scenario = params['scenario']
         distance = params['d']
@@ -70,28 +77,34 @@ class AnimationController:
         force_angle = params['force_angle']
 
         steps = int(distance * 15)
-        speed_factor = 1.0 / anim_speed
-
-        for step in range(steps):
-            if not self.is_animating:
-                break
+        speed = anim_speed if callable(anim_speed) else (lambda: anim_speed)
+        state = {'step': 0, 'dx': 0.0, 'dy': 0.0}
 
+        def step():
+            if state['step'] >= steps:
+                return False
             # Calculate movement based on push mode
-            move_val = self._calculate_movement(push_mode, step, steps)
+            move_val = self._calculate_movement(push_mode, state['step'], steps)
 
             # Calculate displacement based on scenario
             dx, dy = self._calculate_displacement(scenario, move_val, angle, force_angle)
-
-            # Move object on canvas
-            self._move_object(dx, dy)
-
-            try:
-                self.canvas.update()
-            except Exception:
-                pass
-            time.sleep(ANIMATION_DELAY * speed_factor)
-
-        # Animation complete
+            state['dx'] += dx
+            state['dy'] += dy
+            state['step'] += 1
+            return state['step'] < steps
+
+        def render():
+            # Move object on canvas once per rendered frame
+            if state['dx'] or state['dy']:
+                self._move_object(state['dx'], state['dy'])
+                state['dx'] = state['dy'] = 0.0
+
+        self.scheduler = FrameScheduler(self.widget, step, render, dt=ANIMATION_DELAY, speed=speed,
+                                        on_finish=lambda: self._finish(results))
+        self.scheduler.start()
+
+    def _finish(self, results):
+        """Animation complete"""
         self.is_animating = False
         # Re-enable run button
         if self.toggle_run_callback:
@@ -131,14 +144,102 @@ class AnimationController:
 
     def _move_object(self, dx, dy):
         """Move object on canvas"""
-        if isinstance(self.object_refs, list):
-            for part in self.object_refs:
-                try:
-                    self.canvas.move(part, dx, dy)
-                except Exception:
-                    pass
+        scene = getattr(self.canvas_component, 'scene', None)
+        if scene is not None:
+            scene.node("object").move_by(dx, dy)
+            scene.flush()
+        elif self.object_refs is not None:
+            # canvas.move accepts an item id or a tag shared by every part
+            self.canvas.move(self.object_refs, dx, dy)
+
+
+class TrajectoryPlayer:
+    """Plays a precomputed Trajectory with pause, seek and variable speed
+
+    Each scheduler step only advances the playhead by one sample, so at high
+    speed the samples in between are skipped and just the frame reached is
+    rendered. `render_frame(index)` draws one sample; `speed` is a callable
+    read every tick.
+    """
+
+    def __init__(self, widget, render_frame, speed=None, on_finish=None, profiler=None):
+        self.widget = widget
+        self.render_frame = render_frame
+        self.speed = speed or (lambda: 1.0)
+        self.on_finish = on_finish
+        self.profiler = profiler
+        self.trajectory = None
+        self.index = 0
+        self.scheduler = None
+
+    @property
+    def playing(self):
+        return bool(self.scheduler and self.scheduler.running)
+
+    @property
+    def at_end(self):
+        return self.trajectory is not None and self.index >= len(self.trajectory) - 1
+
+    def load(self, trajectory):
+        """Replace the trajectory and show its first frame"""
+        self.pause()
+        self.trajectory = trajectory
+        self.index = 0
+        if trajectory is not None:
+            self.render_frame(0)
+
+    def play(self):
+        """Start or resume playback (from the start if at the end)"""
+        if self.trajectory is None or self.playing:
+            return
+        if self.at_end:
+            self.seek(0)
+        # Steps are an index increment, so a generous catch-up cap is cheap
+        self.scheduler = FrameScheduler(self.widget, self._step, self._render, dt=self.trajectory.dt,
+                                        speed=lambda: self.speed(),
+                                        max_steps_per_frame=int(MAX_PLAYBACK_SPEED * 10),
+                                        on_finish=self._finished, profiler=self.profiler)
+        self.scheduler.start()
+
+    def pause(self):
+        """Stop advancing but keep the playhead"""
+        if self.scheduler:
+            self.scheduler.stop()
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
         else:
-            try:
-                self.canvas.move(self.object_refs, dx, dy)
-            except Exception:
-                pass
\ No newline at end of file
+            self.play()
+
+    def seek(self, index):
+        """Jump to a sample index and draw it"""
+        if self.trajectory is None:
+            return
+        self.index = max(0, min(int(index), len(self.trajectory) - 1))
+        self.render_frame(self.index)
+
+    def seek_time(self, t):
+        if self.trajectory is not None:
+            self.seek(self.trajectory.index_at_time(t))
+
+    def seek_velocity(self, v):
+        """Jump to the first moment the speed reaches v; False if it never does"""
+        if self.trajectory is None:
+            return False
+        index = self.trajectory.index_at_velocity(v)
+        if index is None:
+            return False
+        self.seek(index)
+        return True
+
+    def _step(self):
+        self.index += 1
+        return self.index < len(self.trajectory) - 1
+
+    def _render(self):
+        self.render_frame(self.index)
+
+    def _finished(self):
+        if self.on_finish:
+            self.on_finish()
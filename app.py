@@ -1,42 +1,70 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import math
+from tkinter import ttk, messagebox, filedialog
 import time
-import threading
 import os
 from PIL import Image, ImageTk
-from config import COLORS, FONTS, SCENARIOS, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES, PUSH_MODES, CANVAS
+from config import (COLORS, FONTS, SCENARIOS, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES, PUSH_MODES, CANVAS,
+                    GHOST_RUNS, GRAPH_HEIGHT, RESIZE_SETTLE_MS)
 from quiz import ForceQuestQuiz
+from utils.jobs import JobManager
+from animation import TrajectoryPlayer
+from trajectory import compute_trajectory
+from recorder import record
+from utils.plotting import EnergyFigure
+from utils.frame_stats import FrameProfiler
+from utils.quality import QualityController
+from utils.run_history import RunHistory
+from utils.telemetry import run_channels
+from utils.telemetry_writer import TelemetryWriter
+from utils.texture_cache import TextureCache
+from utils.sprites import SpriteCache, OBJECT_SIZE
+from utils.backends import TkBackend
+from ui_components.run_scene import RunScene
+from ui_components.run_graph import RunGraph, GRAPH_VIEWS, GRAPH_AXES
 
 
 class ForceQuestApp:
     """Main application controller with real-time energy graph"""
     
-    def load_images(self):
-        """Load and prepare images for use on the tkinter Canvas"""
-        self.images = {}
-        surface_files = {
-            "Ice": "ice.png",
-            "Tile": "tiles.png",
-            "Wood": "wood.png",
-            "Concrete": "concrete.png",
-            "Sand": "sand.jpg",
-        }
-
-        canvas_w, canvas_h = CANVAS['width'], CANVAS['height']
+    SURFACE_FILES = {
+        "Ice": "ice.png",
+        "Tile": "tiles.png",
+        "Wood": "wood.png",
+        "Concrete": "concrete.png",
+        "Sand": "sand.jpg",
+    }
 
-        for surface, fname in surface_files.items():
+    def load_images(self):
+        """Decode surface textures in the background, then hand them to the texture cache"""
+        self.textures = TextureCache({}, wrap=ImageTk.PhotoImage)
+        self.job_manager.submit("Loading textures", self._decode_images,
+                                CANVAS['width'], on_done=self._install_images)
+
+    def _decode_images(self, job, canvas_w):
+        """Worker: open every texture and resize it for the starting canvas (no Tk calls here)"""
+        sources = {}
+        for i, (surface, fname) in enumerate(self.SURFACE_FILES.items()):
+            job.token.check()
+            job.report(i / len(self.SURFACE_FILES), surface)
             path = os.path.join(os.path.dirname(__file__), 'images', 'background', fname)
             try:
                 if os.path.exists(path):
-                    img = Image.open(path).convert("RGBA")
-                    img = img.resize((canvas_w, canvas_h), Image.LANCZOS)
-                    self.images[surface] = ImageTk.PhotoImage(img)
+                    sources[surface] = Image.open(path).convert("RGBA")
                 else:
-                    self.images[surface] = None
+                    sources[surface] = None
             except Exception as e:
                 print(f"⚠ Error loading image '{path}': {e}")
-                self.images[surface] = None
+                sources[surface] = None
+        resizer = TextureCache(sources)
+        return sources, {surface: resizer.render(surface, canvas_w) for surface in sources}
+
+    def _install_images(self, decoded):
+        """Main thread: keep the sources and wrap the resized textures as PhotoImages"""
+        sources, resized = decoded
+        self.textures.sources = sources
+        for surface, image in resized.items():
+            if image is not None:
+                self.textures.put(surface, CANVAS['width'], image)
 
     def __init__(self, root):
         self.root = root
@@ -44,25 +72,31 @@ class ForceQuestApp:
         self.root.geometry("1400x1000")
         self.root.configure(bg=COLORS['bg_primary'])
         self.is_animating = False
-        self.animation_thread = None
-        self.sim_data = {'distance': [], 'work': [], 'ke': []}
+        self.run_started = None
+        self.history = RunHistory()
+        self._texture_after = None
+        self.last_results = None
         
         # Timer attributes
         self.is_timer_running = False
         self.sim_start_time = 0.0
         self.timer_id = None
         
-        # Real-time graph attributes
-        self.graph_data = {'distance': [], 'work': [], 'ke': []}
-        self.current_distance = 0.0
-        self.max_distance = 1.0
+        # Telemetry streaming; the live graph keeps the run's telemetry itself
+        self.telemetry_path = None  # where the next run's telemetry is streamed, if anywhere
+        self.telemetry_writer = None
+        self.captured = 0  # samples of the current run handed to the writer
         self.max_energy = 1.0
 
+        # Background work (texture loading, sweeps, graphs) runs off the Tk thread
+        self.job_manager = JobManager(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Load image assets
         try:
             self.load_images()
         except Exception:
-            self.images = {}
+            self.textures = TextureCache({}, wrap=ImageTk.PhotoImage)
 
         self.setup_ui()
 
@@ -124,12 +158,6 @@ class ForceQuestApp:
         self.push_mode.grid(row=row_base + 3, column=1, pady=5, padx=5)
         self.push_mode.current(0)
 
-        tk.Label(left, text="Animation Speed:", bg=COLORS['bg_secondary'], fg="white", font=FONTS['label']).grid(
-            row=row_base + 4, column=0, sticky="w", pady=5, padx=5)
-        self.anim_speed = ttk.Scale(left, from_=0.5, to=3.0, orient="horizontal")
-        self.anim_speed.set(1.0)
-        self.anim_speed.grid(row=row_base + 4, column=1, pady=5, padx=5, sticky="ew")
-
         btn_frame = tk.Frame(left, bg=COLORS['bg_secondary'])
         btn_frame.grid(row=row_base + 5, column=0, columnspan=2, pady=10)
     
@@ -143,8 +171,18 @@ class ForceQuestApp:
         tk.Button(btn_frame, text="🔄 Reset", bg=COLORS['accent_blue'], fg="black",
                   font=FONTS['button'], command=self.reset_simulation, width=20).pack(pady=5)
         
+        tk.Button(btn_frame, text="📊 Show Energy Graph", bg=COLORS['accent_green'], fg="black",
+                  font=FONTS['button'], command=self.show_energy_graph, width=20).pack(pady=5)
+
+        tk.Button(btn_frame, text="⚖️ Compare Mode", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['button'], command=self.open_compare, width=20).pack(pady=5)
+
         tk.Button(btn_frame, text="✅ Start Physics Quiz", bg=COLORS['accent_yellow'], fg="black",
                   font=FONTS['button'], command=self.start_quiz, width=20, height=5).pack(pady=5)
+
+        from ui_components.job_tray import JobTray
+        self.job_tray = JobTray(left, self.job_manager)
+        self.job_tray.get_widget().grid(row=row_base + 6, column=0, columnspan=2, sticky="ew", pady=(0, 10))
         
         # === CENTER PANEL with Scrollable Canvas ===
         center_container = tk.Frame(main_frame, bg=COLORS['bg_primary'])
@@ -163,8 +201,10 @@ class ForceQuestApp:
             lambda e: center_canvas.configure(scrollregion=center_canvas.bbox("all"))
         )
         
-        center_canvas.create_window((0, 0), window=center, anchor="nw")
+        center_window = center_canvas.create_window((0, 0), window=center, anchor="nw")
         center_canvas.configure(yscrollcommand=center_scrollbar.set)
+        # The panel follows the window width so the canvases can resize with it
+        center_canvas.bind("<Configure>", lambda e: center_canvas.itemconfigure(center_window, width=e.width))
         
         # Pack scrollbar and canvas
         center_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -186,9 +226,56 @@ class ForceQuestApp:
         self.timer_label.pack(side=tk.LEFT, padx=(5, 0))
 
         # Simulation Canvas
-        self.canvas = tk.Canvas(center, width=CANVAS['width'], height=CANVAS['height'], bg="white", 
-                               highlightthickness=2, highlightbackground=COLORS['accent_cyan'])
-        self.canvas.pack(padx=(0, 50))
+        self.canvas = TkBackend(tk.Canvas(center, width=CANVAS['width'], height=CANVAS['height'], bg="white",
+                                          highlightthickness=2, highlightbackground=COLORS['accent_cyan']))
+        self.canvas.widget.pack(fill=tk.X, padx=(0, 50))
+        self.canvas.widget.bind("<Configure>", self.on_canvas_resize)
+        self.run_scene = RunScene(self.canvas, self.textures, SpriteCache(wrap=ImageTk.PhotoImage))
+
+        # Playback of the precomputed trajectory (speed lives on the transport bar)
+        from ui_components.transport_bar import TransportBar
+        from ui_components.frame_stats_overlay import FrameStatsOverlay
+        self.profiler = FrameProfiler()
+        self.quality = QualityController(on_change=self.apply_quality)
+        self.frame_counter = 0
+        self.player = TrajectoryPlayer(self.root, self.render_frame, on_finish=self._on_animation_complete,
+                                       profiler=self.profiler)
+        self.transport = TransportBar(center, self.player)
+        self.transport.get_widget().pack(pady=(5, 0), padx=(0, 50))
+
+        # Frame-time instrumentation
+        self.stats_overlay = FrameStatsOverlay(self.canvas, self.profiler)
+        stats_frame = tk.Frame(center, bg=COLORS['bg_primary'])
+        stats_frame.pack(pady=(2, 0), padx=(0, 50))
+        self.show_stats = tk.BooleanVar(value=False)
+        tk.Checkbutton(stats_frame, text="Frame stats overlay", variable=self.show_stats,
+                       command=lambda: self.stats_overlay.set_visible(self.show_stats.get()),
+                       bg=COLORS['bg_primary'], fg="white", selectcolor=COLORS['bg_secondary'],
+                       activebackground=COLORS['bg_primary'], font=FONTS['label']).pack(side=tk.LEFT)
+        tk.Button(stats_frame, text="💾 Export Frame Stats", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['label'], command=self.export_frame_stats).pack(side=tk.LEFT, padx=10)
+        tk.Button(stats_frame, text="🎞️ Export Recording", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['label'], command=self.export_recording).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Button(stats_frame, text="📝 Stream Telemetry", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['label'], command=self.arm_telemetry_capture).pack(side=tk.LEFT, padx=(0, 10))
+        self.adaptive_quality = tk.BooleanVar(value=True)
+        tk.Checkbutton(stats_frame, text="Adaptive quality", variable=self.adaptive_quality,
+                       command=lambda: self.quality.set_enabled(self.adaptive_quality.get()),
+                       bg=COLORS['bg_primary'], fg="white", selectcolor=COLORS['bg_secondary'],
+                       activebackground=COLORS['bg_primary'], font=FONTS['label']).pack(side=tk.LEFT)
+        self.quality_label = tk.Label(stats_frame, text=f"Quality: {self.quality.settings['name']}",
+                                      bg=COLORS['bg_primary'], fg=COLORS['text_gray'], font=FONTS['label'])
+        self.quality_label.pack(side=tk.LEFT, padx=5)
+
+        ghost_frame = tk.Frame(center, bg=COLORS['bg_primary'])
+        ghost_frame.pack(pady=(2, 0), padx=(0, 50))
+        self.show_ghosts = tk.BooleanVar(value=True)
+        tk.Checkbutton(ghost_frame, text="👻 Ghosts of previous runs", variable=self.show_ghosts,
+                       command=self.apply_ghost_visibility, bg=COLORS['bg_primary'], fg="white",
+                       selectcolor=COLORS['bg_secondary'], activebackground=COLORS['bg_primary'],
+                       font=FONTS['label']).pack(side=tk.LEFT)
+        tk.Button(ghost_frame, text="🧹 Clear Ghosts", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['label'], command=self.clear_ghosts).pack(side=tk.LEFT, padx=10)
 
         self.feedback = tk.Label(center, text="⚡ Ready to simulate!", bg=COLORS['bg_primary'], fg="#aaffaa", 
                                  font=FONTS['feedback'])
@@ -211,14 +298,40 @@ class ForceQuestApp:
         scrollbar.config(command=self.solution_box.yview)
         
         # === REAL-TIME ENERGY GRAPH ===
-        graph_label = tk.Label(center, text="📊 Real-Time Energy Graph", bg=COLORS['bg_primary'], 
-                               fg=COLORS['accent_cyan'], font=("Segoe UI", 11, "bold"))
-        graph_label.pack(pady=(10, 5), padx=(0, 50))
-        
-        self.graph_canvas = tk.Canvas(center, width=CANVAS['width'], height=250, bg="white", 
-                                      highlightthickness=2, highlightbackground=COLORS['accent_cyan'])
-        self.graph_canvas.pack(pady=(5, 10), padx=(0, 50))
-        self.init_graph()
+        graph_header = tk.Frame(center, bg=COLORS['bg_primary'])
+        graph_header.pack(pady=(10, 5), padx=(0, 50))
+        tk.Label(graph_header, text="📊 Real-Time Graph:", bg=COLORS['bg_primary'],
+                 fg=COLORS['accent_cyan'], font=("Segoe UI", 11, "bold")).pack(side=tk.LEFT)
+        # Every view plots channels already in the telemetry, so switching only redraws
+        self.graph_view = ttk.Combobox(graph_header, width=14, values=list(GRAPH_VIEWS), state="readonly")
+        self.graph_view.pack(side=tk.LEFT, padx=5)
+        self.graph_view.current(0)
+        tk.Label(graph_header, text="vs", bg=COLORS['bg_primary'], fg="white",
+                 font=FONTS['label']).pack(side=tk.LEFT)
+        self.graph_axis = ttk.Combobox(graph_header, width=10, values=list(GRAPH_AXES), state="readonly")
+        self.graph_axis.pack(side=tk.LEFT, padx=5)
+        self.graph_axis.current(0)
+        self.graph_view.bind("<<ComboboxSelected>>", self.on_graph_view_change)
+        self.graph_axis.bind("<<ComboboxSelected>>", self.on_graph_view_change)
+        
+        self.graph_canvas = TkBackend(tk.Canvas(center, width=CANVAS['width'], height=GRAPH_HEIGHT, bg="white",
+                                                highlightthickness=2, highlightbackground=COLORS['accent_cyan']))
+        self.graph_canvas.widget.pack(fill=tk.X, pady=(5, 10), padx=(0, 50))
+        self.graph_canvas.widget.bind("<Configure>", self.on_graph_resize)
+        self.run_graph = RunGraph(self.graph_canvas, view=self.graph_view.get(), axis=self.graph_axis.get())
+
+        # Embedded matplotlib energy graph, packed under the live graph once requested
+        self.energy_frame = tk.Frame(center, bg=COLORS['bg_primary'])
+        self.energy_figure = None
+
+        # === SWEEP HEATMAP ===
+        heatmap_label = tk.Label(center, text="🗺️ Sweep Heatmap (moves vs stuck, v_final)", bg=COLORS['bg_primary'],
+                                 fg=COLORS['accent_cyan'], font=("Segoe UI", 11, "bold"))
+        heatmap_label.pack(pady=(10, 5), padx=(0, 50))
+
+        from ui_components.heatmap_view import HeatmapView
+        self.heatmap = HeatmapView(center, self.get_sweep_params, self.job_manager)
+        self.heatmap.get_widget().pack(pady=(5, 10), padx=(0, 50))
 
         # === RIGHT PANEL: Instructions ===
         from ui_components.instructions_panel import InstructionsPanel
@@ -228,107 +341,35 @@ class ForceQuestApp:
 
         main_frame.columnconfigure(1, weight=1)
         main_frame.rowconfigure(0, weight=1)
-
-        self.object = None
-        self.reset_canvas()
         
         self.solution_box.tag_configure("center", justify='center')
     
-    def reset_canvas(self):
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'], 
-                                      CANVAS['ground_y'] + CANVAS['ground_height'], fill="#ddd", outline="")
-        self.canvas.create_text(CANVAS['width']//2, CANVAS['ground_y'] + 25, 
-                                text="Ground Level", fill="#666", font=("Consolas", 10))
-        self.object = None
-    
-    def init_graph(self):
-        """Initialize the energy graph with axes and labels"""
-        self.graph_canvas.delete("all")
-        
-        margin_left = 60
-        margin_right = 30
-        margin_top = 20
-        margin_bottom = 40
-        
-        self.graph_width = CANVAS['width'] - margin_left - margin_right
-        self.graph_height = 250 - margin_top - margin_bottom
-        self.graph_x0 = margin_left
-        self.graph_y0 = margin_top
-        
-        # Draw axes
-        self.graph_canvas.create_line(margin_left, margin_top, margin_left, 
-                                       250 - margin_bottom, fill="black", width=2)
-        self.graph_canvas.create_line(margin_left, 250 - margin_bottom, 
-                                       CANVAS['width'] - margin_right, 250 - margin_bottom, fill="black", width=2)
-        
-        # Labels
-        self.graph_canvas.create_text(CANVAS['width']//2, 240, text="Distance (m)", 
-                                       fill="#333", font=("Segoe UI", 9, "bold"))
-        self.graph_canvas.create_text(20, 135, text="Energy (J)", angle=90,
-                                       fill="#333", font=("Segoe UI", 9, "bold"))
-        
-        # Legend
-        self.graph_canvas.create_line(520, 15, 560, 15, fill="blue", width=2)
-        self.graph_canvas.create_text(600, 15, text="Net Work", fill="blue", font=("Segoe UI", 8, "bold"))
-        
-        self.graph_canvas.create_line(520, 35, 560, 35, fill="red", width=2, dash=(4, 2))
-        self.graph_canvas.create_text(605, 35, text="Kinetic Energy", fill="red", font=("Segoe UI", 8, "bold"))
-        
-        self.graph_canvas.create_text(margin_left - 5, 250 - margin_bottom, text="0", 
-                                       anchor="e", fill="#666", font=("Consolas", 8))
-    
-    def update_graph(self, distance, work, ke):
-        """Update the real-time energy graph with new data point"""
-        self.graph_data['distance'].append(distance)
-        self.graph_data['work'].append(work)
-        self.graph_data['ke'].append(ke)
-        
-        if distance > self.max_distance:
-            self.max_distance = distance
-        if max(work, ke) > self.max_energy:
-            self.max_energy = max(work, ke)
-        
-        self.graph_canvas.delete("plot_line")
-        self.graph_canvas.delete("scale")
-        
-        margin_left = 60
-        margin_bottom = 40
-        
-        # Y-axis scale
-        for i in range(5):
-            y_val = (self.max_energy / 4) * i
-            y_pos = (250 - margin_bottom) - (self.graph_height / 4) * i
-            self.graph_canvas.create_text(margin_left - 5, y_pos, text=f"{y_val:.1f}", 
-                                          anchor="e", fill="#666", font=("Consolas", 8), tags="scale")
-        
-        # X-axis scale
-        for i in range(5):
-            x_val = (self.max_distance / 4) * i
-            x_pos = margin_left + (self.graph_width / 4) * i
-            self.graph_canvas.create_text(x_pos, 250 - margin_bottom + 15, text=f"{x_val:.1f}", 
-                                          fill="#666", font=("Consolas", 8), tags="scale")
-        
-        # Plot data points
-        if len(self.graph_data['distance']) > 1:
-            # Plot Work line
-            for i in range(len(self.graph_data['distance']) - 1):
-                x1 = self.graph_x0 + (self.graph_data['distance'][i] / self.max_distance) * self.graph_width
-                y1 = self.graph_y0 + self.graph_height - (self.graph_data['work'][i] / self.max_energy) * self.graph_height
-                x2 = self.graph_x0 + (self.graph_data['distance'][i+1] / self.max_distance) * self.graph_width
-                y2 = self.graph_y0 + self.graph_height - (self.graph_data['work'][i+1] / self.max_energy) * self.graph_height
-                
-                self.graph_canvas.create_line(x1, y1, x2, y2, fill="blue", width=2, tags="plot_line")
-            
-            # Plot KE line
-            for i in range(len(self.graph_data['distance']) - 1):
-                x1 = self.graph_x0 + (self.graph_data['distance'][i] / self.max_distance) * self.graph_width
-                y1 = self.graph_y0 + self.graph_height - (self.graph_data['ke'][i] / self.max_energy) * self.graph_height
-                x2 = self.graph_x0 + (self.graph_data['distance'][i+1] / self.max_distance) * self.graph_width
-                y2 = self.graph_y0 + self.graph_height - (self.graph_data['ke'][i+1] / self.max_energy) * self.graph_height
-                
-                self.graph_canvas.create_line(x1, y1, x2, y2, fill="red", width=2, 
-                                              dash=(4, 2), tags="plot_line")
+    def on_graph_view_change(self, event=None):
+        """Show other channels or another x axis: a redraw of data already in the telemetry"""
+        self.run_graph.set_view(self.graph_view.get(), self.graph_axis.get())
+        self._redraw_graph()
+
+    def _redraw_graph(self):
+        """Bring the plot up to date with the telemetry; only points added since the last call are drawn"""
+        self.run_graph.redraw()
+        if self.energy_figure is not None:
+            self._update_energy_figure()
+
+    def _update_energy_figure(self):
+        """Blit the telemetry so far onto the embedded energy graph, against the live graph's x axis"""
+        name = self.graph_axis.get()
+        x, label = GRAPH_AXES[name]
+        x_max = self.run_graph.extents.get(x, (0.0, 0.0))[1]
+        self.energy_figure.set_x_axis(name, label)
+        self.energy_figure.set_range(x_max if x_max > 0 else 1.0, self.max_energy)
+        telemetry = self.run_graph.telemetry
+        self.energy_figure.set_data(telemetry.channel(x), telemetry.channel('work'), telemetry.channel('ke'))
+
+    def _close_energy_figure(self):
+        if self.energy_figure is not None:
+            self.energy_figure.close()
+            self.energy_figure = None
+            self.energy_frame.pack_forget()
 
     def get_physics_params(self):
         """Collect and validate physics parameters from UI"""
@@ -365,6 +406,30 @@ class ForceQuestApp:
             'push_mode': self.push_mode.get()
         }
 
+    def get_sweep_params(self):
+        """Collect base parameters for the sweep heatmap, using defaults for blank or invalid fields"""
+        defaults = {"force": None, "distance": 10.0, "mass": 10.0, "angle": 30.0, "mu": None}
+        values = {}
+        for key, default in defaults.items():
+            try:
+                values[key] = float(self.entries[key].get())
+            except ValueError:
+                values[key] = default
+
+        from config import SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP
+
+        mu = values["mu"]
+        if mu is None:
+            base_mu = SURFACE_FRICTION.get(self.surface_material.get(), 0.5)
+            mu = base_mu * SHAPE_FRICTION_FACTOR.get(self.object_shape.get(), 1.0)
+
+        return {
+            'F': values["force"], 'd': values["distance"], 'm': values["mass"],
+            'angle': values["angle"], 'mu': mu,
+            'force_angle': FORCE_ANGLE_MAP.get(self.force_angle_mode.get(), 0),
+            'scenario': self.scenario.get()
+        }
+
     def calculate_physics(self, params):
         """Calculate physics using the physics engine"""
         from physics_engine import PhysicsCalculator
@@ -377,13 +442,7 @@ class ForceQuestApp:
             return
             
         elapsed_time = time.time() - self.sim_start_time
-        
-        minutes = int(elapsed_time // 60)
-        seconds = int(elapsed_time % 60)
-        hundredths = int((elapsed_time % 1) * 100)
-        
-        time_str = f"{minutes:02d}:{seconds:02d}.{hundredths:02d}"
-        self.timer_label.config(text=time_str)
+        self.timer_label.config(text=self._format_time(elapsed_time))
         
         self.timer_id = self.root.after(50, self.start_timer)
 
@@ -400,6 +459,7 @@ class ForceQuestApp:
         results = self.calculate_physics(params)
         if not results:
             return
+        self.last_results = results
 
         self.solution_box.delete(1.0, tk.END)
         
@@ -422,25 +482,17 @@ class ForceQuestApp:
             return
 
         # Reset graph data for new simulation
-        self.graph_data = {'distance': [], 'work': [], 'ke': []}
-        self.current_distance = 0.0
-        self.max_distance = params['d']
         self.max_energy = max(results['net_work'], results['ke_final']) * 1.1
-        self.init_graph()
+        self.run_graph.clear()
         
         self.is_animating = True
         self.run_btn.config(state="disabled")
         self.feedback.config(text="▶ Simulating Motion...", fg=COLORS['accent_cyan'])
         self.delta_ke_label.config(text=f"ΔKE (Net Work) = {results['ke_final']:.2f} J")
         
+        self.run_started = time.perf_counter()
         self.update_background(params)
-
-        self.sim_start_time = time.time()
-        self.is_timer_running = True
-        self.start_timer()
-
-        self.animation_thread = threading.Thread(target=self.animate_motion, args=(results,))
-        self.animation_thread.start()
+        self.animate_motion(results)
         
     def stop_timer(self):
         """Stop the simulation timer"""
@@ -452,252 +504,320 @@ class ForceQuestApp:
     def stop_simulation(self):
         """Stop the running simulation"""
         self.is_animating = False
+        self.player.pause()
+        self.transport.update_state()
         self.run_btn.config(state="normal")
         self.feedback.config(text="⏹ Stopped", fg=COLORS['accent_yellow'])
         self.stop_timer()
+        self._finish_telemetry_capture()
 
     def reset_simulation(self):
         """Reset the simulation to initial state"""
         self.stop_simulation()
-        self.reset_canvas()
+        self.player.load(None)
+        self.transport.clear()
+        self.run_scene.reset()
         self.solution_box.delete(1.0, tk.END)
         self.feedback.config(text="⚡ Ready!", fg="#aaffaa")
         self.delta_ke_label.config(text="")
-        self.sim_data = {'distance': [], 'work': [], 'ke': []}
-        
-        self.graph_data = {'distance': [], 'work': [], 'ke': []}
-        self.current_distance = 0.0
-        self.max_distance = 1.0
+        self._close_energy_figure()
         self.max_energy = 1.0
-        self.init_graph()
+        self.run_graph.clear()
         
         self.timer_label.config(text="00:00.00")
 
-    def update_background(self, params):
-        """Update canvas background based on scenario"""
-        self.canvas.delete("all")
-        scenario = params['scenario']
-        angle = params['angle']
-        shape = params['shape']
-        surface_name = params.get('surface', self.surface_material.get())
-        bg_image = None
-        if hasattr(self, 'images') and surface_name in self.images:
-            bg_image = self.images.get(surface_name)
-
-        if scenario == "Pushing Object":
-            if bg_image:
-                bg_id = self.canvas.create_image(0, 0, anchor='nw', image=bg_image)
-                try:
-                    self.canvas.tag_lower(bg_id)
-                except Exception:
-                    pass
-                self._current_bg = bg_image
-                
-            # Surface colors and labels
-            color_map = {
-                "Ice": ("#b3e5fc", "❄️ ICE"),
-                "Tile": ("#65aade", "🏠 TILE"),
-                "Wood": ("#705b40", "🪵 WOOD"),
-                "Concrete": ("#6e5d5d", "🏗️ CONCRETE"),
-                "Sand": ("#e69f00", "🏖️ SAND")
-            }
-            color, label = color_map.get(surface_name, ("#ddd", "GROUND"))
-            
-            self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'], 
-                                          CANVAS['ground_y'] + CANVAS['ground_height'], 
-                                          fill=color, outline="black")
-            self.canvas.create_text(700, 420, text=label, fill="black", font=("Consolas", 11, "bold"))
-            self.draw_object(50, 350, shape, "#73ff61")
-
-        elif scenario == "Lifting Object":
-            if bg_image:
-                bg_id = self.canvas.create_image(0, 0, anchor='nw', image=bg_image)
-                try:
-                    self.canvas.tag_lower(bg_id)
-                except Exception:
-                    pass
-                self._current_bg = bg_image
-            else:
-                self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'], 
-                                              CANVAS['ground_y'] + CANVAS['ground_height'], 
-                                              fill="#9ecae1", outline="")
-            self.canvas.create_line(390, 50, 390, 400, fill="#666", width=4)
-            self.canvas.create_text(700, 420, text="🏗️ CRANE", fill="black", font=("Consolas", 11, "bold"))
-            self.draw_object(365, 350, shape, "#73ff61")
-
-        elif scenario == "Inclined Plane":
-            color_map = {
-                "Ice": ("#b3e5fc", "❄️ ICE"),
-                "Tile": ("#65aade", "🏠 TILE"),
-                "Wood": ("#705b40", "🪵 WOOD"),
-                "Concrete": ("#6e5d5d", "🏗️ CONCRETE"),
-                "Sand": ("#e69f00", "🏖️ SAND")
-            }
-            surf_color, surf_label = color_map.get(surface_name, ("#ddd", "GROUND"))
-
-            incline_height = min(math.tan(math.radians(angle)) * CANVAS['width'], 350)
-
-            if bg_image:
-                bg_id = self.canvas.create_image(0, 0, anchor='nw', image=bg_image)
-                try:
-                    self.canvas.tag_lower(bg_id)
-                except Exception:
-                    pass
-                self._current_bg = bg_image
-                
-            self.canvas.create_polygon(0, 450, CANVAS['width'], 450, CANVAS['width'], 450 - incline_height,
-                                       fill=surf_color, outline="black", width=2)
-
-            self.canvas.create_text(700, 420, text=f"⛰️ θ={angle:.1f}°", fill="black", 
-                                    font=("Consolas", 11, "bold"))
-            obj_y = 450 - (math.tan(math.radians(angle)) * 100) - 50
-            self.draw_object(50, obj_y, shape, "#73ff61")
-            self.draw_force_vectors(params)
-
-    def draw_object(self, x, y, shape, color):
-        """Draw the object on canvas"""
-        if shape == "Box":
-            self.object = self.canvas.create_rectangle(x, y, x + 50, y + 50, fill=color, 
-                                                        outline="black", width=2)
-        elif shape == "Cylinder":
-            rect = self.canvas.create_rectangle(x, y + 10, x + 50, y + 50, fill=color, 
-                                                outline="black", width=2)
-            oval_top = self.canvas.create_oval(x, y, x + 50, y + 20, fill=color, 
-                                               outline="black", width=2)
-            oval_bottom = self.canvas.create_oval(x, y + 40, x + 50, y + 60, fill=color, 
-                                                  outline="black", width=2)
-            self.object = [oval_bottom, rect, oval_top]
-        elif shape == "Sphere":
-            radius = 25
-            cx, cy = x + radius, y + 25
-            self.object = self.canvas.create_oval(cx - radius, cy - radius, cx + radius, cy + radius,
-                                                  fill=color, outline="black", width=2)
-
-    def draw_force_vectors(self, params):
-        """Draw force vectors for inclined plane"""
-        if params['scenario'] != "Inclined Plane":
+    def on_canvas_resize(self, event):
+        """Scale the scene to the canvas width, keeping its aspect ratio"""
+        inset = 2 * int(self.canvas.widget.cget("highlightthickness"))
+        zoom = (event.width - inset) / CANVAS['width']
+        if zoom <= 0 or abs(zoom - self.canvas.zoom) < 1e-3:
             return
+        self.canvas.set_zoom(zoom)
+        self.canvas.widget.configure(height=round(CANVAS['height'] * zoom))
+        self.refresh_texture()
+        roller = self.run_scene.roller
+        if roller is not None:
+            roller.resize(self.canvas, round(OBJECT_SIZE * zoom))
+
+    def on_graph_resize(self, event):
+        """Lay the energy graph out again for the new canvas width"""
+        inset = 2 * int(self.graph_canvas.widget.cget("highlightthickness"))
+        if self.run_graph.resize((event.width - inset, event.height - inset)):
+            self._redraw_graph()
+
+    def refresh_texture(self):
+        """Point the texture tiles at the cached variant for the current canvas size
+
+        While the window is being dragged, sizes without a cached variant get a
+        fast draft; the high-quality resize follows once resizing settles.
+        """
+        self.run_scene.refresh_texture()
+        self._schedule_texture_upgrade()
+
+    def _schedule_texture_upgrade(self):
+        """(Re)start the settle timer if the shown texture is a draft"""
+        if self._texture_after is not None:
+            self.root.after_cancel(self._texture_after)
+            self._texture_after = None
+        surface = self.run_scene.texture_surface
+        if surface is not None and self.textures.is_draft(surface, CANVAS['width'] * self.canvas.zoom):
+            self._texture_after = self.root.after(RESIZE_SETTLE_MS, self._upgrade_texture)
+
+    def _upgrade_texture(self):
+        """Resize the current texture with the high-quality filter in the background"""
+        self._texture_after = None
+        surface, width = self.run_scene.texture_surface, CANVAS['width'] * self.canvas.zoom
+
+        def install(image):
+            self.textures.put(surface, width, image)
+            if surface == self.run_scene.texture_surface and not self.textures.is_draft(surface,
+                                                                              CANVAS['width'] * self.canvas.zoom):
+                self.refresh_texture()
+
+        self.job_manager.submit("Resizing texture", lambda job: self.textures.render(surface, width),
+                                on_done=install)
 
-        if isinstance(self.object, list):
-            coords = self.canvas.coords(self.object[1])
-        else:
-            coords = self.canvas.coords(self.object)
-        
-        x_center = (coords[0] + coords[2]) / 2
-        y_center = (coords[1] + coords[3]) / 2
-
-        angle = params['angle']
-        length = 60
-        angle_rad = math.radians(angle)
-
-        self.canvas.create_line(x_center, y_center, x_center, y_center + length,
-                                 arrow=tk.LAST, fill="green", width=3)
-        self.canvas.create_text(x_center + 30, y_center + length, text="Fg", fill="green", 
-                                font=("Consolas", 9, "bold"))
-
-        fn_dx = -length * math.sin(angle_rad)
-        fn_dy = -length * math.cos(angle_rad)
-        self.canvas.create_line(x_center, y_center, x_center + fn_dx, y_center + fn_dy,
-                                 arrow=tk.LAST, fill="orange", width=3)
-        self.canvas.create_text(x_center + fn_dx - 15, y_center + fn_dy, text="Fn", fill="orange", 
-                                font=("Consolas", 9, "bold"))
-
-        f_dx = length * math.cos(angle_rad)
-        f_dy = -length * math.sin(angle_rad)
-        self.canvas.create_line(x_center, y_center, x_center + f_dx, y_center + f_dy,
-                                 arrow=tk.LAST, fill=COLORS['accent_cyan'], width=3)
-        self.canvas.create_text(x_center + f_dx + 20, y_center + f_dy, text="F", 
-                                fill=COLORS['accent_cyan'], font=("Consolas", 9, "bold"))
+    def update_background(self, params):
+        """Lay out the scenario and put the object at its start; a draft texture is upgraded once things settle"""
+        self.run_scene.set_background(params)
+        self._schedule_texture_upgrade()
 
     def animate_motion(self, results):
-        """Animate the object motion and update graph in real-time"""
+        """Precompute the whole run, then play it back on the transport bar
+
+        The trajectory arrays are built once up front, so pausing, scrubbing
+        and jumping to a velocity only pick a sample index.
+        """
+        self.profiler.reset()
+        self.frame_counter = 0
+        trajectory = compute_trajectory(results)
         params = results['params']
-        scenario = params['scenario']
-        distance = params['d']
-        angle = params['angle']
-        push_mode = params['push_mode']
-        
-        net_force = results['net_work'] / distance if distance > 0 else 0
-        
-        steps = int(distance * 15)
-        speed_factor = 1.0 / self.anim_speed.get()
-        
-        accumulated_distance = 0.0
-        distance_per_step = distance / steps if steps > 0 else 0
-        
-        for step in range(steps):
-            if not self.is_animating:
-                break
-                
-            if push_mode == "Constant Force":
-                move_val = 4
-            elif push_mode == "Sudden Push":
-                move_val = 20 if step < 5 else 0.5
-            elif push_mode == "Increasing Force":
-                move_val = 2 + (step / steps) * 6
-            
-            accumulated_distance += distance_per_step
-            
-            current_work = net_force * accumulated_distance
-            current_ke = current_work
-            
-            self.update_graph(accumulated_distance, current_work, current_ke)
-            
-            if scenario == "Lifting Object":
-                self._move_object(0, -move_val)
-            elif scenario == "Inclined Plane":
-                dx = move_val * math.cos(math.radians(angle))
-                dy = -move_val * math.sin(math.radians(angle))
-                self._move_object(dx, dy)
-            else:
-                force_angle = params['force_angle']
-                dx = move_val * math.cos(math.radians(force_angle))
-                dy = -move_val * math.sin(math.radians(force_angle))
-                self._move_object(dx, dy)
-            
-            self.canvas.update()
-            time.sleep(0.02 * speed_factor)
-        
+        # Every graph channel is derived once here; frames only copy samples into the telemetry
+        self.run_graph.load(run_channels(results, trajectory))
+        self._start_telemetry_capture()
+        self.draw_ghosts(params)
+        self.history.add(f"Run {len(self.history) + 1}", params, trajectory)
+
+        self.run_scene.load(results, trajectory)
+        self.player.load(trajectory)
+        self.transport.load(trajectory)
+        self.player.play()
+        self.transport.update_state()
+
+    def draw_ghosts(self, params):
+        """One faint polyline per earlier run of the same setup, on the canvas and the energy graph"""
+        def same_setup(record):
+            return (record.params['scenario'] == params['scenario'] and
+                    (params['scenario'] != "Inclined Plane" or record.params['angle'] == params['angle']))
+
+        records = sorted(self.history.records(same_setup), key=lambda r: r.key)[-GHOST_RUNS:]
+        for record in records:
+            self.history.get(record.key)
+        self.run_scene.draw_ghosts(records)
+        self.run_graph.draw_ghosts(records)
+
+    def apply_ghost_visibility(self):
+        visible = self.show_ghosts.get()
+        self.run_scene.set_ghosts_visible(visible)
+        self.run_graph.set_ghosts_visible(visible)
+
+    def clear_ghosts(self):
+        """Forget the run history and remove its ghosts"""
+        self.history.clear()
+        self.run_scene.clear_ghosts()
+        self.run_graph.clear_ghosts()
+
+    def render_frame(self, index):
+        """Draw trajectory sample `index`: object position, graph, time"""
+        trajectory = self.player.trajectory
+        if trajectory is None or self.run_scene.object is None:
+            return
+
+        profiler = self.profiler
+        if self.player.playing:
+            self.quality.update(profiler.last('total'))
+        self.frame_counter += 1
+
+        with profiler.phase('canvas_move'):
+            self.run_scene.show(index)
+
+        # Graph data always advances; the redraw may be thinned out under load
+        redraw = (not self.player.playing or index == len(trajectory) - 1
+                  or self.frame_counter % self.quality.settings['graph_every'] == 0)
+        with profiler.phase('graph'):
+            self._show_graph_until(index, redraw)
+
+        self.timer_label.config(text=self._format_time(float(trajectory.t[index])))
+        self.transport.update_position(index)
+        self.stats_overlay.refresh()
+
+        # Flush pending redraws now so their cost lands in this frame
+        with profiler.phase('tk_update'):
+            self.root.update_idletasks()
+
+        if self.run_started is not None:
+            profiler.time_to_first_frame = time.perf_counter() - self.run_started
+            self.run_started = None
+
+    def _show_graph_until(self, index, redraw=True):
+        """Make the telemetry end at sample `index` (growing or truncating) and redraw"""
+        self.run_graph.seek(index)
+        count = index + 1
+        if self.telemetry_writer is not None and count > self.captured:
+            self._capture_telemetry(count)
+        if redraw:
+            self._redraw_graph()
+
+    def apply_quality(self, settings):
+        """Show or hide textures, annotations and effects for a quality level"""
+        self.run_scene.apply_quality(settings)
+        self.quality_label.config(text=f"Quality: {settings['name']}")
+
+    @staticmethod
+    def _format_time(elapsed_time):
+        minutes = int(elapsed_time // 60)
+        seconds = int(elapsed_time % 60)
+        hundredths = int((elapsed_time % 1) * 100)
+        return f"{minutes:02d}:{seconds:02d}.{hundredths:02d}"
+
+    def _on_animation_complete(self):
+        """Finish a run that played to the end"""
         self.draw_ke_indicator()
         self.stop_timer()
+        self.transport.update_state()
 
         self.is_animating = False
         self.run_btn.config(state="normal")
         self.feedback.config(text="✅ Simulation Complete!", fg=COLORS['accent_green'])
-
-    def _move_object(self, dx, dy):
-        """Move the object on canvas"""
-        if isinstance(self.object, list):
-            for part in self.object:
-                self.canvas.move(part, dx, dy)
-        else:
-            self.canvas.move(self.object, dx, dy)
+        self._finish_telemetry_capture()
 
     def draw_ke_indicator(self):
         """Draw kinetic energy indicator on canvas"""
-        if isinstance(self.object, list):
-            all_coords = []
-            for part in self.object:
-                all_coords.extend(self.canvas.coords(part))
-            x1, x2 = min(all_coords[::2]), max(all_coords[::2])
-            y2 = max(all_coords[1::2])
-        else:
-            coords = self.canvas.coords(self.object)
-            x1, x2, y2 = coords[0], coords[2], coords[3]
-        
-        y = y2 + 20
-        self.canvas.create_line(x1, y, x2, y, fill="#73ff61", width=3, tags="ke_line")
-        
-        ke_text = self.delta_ke_label.cget("text")
-        if "=" in ke_text:
-            ke_val = ke_text.split("=")[1].strip().split()[0]
-            self.canvas.create_text((x1 + x2) / 2, y + 15, text=f"ΔKE={ke_val}J",
-                                     fill="#73ff61", font=("Consolas", 11, "bold"), tags="ke_text")
-    
+        self.run_scene.draw_ke_indicator(self.delta_ke_label.cget("text"))
+
+    def show_energy_graph(self):
+        """Show the run's energy graph under the live graph; the figure is made once and reused"""
+        results = self.last_results
+        if not results or not results.get('moves'):
+            messagebox.showerror("Error", "Run a successful simulation first!")
+            return
+        if self.energy_figure is None:
+            self.energy_figure = EnergyFigure(self.energy_frame)
+            self.energy_figure.get_widget().pack(fill=tk.BOTH, expand=True)
+            self.energy_frame.pack(fill=tk.X, pady=(5, 10), padx=(0, 50), after=self.graph_canvas.widget)
+        # Keeps blitting new samples while the run plays
+        self._update_energy_figure()
+
+    def export_frame_stats(self):
+        """Save the last run's frame timings as CSV or JSON"""
+        if not self.profiler.count:
+            messagebox.showerror("Error", "Run a simulation first!")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export frame stats", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if path:
+            self.profiler.export(path)
+            self.feedback.config(text=f"💾 Frame stats saved to {os.path.basename(path)}",
+                                 fg=COLORS['accent_green'])
+
+    def export_recording(self):
+        """Record the last run offscreen as an animated GIF or a PNG frame sequence"""
+        results = self.last_results
+        if not results or not results.get('moves'):
+            messagebox.showerror("Error", "Run a successful simulation first!")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export recording", defaultextension=".gif",
+            filetypes=[("Animated GIF", "*.gif"), ("PNG frame sequence", "*.png")])
+        if not path:
+            return
+        # A PNG sequence goes into a directory named after the chosen file
+        out = path if path.lower().endswith(".gif") else os.path.splitext(path)[0]
+        self.job_manager.submit(
+            "Recording", lambda job: record(results, out, progress=job.report, token=job.token),
+            on_done=lambda recording: self.feedback.config(
+                text=f"🎞️ Recorded {len(recording['frames'])} frames to {os.path.basename(out)}",
+                fg=COLORS['accent_green']))
+
+    def arm_telemetry_capture(self):
+        """Choose a CSV or .npz file for the next run's telemetry, streamed to disk while it plays"""
+        path = filedialog.asksaveasfilename(
+            title="Stream telemetry", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NumPy archive", "*.npz")])
+        if path:
+            self.telemetry_path = path
+            self.feedback.config(text=f"📝 Next run's telemetry goes to {os.path.basename(path)}",
+                                 fg=COLORS['accent_cyan'])
+
+    def _start_telemetry_capture(self):
+        self._finish_telemetry_capture()
+        if self.telemetry_path is not None:
+            self.telemetry_writer = TelemetryWriter(self.telemetry_path)
+            self.telemetry_path = None
+            self.captured = 0
+
+    def _capture_telemetry(self, count):
+        """Hand samples captured..count-1 to the writer thread (never waits on the disk)"""
+        writer = self.telemetry_writer
+        if writer.error is not None:
+            # The writer thread failed; finishing reports why
+            self._finish_telemetry_capture()
+            return
+        try:
+            writer.write({name: self.run_graph.source[name][self.captured:count] for name in writer.channels})
+        except Exception as e:
+            # A failed write must not break playback: stop capturing and keep what was written
+            print(f"⚠ Telemetry capture stopped: {e}")
+            self._finish_telemetry_capture()
+            return
+        self.captured = count
+
+    def _finish_telemetry_capture(self):
+        """Close the capture of a run that ended or was stopped; the file is finalized in the background"""
+        writer = self.telemetry_writer
+        if writer is None:
+            return
+        self.telemetry_writer = None
+        writer.close()
+        name = os.path.basename(writer.path)
+
+        def saved(rows):
+            text = f"📝 {rows} telemetry samples saved to {name}"
+            if writer.dropped:
+                text += f" ({writer.dropped} dropped: the disk fell behind)"
+            self.feedback.config(text=text, fg=COLORS['accent_yellow'] if writer.dropped else COLORS['accent_green'])
+
+        self.job_manager.submit(
+            "Telemetry export", lambda job: writer.join(),
+            on_done=saved,
+            on_error=lambda e: messagebox.showerror("Error", f"Could not save telemetry: {e}"))
+
+    def open_compare(self):
+        """Open the side-by-side compare window seeded with the current inputs"""
+        from ui_components.compare_view import CompareView
+        window = tk.Toplevel(self.root)
+        window.title("⚖️ Compare Mode")
+        window.configure(bg=COLORS['bg_primary'])
+        view = CompareView(window, self.get_physics_params)
+        view.get_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        def close():
+            view.stop()
+            window.destroy()
+        window.protocol("WM_DELETE_WINDOW", close)
+
     def start_quiz(self):
         """Launch the physics quiz"""
         ForceQuestQuiz(self.root)
 
+    def on_close(self):
+        """Cancel background jobs and close the window"""
+        self.stop_simulation()
+        self.job_manager.shutdown()
+        self._close_energy_figure()
+        self.root.destroy()
+
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -100,6 +100,54 @@ MIN_ANIMATION_SPEED = 0.5
 MAX_ANIMATION_SPEED = 3.0
 ANIMATION_DELAY = 0.02
 
+# Trajectory playback
+PIXELS_PER_METER = 60
+MIN_PIXELS_PER_METER = 4
+FIT_MIN_PIXELS_PER_METER = 0.5  # whole-run views (recordings, compare mode)
+RULER_STEPS = (1, 2, 5, 10, 20, 50, 100, 200, 500)  # meters between ground ticks
+RULER_MIN_SPACING = 60  # pixels
+MIN_PLAYBACK_SPEED = 0.1
+MAX_PLAYBACK_SPEED = 100.0
+TRAJECTORY_MAX_SAMPLES = 20000
+TRAJECTORY_MAX_DURATION = 600.0  # seconds
+
+# Ghosts of previous runs
+GHOST_RUNS = 20
+RUN_HISTORY_BUDGET = 2 * 1024 * 1024  # bytes of encoded trajectories
+RUN_HISTORY_POINTS = 400  # samples kept per run
+
+# Friction particles and motion trail (fixed pools of canvas items)
+PARTICLE_POOL_SIZE = 60
+TRAIL_POINTS = 40
+TRAIL_SECONDS = 1.0
+
+# Resizable canvas textures
+TEXTURE_BUCKET = 64  # pixels of canvas width per cached texture size
+TEXTURE_CACHE_SIZE = 12  # resized variants kept, least recently used evicted first
+RESIZE_SETTLE_MS = 250  # quiet time after a resize before high-quality textures
+
+# Rolling Cylinder and Sphere sprites
+SPRITE_ANGLE_STEP = 6  # degrees between pre-rendered rotation frames
+SPRITE_CACHE_SIZE = 8  # (shape, colour, size) frame sets kept
+
+# Run telemetry and graph downsampling
+TELEMETRY_CAPACITY = 16384  # samples per channel kept in the ring buffer
+GRAPH_POINTS_PER_PIXEL = 2  # drawn points per pixel of graph width at most
+TELEMETRY_BLOCK_ROWS = 256  # samples per block handed to the export writer thread
+TELEMETRY_QUEUE_BLOCKS = 8  # blocks the export queue holds before the caller keeps them back
+TELEMETRY_PENDING_BLOCKS = 8  # blocks' worth kept back while the queue is full; older samples are dropped
+
+# Adaptive rendering quality, best first. Only drawing degrades: the
+# trajectory is integrated the same way at every level, so the values shown
+# (work, KE, velocity) are exact whatever the frame cost.
+QUALITY_LEVELS = [
+    {'name': "Full", 'graph_every': 1, 'textures': True, 'annotations': True, 'effects': True},
+    {'name': "Graph 1/3", 'graph_every': 3, 'textures': True, 'annotations': True, 'effects': True},
+    {'name': "No textures", 'graph_every': 3, 'textures': False, 'annotations': True, 'effects': True},
+    {'name': "Minimal", 'graph_every': 6, 'textures': False, 'annotations': False, 'effects': False},
+    {'name': "Low", 'graph_every': 10, 'textures': False, 'annotations': False, 'effects': False},
+]
+
 # Canvas Settings
 CANVAS = {
     'width': 800,
@@ -136,6 +184,7 @@ CANVAS = {
     'bg': 'white',
     'highlight': '#00e6e6'
 }
+GRAPH_HEIGHT = 250  # energy graph canvas
 CANVAS_HIGHLIGHT = '#00e6e6'
 
 # Scenarios
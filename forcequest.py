@@ -2,10 +2,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import math
 import time
-import threading
 import random 
 import os
 from PIL import Image, ImageTk
+from utils.frame_scheduler import FrameScheduler
 
 class ForceQuestQuiz:
     def __init__(self, master):
@@ -200,7 +200,7 @@ class ForceQuestApp:
         self.root.geometry("1400x1000")
         self.root.configure(bg="#1e1e2f")
         self.is_animating = False
-        self.animation_thread = None
+        self.scheduler = None
         self.sim_data = {'distance': [], 'work': [], 'ke': []}
         
         # Timer attributes
@@ -470,9 +470,21 @@ Push Modes:
         self.graph_canvas.create_text(605, 35, text="Kinetic Energy", fill="red", 
                                        font=("Segoe UI", 8, "bold"))
         
-        # Initial scale markers
-        self.graph_canvas.create_text(margin_left - 5, 250 - margin_bottom, text="0", 
-                                       anchor="e", fill="#666", font=("Consolas", 8))
+        # Scale markers, relabelled only when the range changes
+        self.y_ticks = [self.graph_canvas.create_text(margin_left - 5, (250 - margin_bottom) - (self.graph_height / 4) * i,
+                                                      text="", anchor="e", fill="#666", font=("Consolas", 8))
+                        for i in range(5)]
+        self.x_ticks = [self.graph_canvas.create_text(margin_left + (self.graph_width / 4) * i, 250 - margin_bottom + 15,
+                                                      text="", fill="#666", font=("Consolas", 8))
+                        for i in range(5)]
+        self.graph_scale = None
+        
+        # One polyline per series, extended point by point
+        bottom = self.graph_y0 + self.graph_height
+        self.work_line = self.graph_canvas.create_line(margin_left, bottom, margin_left, bottom, fill="blue",
+                                                       width=2, state="hidden", tags="plot_line")
+        self.ke_line = self.graph_canvas.create_line(margin_left, bottom, margin_left, bottom, fill="red",
+                                                     width=2, dash=(4, 2), state="hidden", tags="plot_line")
     
     def update_graph(self, distance, work, ke):
         """Update the real-time energy graph with new data point"""
@@ -487,48 +499,27 @@ Push Modes:
         if max(work, ke) > self.max_energy:
             self.max_energy = max(work, ke)
         
-        # Clear and redraw
-        self.graph_canvas.delete("plot_line")
-        self.graph_canvas.delete("scale")
-        
-        # Update scale markers
-        margin_left = 60
-        margin_bottom = 40
-        
-        # Y-axis scale
-        for i in range(5):
-            y_val = (self.max_energy / 4) * i
-            y_pos = (250 - margin_bottom) - (self.graph_height / 4) * i
-            self.graph_canvas.create_text(margin_left - 5, y_pos, text=f"{y_val:.1f}", 
-                                          anchor="e", fill="#666", font=("Consolas", 8), tags="scale")
-        
-        # X-axis scale
-        for i in range(5):
-            x_val = (self.max_distance / 4) * i
-            x_pos = margin_left + (self.graph_width / 4) * i
-            self.graph_canvas.create_text(x_pos, 250 - margin_bottom + 15, text=f"{x_val:.1f}", 
-                                          fill="#666", font=("Consolas", 8), tags="scale")
-        
-        # Plot data points
-        if len(self.graph_data['distance']) > 1:
-            # Plot Work line
-            for i in range(len(self.graph_data['distance']) - 1):
-                x1 = self.graph_x0 + (self.graph_data['distance'][i] / self.max_distance) * self.graph_width
-                y1 = self.graph_y0 + self.graph_height - (self.graph_data['work'][i] / self.max_energy) * self.graph_height
-                x2 = self.graph_x0 + (self.graph_data['distance'][i+1] / self.max_distance) * self.graph_width
-                y2 = self.graph_y0 + self.graph_height - (self.graph_data['work'][i+1] / self.max_energy) * self.graph_height
-                
-                self.graph_canvas.create_line(x1, y1, x2, y2, fill="blue", width=2, tags="plot_line")
-            
-            # Plot KE line
-            for i in range(len(self.graph_data['distance']) - 1):
-                x1 = self.graph_x0 + (self.graph_data['distance'][i] / self.max_distance) * self.graph_width
-                y1 = self.graph_y0 + self.graph_height - (self.graph_data['ke'][i] / self.max_energy) * self.graph_height
-                x2 = self.graph_x0 + (self.graph_data['distance'][i+1] / self.max_distance) * self.graph_width
-                y2 = self.graph_y0 + self.graph_height - (self.graph_data['ke'][i+1] / self.max_energy) * self.graph_height
-                
-                self.graph_canvas.create_line(x1, y1, x2, y2, fill="red", width=2, 
-                                              dash=(4, 2), tags="plot_line")
+        # Rescale what is already drawn and relabel the ticks only when the range grew
+        scale = (self.max_distance, self.max_energy)
+        if scale != self.graph_scale:
+            if self.graph_scale is not None:
+                old_distance, old_energy = self.graph_scale
+                self.graph_canvas.scale("plot_line", self.graph_x0, self.graph_y0 + self.graph_height,
+                                        old_distance / self.max_distance, old_energy / self.max_energy)
+            self.graph_scale = scale
+            for i in range(5):
+                self.graph_canvas.itemconfigure(self.y_ticks[i], text=f"{(self.max_energy / 4) * i:.1f}")
+                self.graph_canvas.itemconfigure(self.x_ticks[i], text=f"{(self.max_distance / 4) * i:.1f}")
+        
+        # Append the new point to each series' polyline: constant work per point
+        x = self.graph_x0 + (distance / self.max_distance) * self.graph_width
+        for line, value in ((self.work_line, work), (self.ke_line, ke)):
+            y = self.graph_y0 + self.graph_height - (value / self.max_energy) * self.graph_height
+            if len(self.graph_data['distance']) == 1:
+                self.graph_canvas.coords(line, x, y, x, y)
+                self.graph_canvas.itemconfigure(line, state="normal")
+            else:
+                self.graph_canvas.insert(line, "end", (x, y))
 
     def get_physics_params(self):
         try:
@@ -749,9 +740,8 @@ Push Modes:
         self.start_timer()
         # -------------------------
 
-        # Start animation in a separate thread
-        self.animation_thread = threading.Thread(target=self.animate_motion, args=(results,))
-        self.animation_thread.start()
+        # Frames are scheduled on the Tk main loop
+        self.animate_motion(results)
         
     def stop_timer(self):
         if self.timer_id:
@@ -761,6 +751,8 @@ Push Modes:
 
     def stop_simulation(self):
         self.is_animating = False
+        if self.scheduler is not None:
+            self.scheduler.stop()
         self.run_btn.config(state="normal")
         self.feedback.config(text="⏹ Stopped", fg="#ffaa00")
         
@@ -936,60 +928,76 @@ Push Modes:
         self.canvas.create_text(x_center + f_dx + 20, y_center + f_dy, text="F", fill="#00e6e6", font=("Consolas", 9, "bold"))
 
     def animate_motion(self, results):
+        """Play the run on the Tk main loop with a fixed-timestep FrameScheduler
+
+        Each step advances the object and the energy graph by one slice of
+        the distance; a rendered frame applies the steps taken since the
+        last one, so no canvas call ever leaves the Tk thread.
+        """
         params = results['params']
         scenario = params['scenario']
         distance = params['d']
         angle = params['angle']
         push_mode = params['push_mode']
+        force_angle = params['force_angle']
         
         # Calculate net force for work calculation
         net_force = results['net_work'] / distance if distance > 0 else 0
         
         steps = int(distance * 15)
-        speed_factor = 1.0 / self.anim_speed.get()
-        
-        accumulated_distance = 0.0
         distance_per_step = distance / steps if steps > 0 else 0
+        state = {'step': 0, 'distance': 0.0, 'dx': 0.0, 'dy': 0.0, 'points': []}
         
-        for step in range(steps):
-            if not self.is_animating:
-                break
-                
+        def step():
+            if state['step'] >= steps:
+                return False
+            
             if push_mode == "Constant Force":
                 move_val = 4
             elif push_mode == "Sudden Push":
-                move_val = 20 if step < 5 else 0.5
+                move_val = 20 if state['step'] < 5 else 0.5
             elif push_mode == "Increasing Force":
-                move_val = 2 + (step / steps) * 6
+                move_val = 2 + (state['step'] / steps) * 6
             
             # Update accumulated distance
-            accumulated_distance += distance_per_step
+            state['distance'] += distance_per_step
             
             # Calculate current work and KE
-            current_work = net_force * accumulated_distance
+            current_work = net_force * state['distance']
             current_ke = current_work  # Work-Energy Theorem
-            
-            # Update graph in real-time
-            self.update_graph(accumulated_distance, current_work, current_ke)
+            state['points'].append((state['distance'], current_work, current_ke))
             
             if scenario == "Lifting Object":
-                self._move_object(0, -move_val)
+                dx, dy = 0, -move_val
             elif scenario == "Inclined Plane":
                 dx = move_val * math.cos(math.radians(angle))
                 dy = -move_val * math.sin(math.radians(angle))
-                self._move_object(dx, dy)
             else:
-                force_angle = params['force_angle']
                 dx = move_val * math.cos(math.radians(force_angle))
                 dy = -move_val * math.sin(math.radians(force_angle))
-                self._move_object(dx, dy)
-            
-            self.canvas.update()
-            time.sleep(0.02 * speed_factor)
-        
+            state['dx'] += dx
+            state['dy'] += dy
+            state['step'] += 1
+            return state['step'] < steps
+        
+        def render():
+            # Update graph in real-time, then move the object once for the whole frame
+            for point in state['points']:
+                self.update_graph(*point)
+            state['points'] = []
+            if state['dx'] or state['dy']:
+                self._move_object(state['dx'], state['dy'])
+                state['dx'] = state['dy'] = 0.0
+        
+        # The speed slider is read every frame, so it applies mid-run
+        self.scheduler = FrameScheduler(self.root, step, render, speed=self.anim_speed.get,
+                                        on_finish=self._on_animation_complete)
+        self.scheduler.start()
+
+    def _on_animation_complete(self):
         self.draw_ke_indicator()
         
-        # Stop the timer when animation thread completes normally
+        # Stop the timer when the animation completes normally
         self.stop_timer()
 
         self.is_animating = False
@@ -3,7 +3,8 @@ Physics calculation engine for ForceQuest
 Handles all force, work, energy, and power calculations
 """
 import math
-from config import GRAVITY, SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP
+import numpy as np
+from config import GRAVITY, SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP, SCENARIOS
 
 
 class PhysicsCalculator:
@@ -178,6 +179,117 @@ class PhysicsCalculator:
             'Fn': Fn
         }
 
+    def calculate_motion_batch(self, scenario, F, d, m, angle, mu, force_angle):
+        """
+        Vectorised version of calculate_motion for parameter sweeps
+        Inputs are broadcast against each other; F or m may be NaN where the
+        scalar version would receive None. `scenario` is either a scenario
+        name or an integer array of indices into SCENARIOS.
+        Returns a dictionary of arrays (no solution text)
+        """
+        g = self.g
+        if isinstance(scenario, str):
+            scenario = SCENARIOS.index(scenario)
+        scenario = np.asarray(scenario)
+        F, d, m, angle, mu, force_angle = (np.asarray(a, dtype=np.float64)
+                                           for a in (F, d, m, angle, mu, force_angle))
+        lifting = scenario == SCENARIOS.index("Lifting Object")
+        incline = scenario == SCENARIOS.index("Inclined Plane")
+        pushing = ~(lifting | incline)
+
+        def by_scenario(lift_val, incline_val, push_val):
+            # Plain selection when the whole batch shares one scenario
+            if scenario.ndim == 0:
+                return lift_val() if lifting else incline_val() if incline else push_val()
+            return np.where(lifting, lift_val(), np.where(incline, incline_val(), push_val()))
+
+        # Trig is evaluated before broadcasting so sweeps only pay per axis value
+        sin_theta = np.sin(np.radians(angle))
+        cos_theta = np.cos(np.radians(angle))
+        sin_fa = np.sin(np.radians(force_angle))
+        cos_fa = np.cos(np.radians(force_angle))
+        F_given = ~np.isnan(F)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Calculate mass if not provided
+            m_missing = np.isnan(m)
+            if m_missing.any():
+                m_from_force = by_scenario(lambda: F / g,
+                                           lambda: F / (g * sin_theta),
+                                           lambda: F / (mu * g))
+                solvable = F_given & by_scenario(lambda: True,
+                                                 lambda: sin_theta != 0,
+                                                 lambda: mu != 0)
+                m = np.where(m_missing, m_from_force, m)
+                valid = ~m_missing | solvable
+            else:
+                valid = np.True_
+
+            # Calculate forces
+            weight = m * g
+            F_vertical = np.where(F_given, F, 0.0) * sin_fa
+            Fn = np.maximum(by_scenario(lambda: weight - F_vertical,
+                                        lambda: weight * cos_theta,
+                                        lambda: weight - F_vertical), 0)
+            F_friction = by_scenario(lambda: np.zeros_like(Fn),
+                                     lambda: mu * Fn,
+                                     lambda: mu * Fn)
+            F_req = by_scenario(lambda: weight,
+                                lambda: weight * sin_theta + F_friction,
+                                lambda: F_friction)
+            if not F_given.all():
+                F = np.where(F_given, F, F_req * 1.2)
+            moves = valid & (F >= F_req)
+
+            # Net force in direction of motion
+            net_force = by_scenario(lambda: F - weight,
+                                    lambda: F - weight * sin_theta - F_friction,
+                                    lambda: F * cos_fa - F_friction)
+            net_force = np.where(net_force < 0,
+                                 np.where((F > F_req) & pushing, F - F_req, 0.0),
+                                 net_force)
+            net_force = np.where(moves, net_force, 0.0)
+
+            net_work = net_force * d
+            ke_final = np.maximum(net_work, 0)
+            v_final = np.where((m > 0) & (ke_final > 0), np.sqrt(2 * ke_final / m), 0.0)
+            power = net_work / 3.0
+
+        shape = np.broadcast_shapes(scenario.shape, F.shape, d.shape, m.shape,
+                                    angle.shape, mu.shape, force_angle.shape)
+        return {
+            'moves': np.broadcast_to(moves, shape),
+            'valid': np.broadcast_to(valid, shape),
+            'F': np.broadcast_to(F, shape),
+            'm': np.broadcast_to(m, shape),
+            'F_req': np.broadcast_to(F_req, shape),
+            'Fn': np.broadcast_to(Fn, shape),
+            'net_force': np.broadcast_to(net_force, shape),
+            'net_work': np.broadcast_to(net_work, shape),
+            'ke_final': np.broadcast_to(ke_final, shape),
+            'v_final': np.broadcast_to(v_final, shape),
+            'power': np.broadcast_to(power, shape)
+        }
+
+    def calculate_motion_many(self, runs):
+        """
+        calculate_motion-style results (without solution text) for several
+        params dictionaries, from a single calculate_motion_batch call
+        """
+        column = lambda key: np.array([np.nan if p.get(key) is None else p[key] for p in runs], dtype=np.float64)
+        scenario = np.array([SCENARIOS.index(p['scenario']) for p in runs])
+        batch = self.calculate_motion_batch(scenario, column('F'), column('d'), column('m'),
+                                            column('angle'), column('mu'), column('force_angle'))
+        results = []
+        for i, params in enumerate(runs):
+            params = dict(params, F=float(batch['F'][i]), m=float(batch['m'][i]))
+            result = {'moves': bool(batch['moves'][i]), 'params': params}
+            if result['moves']:
+                result.update({key: float(batch[key][i])
+                               for key in ('F_req', 'net_work', 'ke_final', 'v_final', 'power', 'Fn')})
+            results.append(result)
+        return results
+
     @staticmethod
     def calculate_physics(params):
         """Static method for compatibility - creates instance and calculates"""
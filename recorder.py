@@ -0,0 +1,229 @@
+"""
+Offscreen recorder for ForceQuest runs
+Renders a run from its precomputed trajectory with PIL, without a display, and
+writes an animated GIF or a PNG frame sequence. Frames are drawn and encoded
+across a process pool.
+
+Usage:
+    python recorder.py --scenario "Inclined Plane" --force 300 --mass 10 --distance 20 --out run.gif
+    python recorder.py --force 200 --distance 50 --out frames/
+    python recorder.py --force 200 --distance 50 --out run.gif --telemetry run.csv
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from config import (CANVAS, SCENARIOS, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES,
+                    PUSH_MODES, SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP)
+from physics_engine import PhysicsCalculator
+from trajectory import compute_trajectory
+from ui_components.simulation_canvas import ke_indicator_layout, fitted_camera, run_layers, scale_layout
+from utils.offscreen import render_layout, draw_primitive
+from utils.telemetry_writer import export_run
+
+RECORD_FPS = 25
+RECORD_MAX_FRAMES = 1500
+FINAL_FRAME_HOLD = 1.5  # seconds the last GIF frame stays up
+CHUNK_FRAMES = 16
+
+# Per-process scene, filled once by the pool initializer
+_SCENE = {}
+
+
+def _init_worker(background, obj, size, palette):
+    """Pool initializer: draw the static background once in this process"""
+    _SCENE.clear()
+    _SCENE['base'] = render_layout(background, *size)
+    _SCENE['object'] = obj
+    if palette is not None:
+        _SCENE['palette'] = Image.new("P", (1, 1))
+        _SCENE['palette'].putpalette(palette)
+
+
+def _shifted(items, dx, dy):
+    return [(kind, tuple(c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords)), options)
+            for kind, coords, options in items]
+
+
+def draw_frame(base, obj, frame):
+    """Compose one frame: background copy, object at its offset, then the overlays"""
+    image = base.copy()
+    draw = ImageDraw.Draw(image)
+    for primitive in _shifted(obj, frame['dx'], frame['dy']) + frame['overlay']:
+        draw_primitive(draw, *primitive)
+    return image
+
+
+def _render_chunk(frames, out_dir):
+    """Render and encode frames (runs in a worker)
+
+    With `out_dir` each frame is written as a PNG and its path returned;
+    otherwise frames are quantized to the shared palette and returned as raw
+    bytes for the parent to assemble into a GIF.
+    """
+    out = []
+    for frame in frames:
+        image = draw_frame(_SCENE['base'], _SCENE['object'], frame)
+        if out_dir is not None:
+            path = os.path.join(out_dir, f"frame_{frame['number']:05d}.png")
+            image.save(path, format="PNG")
+            out.append((frame['number'], path))
+        else:
+            quantized = image.quantize(palette=_SCENE['palette'], dither=Image.Dither.NONE)
+            out.append((frame['number'], quantized.tobytes()))
+    return out
+
+
+def frame_indices(trajectory, fps=RECORD_FPS, speed=1.0, max_frames=RECORD_MAX_FRAMES):
+    """Trajectory indices sampled at `fps`, plus the effective playback speed
+
+    Samples are skipped rather than played back in real time; runs that would
+    need more than `max_frames` are sped up to fit.
+    """
+    duration = trajectory.duration
+    speed = max(speed, duration * fps / max(max_frames - 1, 1))
+    times = np.arange(0.0, duration, speed / fps)
+    indices = [trajectory.index_at_time(t) for t in times]
+    if not indices or indices[-1] != len(trajectory) - 1:
+        indices.append(len(trajectory) - 1)
+    return indices, speed
+
+
+def build_recording(results, fps=RECORD_FPS, speed=1.0, scale=1.0, max_frames=RECORD_MAX_FRAMES):
+    """Static layers and per-frame descriptions for a moving calculate_motion result
+
+    Everything is already scaled to the output size, so workers never resample.
+    """
+    params = results['params']
+    trajectory = compute_trajectory(results)
+    camera = fitted_camera(params, trajectory)
+    background, obj = run_layers(params, camera)
+
+    indices, speed = frame_indices(trajectory, fps, speed, max_frames)
+    ax, ay = camera.anchor
+    frames = []
+    for number, index in enumerate(indices):
+        sx, sy = camera.to_screen(trajectory.x[index], trajectory.y[index])
+        dx, dy = sx - ax, sy - ay
+        text = f"t = {trajectory.t[index]:.2f} s   v = {trajectory.v[index]:.2f} m/s"
+        overlay = [('text', (CANVAS['width'] / 2, 20), {'text': text, 'fill': "black",
+                                                        'font': ("Consolas", 11, "bold")})]
+        if number == len(indices) - 1:
+            xs, ys = [c + dx for p in obj for c in p[1][::2]], [c + dy for p in obj for c in p[1][1::2]]
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+            overlay += ke_indicator_layout(bbox, f"ΔKE (Net Work) = {results['ke_final']:.2f} J", color="#2e7d32")
+        frames.append({'number': number, 'dx': dx * scale, 'dy': dy * scale, 'overlay': scale_layout(overlay, scale)})
+    size = (int(CANVAS['width'] * scale), int(CANVAS['height'] * scale))
+    return {'background': scale_layout(background, scale), 'object': scale_layout(obj, scale), 'frames': frames,
+            'size': size, 'speed': speed, 'duration': trajectory.duration}
+
+
+def record(results, path, fps=RECORD_FPS, speed=1.0, scale=1.0, max_frames=RECORD_MAX_FRAMES,
+           workers=None, progress=None, token=None):
+    """Record a run to `path`: an animated GIF if it ends in .gif, else a PNG sequence directory
+
+    Frames of an earlier recording into the same directory (frame_*.png) are
+    deleted first, so a shorter run never leaves stale frames at the end.
+    `progress(fraction, message)` and `token.check()` follow the utils.jobs
+    conventions so the recorder can run as a background job. Returns the
+    recording description from build_recording.
+    """
+    if not results.get('moves'):
+        raise ValueError("Only runs where the object moves can be recorded")
+    recording = build_recording(results, fps, speed, scale, max_frames)
+    frames = recording['frames']
+    size = recording['size']
+    as_gif = path.lower().endswith(".gif")
+
+    palette = None
+    if as_gif:
+        # One palette for every frame, taken from the busiest (final) frame
+        base = render_layout(recording['background'], *size)
+        sample = draw_frame(base, recording['object'], frames[-1])
+        palette = sample.quantize(colors=255).getpalette()
+        out_dir = None
+    else:
+        out_dir = path
+        os.makedirs(out_dir, exist_ok=True)
+        for old in glob.glob(os.path.join(glob.escape(out_dir), "frame_*.png")):
+            os.remove(old)
+
+    chunks = [frames[i:i + CHUNK_FRAMES] for i in range(0, len(frames), CHUNK_FRAMES)]
+    encoded = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(recording['background'], recording['object'], size, palette)) as pool:
+        pending = [pool.submit(_render_chunk, chunk, out_dir) for chunk in chunks]
+        try:
+            for future in as_completed(pending):
+                encoded.update(future.result())
+                if token is not None:
+                    token.check()
+                if progress is not None:
+                    progress(len(encoded) / len(frames), f"{len(encoded)}/{len(frames)} frames")
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    if as_gif:
+        images = []
+        for number in range(len(frames)):
+            image = Image.frombytes("P", size, encoded[number])
+            image.putpalette(palette)
+            images.append(image)
+        frame_ms = int(round(1000 / fps))
+        durations = [frame_ms] * (len(images) - 1) + [int(FINAL_FRAME_HOLD * 1000)]
+        # Frames already share one palette; PIL's per-frame palette optimization would
+        # cost more than the whole render
+        images[0].save(path, save_all=True, append_images=images[1:], duration=durations, loop=0, optimize=False)
+    return recording
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a ForceQuest run to an animated GIF or PNG frames")
+    parser.add_argument("--scenario", choices=SCENARIOS, default=SCENARIOS[0])
+    parser.add_argument("--force", type=float, default=None, help="applied force (N); blank solves for it")
+    parser.add_argument("--mass", type=float, default=10.0, help="mass (kg)")
+    parser.add_argument("--distance", type=float, default=10.0, help="distance (m)")
+    parser.add_argument("--angle", type=float, default=30.0, help="incline angle (degrees)")
+    parser.add_argument("--surface", choices=SURFACE_MATERIALS, default="Wood")
+    parser.add_argument("--shape", choices=OBJECT_SHAPES, default="Box")
+    parser.add_argument("--force-angle", choices=FORCE_ANGLES, default="Horizontal")
+    parser.add_argument("--push-mode", choices=PUSH_MODES, default=PUSH_MODES[0])
+    parser.add_argument("--fps", type=int, default=RECORD_FPS)
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed of the recording")
+    parser.add_argument("--scale", type=float, default=1.0, help="output size relative to the canvas")
+    parser.add_argument("--out", default="run.gif", help=".gif file, or a directory for PNG frames")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--telemetry", default=None, help="also write per-step telemetry to this .csv or .npz")
+    args = parser.parse_args()
+
+    params = {
+        'F': args.force, 'm': args.mass, 'd': args.distance,
+        'angle': args.angle if args.scenario == "Inclined Plane" else 0.0,
+        'mu': SURFACE_FRICTION[args.surface] * SHAPE_FRICTION_FACTOR[args.shape],
+        'force_angle': FORCE_ANGLE_MAP[args.force_angle] if args.scenario == "Pushing Object" else 0,
+        'scenario': args.scenario, 'shape': args.shape, 'surface': args.surface, 'push_mode': args.push_mode,
+    }
+    results = PhysicsCalculator().calculate_motion(params)
+    if not results['moves']:
+        parser.error("the object does not move with these inputs")
+
+    start = time.perf_counter()
+    recording = record(results, args.out, args.fps, args.speed, args.scale, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Recorded {len(recording['frames'])} frames of a {recording['duration']:.2f}s run "
+          f"(x{recording['speed']:.2f}) to {args.out} in {elapsed:.2f}s "
+          f"({recording['duration'] / elapsed:.1f}x faster than real time)")
+    if args.telemetry:
+        rows = export_run(results, args.telemetry)
+        print(f"Wrote {rows} telemetry samples to {args.telemetry}")
+
+
+if __name__ == "__main__":
+    main()
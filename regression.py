@@ -0,0 +1,252 @@
+"""
+Golden-file regression grid for the ForceQuest physics
+Evaluates every physics implementation in the tree over a large deterministic
+grid and compares the results with stored golden values.
+
+Usage:
+    python regression.py            # check against the golden file
+    python regression.py --update   # regenerate the golden file
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from config import (SCENARIOS, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES, PUSH_MODES,
+                    SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP)
+from physics_engine import PhysicsCalculator
+from sweep import SweepResult, build_grid, chunk_ranges, slice_columns
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'golden', 'physics_grid.npz')
+
+# Grid axes; NaN stands for a blank input field
+GRID_AXES = {
+    'scenario': SCENARIOS,
+    'surface': range(len(SURFACE_MATERIALS)),
+    'shape': range(len(OBJECT_SHAPES)),
+    'force_angle_mode': range(len(FORCE_ANGLES)),
+    'push_mode': range(len(PUSH_MODES)),
+    'F': [np.nan, 0.0, 50.0, 400.0, 1600.0],
+    'm': [np.nan, 2.0, 40.0],
+    'angle': [0.0, 20.0, 45.0, 75.0],
+    'd': [0.5, 12.0],
+}
+
+# Compared output fields -> (rtol, atol)
+TOLERANCES = {
+    'moves': (0.0, 0.0),
+    'm_out': (1e-9, 1e-9),
+    'F_out': (1e-9, 1e-9),
+    'F_req': (1e-9, 1e-9),
+    'Fn': (1e-9, 1e-9),
+    'net_work': (1e-9, 1e-9),
+    'ke_final': (1e-9, 1e-9),
+    'v_final': (1e-9, 1e-9),
+    'power': (1e-9, 1e-9),
+}
+INPUT_FIELDS = tuple(GRID_AXES)
+
+
+def build_regression_grid():
+    """The deterministic input columns, with friction and force angle resolved"""
+    columns = build_grid(GRID_AXES)
+    surface_mu = np.array([SURFACE_FRICTION[s] for s in SURFACE_MATERIALS])
+    shape_factor = np.array([SHAPE_FRICTION_FACTOR[s] for s in OBJECT_SHAPES])
+    angle_map = np.array([FORCE_ANGLE_MAP[a] for a in FORCE_ANGLES], dtype=np.float64)
+    columns['mu'] = surface_mu[columns['surface'].astype(int)] * shape_factor[columns['shape'].astype(int)]
+    columns['force_angle'] = angle_map[columns['force_angle_mode'].astype(int)]
+    return columns
+
+
+def row_params(columns, i):
+    """UI-style params dictionary for one grid row"""
+    blank = lambda v: None if math.isnan(v) else float(v)
+    return {
+        'F': blank(columns['F'][i]), 'd': float(columns['d'][i]), 'm': blank(columns['m'][i]),
+        'angle': float(columns['angle'][i]), 'mu': float(columns['mu'][i]),
+        'force_angle': float(columns['force_angle'][i]),
+        'scenario': SCENARIOS[int(columns['scenario'][i])],
+        'shape': OBJECT_SHAPES[int(columns['shape'][i])],
+        'surface': SURFACE_MATERIALS[int(columns['surface'][i])],
+        'push_mode': PUSH_MODES[int(columns['push_mode'][i])],
+    }
+
+
+class _LegacyAppState:
+    """Just enough of forcequest.ForceQuestApp for its calculate_physics method"""
+
+    class _Speed:
+        def get(self):
+            return 1.0
+
+    anim_speed = _Speed()
+
+
+def _legacy_calculator():
+    """calculate_physics from the standalone forcequest.py app"""
+    from forcequest import ForceQuestApp
+    state = _LegacyAppState()
+    return lambda params: ForceQuestApp.calculate_physics(state, params)
+
+
+def _engine_calculator():
+    """calculate_motion from physics_engine (used by app.py)"""
+    return PhysicsCalculator().calculate_motion
+
+
+def _scalar_solvable(params):
+    """Whether a blank mass can be solved; forcequest.py shows a dialog otherwise"""
+    if params['m'] is not None:
+        return True
+    if params['F'] is None:
+        return False
+    if params['scenario'] == "Inclined Plane":
+        return math.sin(math.radians(params['angle'])) != 0
+    return params['scenario'] == "Lifting Object" or params['mu'] != 0
+
+
+IMPLEMENTATIONS = {
+    'engine': _engine_calculator,
+    'legacy': _legacy_calculator,
+}
+
+
+def _empty_outputs(n):
+    outputs = {name: np.full(n, np.nan) for name in TOLERANCES}
+    outputs['moves'] = np.zeros(n, dtype=bool)
+    return outputs
+
+
+def evaluate_scalar_chunk(impl, columns):
+    """Evaluate one chunk row by row with a scalar implementation"""
+    calculate = IMPLEMENTATIONS[impl]()
+    n = len(columns['F'])
+    outputs = _empty_outputs(n)
+    for i in range(n):
+        params = row_params(columns, i)
+        if impl == 'legacy' and not _scalar_solvable(params):
+            continue
+        results = calculate(params)
+        if not results or not results['moves']:
+            continue
+        outputs['moves'][i] = True
+        outputs['m_out'][i] = results['params']['m']
+        outputs['F_out'][i] = results['params']['F']
+        for name in ('F_req', 'Fn', 'net_work', 'ke_final', 'v_final', 'power'):
+            outputs[name][i] = results[name]
+    return outputs
+
+
+def evaluate_batch_chunk(columns):
+    """Evaluate one chunk with the vectorised engine"""
+    calc = PhysicsCalculator()
+    out = calc.calculate_motion_batch(columns['scenario'], columns['F'], columns['d'], columns['m'],
+                                      columns['angle'], columns['mu'], columns['force_angle'])
+    moves = np.asarray(out['moves'])
+    outputs = {'moves': moves.copy()}
+    for name, key in (('m_out', 'm'), ('F_out', 'F'), ('F_req', 'F_req'), ('Fn', 'Fn'),
+                      ('net_work', 'net_work'), ('ke_final', 'ke_final'),
+                      ('v_final', 'v_final'), ('power', 'power')):
+        outputs[name] = np.where(moves, out[key], np.nan)
+    return outputs
+
+
+def _evaluate_chunk(impl, columns):
+    if impl == 'batch':
+        return evaluate_batch_chunk(columns)
+    return evaluate_scalar_chunk(impl, columns)
+
+
+def evaluate_grid(impl, columns, workers=None, chunk_size=2048):
+    """Evaluate the grid with one implementation across a process pool"""
+    n = len(columns['F'])
+    chunks = [slice_columns(columns, start, stop) for start, stop in chunk_ranges(n, chunk_size)]
+    if impl == 'batch':
+        parts = [evaluate_batch_chunk(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_evaluate_chunk, [impl] * len(chunks), chunks))
+    return {name: np.concatenate([p[name] for p in parts]) for name in TOLERANCES}
+
+
+def golden_result(columns, outputs):
+    """Columnar golden record: grid inputs followed by expected outputs"""
+    stored = {name: columns[name] for name in INPUT_FIELDS}
+    stored.update(outputs)
+    return SweepResult(stored)
+
+
+def compare(expected, actual, columns, limit=10):
+    """Return (number of differing rows, report lines for the first `limit` of them)"""
+    n = len(expected)
+    bad = np.zeros(n, dtype=bool)
+    failing = {}
+    for name, (rtol, atol) in TOLERANCES.items():
+        exp, act = expected[name], actual[name]
+        if exp.dtype == bool:
+            mismatch = exp != act
+        else:
+            mismatch = ~np.isclose(act, exp, rtol=rtol, atol=atol, equal_nan=True)
+        failing[name] = mismatch
+        bad |= mismatch
+
+    rows = np.flatnonzero(bad)
+    lines = []
+    for i in rows[:limit]:
+        params = row_params(columns, i)
+        shown = {k: params[k] for k in ('scenario', 'surface', 'shape', 'push_mode', 'F', 'm', 'd', 'angle')}
+        fields = ", ".join(f"{name}: expected {expected[name][i].item()!r}, got {actual[name][i].item()!r}"
+                           for name in TOLERANCES if failing[name][i])
+        lines.append(f"  row {i} {shown}\n      {fields}")
+    return len(rows), lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ForceQuest physics regression grid")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden file from physics_engine")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--impl", nargs="+", default=['engine', 'batch', 'legacy'],
+                        choices=['engine', 'batch', 'legacy'])
+    parser.add_argument("--limit", type=int, default=10, help="differing rows to print")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = build_regression_grid()
+    n = len(columns['F'])
+
+    if args.update:
+        outputs = evaluate_grid('engine', columns, args.workers)
+        os.makedirs(os.path.dirname(args.golden), exist_ok=True)
+        golden_result(columns, outputs).save(args.golden)
+        print(f"Wrote {n} golden rows to {args.golden} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    expected = SweepResult.load(args.golden)
+    if len(expected) != n or any(not np.array_equal(expected[k], columns[k], equal_nan=True)
+                                 for k in INPUT_FIELDS):
+        print("✗ Golden grid inputs differ from GRID_AXES; rerun with --update if intended")
+        return 1
+
+    failed = False
+    for impl in args.impl:
+        t = time.perf_counter()
+        actual = evaluate_grid(impl, columns, args.workers)
+        count, lines = compare(expected, actual, columns, args.limit)
+        elapsed = time.perf_counter() - t
+        if count:
+            failed = True
+            print(f"✗ {impl}: {count}/{n} rows differ ({elapsed:.2f}s)")
+            print("\n".join(lines))
+        else:
+            print(f"✓ {impl}: {n} rows match ({elapsed:.2f}s)")
+
+    print(f"Total {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Headless rendering benchmark for ForceQuest
+Plays a full run of every scenario through the app's own scene and live graph
+(RunScene and RunGraph) on the recording backend (draw-call counts) and the
+PIL backend (raster time), so rendering cost can be compared across changes
+without a display.
+
+Usage:
+    python render_bench.py                          # print counts and timings
+    python render_bench.py --out bench.json         # save them as a baseline
+    python render_bench.py --compare bench.json     # show changes against a baseline
+"""
+import argparse
+import json
+import time
+
+from config import SCENARIOS, CANVAS, GRAPH_HEIGHT
+from physics_engine import PhysicsCalculator
+from trajectory import compute_trajectory
+from ui_components.run_graph import RunGraph
+from ui_components.run_scene import RunScene
+from utils.backends import RecordingBackend, PILBackend
+from utils.telemetry import run_channels
+
+BENCH_PARAMS = {
+    "Pushing Object": {'F': 120.0, 'm': 10.0, 'd': 5.0, 'angle': 0.0, 'mu': 0.5, 'force_angle': 30},
+    "Lifting Object": {'F': 150.0, 'm': 10.0, 'd': 4.0, 'angle': 0.0, 'mu': 0.0, 'force_angle': 0},
+    "Inclined Plane": {'F': 150.0, 'm': 10.0, 'd': 5.0, 'angle': 25.0, 'mu': 0.3, 'force_angle': 0},
+}
+
+
+def bench_params(scenario, shape="Cylinder"):
+    params = dict(BENCH_PARAMS[scenario])
+    params.update({'scenario': scenario, 'shape': shape, 'surface': "Wood", 'push_mode': "Constant Force"})
+    return params
+
+
+def play_run(scene, graph, results, trajectory, on_frame=None):
+    """Play one run the way the app does, phase by phase, yielding each phase name when done"""
+    params = results['params']
+    scene.reset()
+    graph.clear()
+    scene.set_background(params)
+    graph.load(run_channels(results, trajectory))
+    scene.load(results, trajectory)
+    yield 'setup'
+
+    for i in range(len(trajectory)):
+        scene.show(i)
+        graph.seek(i)
+        graph.redraw()
+        if on_frame is not None:
+            on_frame()
+    yield 'frames'
+
+    scene.draw_ke_indicator(f"ΔKE (Net Work) = {trajectory.ke[-1]:.2f} J")
+    yield 'finish'
+
+    # Same inputs again: reused items should keep this cheap
+    graph.clear()
+    scene.set_background(params)
+    graph.load(run_channels(results, trajectory))
+    scene.load(results, trajectory)
+    yield 'rerun'
+
+
+def bench_scenario(scenario):
+    """Draw-call counts per phase (scene and graph together) and PIL time per frame for one scenario"""
+    params = bench_params(scenario)
+    results = PhysicsCalculator().calculate_motion(dict(params))
+    trajectory = compute_trajectory(results)
+
+    backends = (RecordingBackend(keep_ops=False), RecordingBackend(CANVAS['width'], GRAPH_HEIGHT, keep_ops=False))
+    scene, graph = RunScene(backends[0]), RunGraph(backends[1])
+    for backend in backends:
+        backend.reset_counts()
+    counts = {}
+    for phase in play_run(scene, graph, results, trajectory):
+        counts[phase] = sum(backend.total for backend in backends)
+        for backend in backends:
+            backend.reset_counts()
+    frames = len(trajectory)
+    counts['per_frame'] = counts['frames'] / frames
+
+    rasters = (PILBackend(), PILBackend(CANVAS['width'], GRAPH_HEIGHT))
+    scene, graph = RunScene(rasters[0]), RunGraph(rasters[1])
+
+    def render():
+        for raster in rasters:
+            raster.render()
+
+    for phase in play_run(scene, graph, results, trajectory, on_frame=render):
+        if phase == 'setup':
+            start = time.perf_counter()
+        elif phase == 'frames':
+            counts['pil_ms_per_frame'] = (time.perf_counter() - start) / frames * 1000
+    counts['samples'] = frames
+    return counts
+
+
+def compare(report, baseline):
+    """Print each metric with its change against the baseline"""
+    for scenario, metrics in report.items():
+        print(scenario)
+        for name, value in metrics.items():
+            old = baseline.get(scenario, {}).get(name)
+            delta = "" if old is None else f"  ({value - old:+.3g} vs {old:.4g})"
+            print(f"  {name:18s} {value:10.4g}{delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless ForceQuest rendering benchmark")
+    parser.add_argument("--out", default=None, help="write the report to this JSON file")
+    parser.add_argument("--compare", default=None, help="baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    report = {scenario: bench_scenario(scenario) for scenario in SCENARIOS}
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    compare(report, baseline)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
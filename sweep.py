@@ -0,0 +1,155 @@
+"""
+Parameter sweep helpers for ForceQuest
+Evaluates the physics engine over whole grids of configurations at once
+"""
+import numpy as np
+from physics_engine import PhysicsCalculator
+from config import SCENARIOS
+
+
+# Sweepable parameters: label -> (params key, default min, default max)
+SWEEP_AXES = {
+    "Mass (kg)": ('m', 1.0, 100.0),
+    "Angle (°)": ('angle', 0.0, 60.0),
+    "Force (N)": ('F', 0.0, 1000.0),
+    "Friction μ": ('mu', 0.0, 1.0),
+    "Distance (m)": ('d', 1.0, 100.0),
+    "Force Angle (°)": ('force_angle', -60.0, 60.0),
+}
+
+# Parameters passed to the batch engine, in call order
+ENGINE_KEYS = ('F', 'd', 'm', 'angle', 'mu', 'force_angle')
+
+# Engine outputs stored for every swept row
+RESULT_KEYS = ('moves', 'valid', 'F', 'm', 'F_req', 'Fn', 'net_force',
+               'net_work', 'ke_final', 'v_final', 'power')
+
+
+def _engine_value(params, key):
+    """Convert a params entry to a float, mapping None to NaN"""
+    value = params.get(key)
+    return np.nan if value is None else float(value)
+
+
+def compute_slice(base_params, x_axis, x_values, y_axis, y_values):
+    """
+    Evaluate a 2D slice through parameter space
+    `x_axis` / `y_axis` are SWEEP_AXES labels. Row 0 of every returned array
+    corresponds to the last entry of `y_values` so the result can be drawn
+    top-down as an image with y increasing upwards.
+    """
+    x_key = SWEEP_AXES[x_axis][0]
+    y_key = SWEEP_AXES[y_axis][0]
+    x = np.asarray(x_values, dtype=np.float64)[np.newaxis, :]
+    y = np.asarray(y_values, dtype=np.float64)[::-1, np.newaxis]
+
+    inputs = {key: _engine_value(base_params, key) for key in ENGINE_KEYS}
+    inputs[x_key] = x
+    inputs[y_key] = y
+
+    calc = PhysicsCalculator()
+    return calc.calculate_motion_batch(base_params['scenario'],
+                                       *(inputs[key] for key in ENGINE_KEYS))
+
+
+class SweepResult:
+    """Columnar store for sweep rows: one equal-length NumPy array per field"""
+
+    def __init__(self, columns=None):
+        self.columns = {name: np.asarray(values) for name, values in (columns or {}).items()}
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+
+    def __len__(self):
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def fields(self):
+        return list(self.columns)
+
+    def row(self, index):
+        """Return one row as a plain dictionary"""
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+    def take(self, indices):
+        """Return a new result containing only the given rows"""
+        return SweepResult({name: values[indices] for name, values in self.columns.items()})
+
+    @classmethod
+    def concat(cls, parts):
+        """Join results with identical fields, in the given order"""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls()
+        fields = parts[0].fields
+        return cls({name: np.concatenate([p.columns[name] for p in parts]) for name in fields})
+
+    def save(self, path):
+        """Write the columns to a compressed .npz file"""
+        np.savez_compressed(path, **self.columns)
+
+    @classmethod
+    def load(cls, path):
+        """Read columns written by save()"""
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+
+def build_grid(axes):
+    """
+    Cartesian product of axis values as flat input columns
+    `axes` maps a column name to its values; scenario names are stored as
+    indices into SCENARIOS.
+    """
+    names = list(axes)
+    values = []
+    for name in names:
+        if name == 'scenario':
+            values.append(np.array([SCENARIOS.index(v) for v in axes[name]]))
+        else:
+            values.append(np.asarray(axes[name], dtype=np.float64))
+    mesh = np.meshgrid(*values, indexing='ij')
+    return {name: grid.ravel() for name, grid in zip(names, mesh)}
+
+
+def evaluate_columns(columns, defaults=None):
+    """
+    Evaluate input columns with the batch engine
+    Missing engine inputs come from `defaults` (None -> NaN). Returns a
+    SweepResult holding the input columns followed by RESULT_KEYS outputs;
+    engine outputs that share a name with an input (F, m) are stored with an
+    `out_` prefix.
+    """
+    defaults = defaults or {}
+    n = len(next(iter(columns.values())))
+    scenario = columns.get('scenario', SCENARIOS.index(defaults.get('scenario', SCENARIOS[0])))
+    inputs = [columns[key] if key in columns else _engine_value(defaults, key)
+              for key in ENGINE_KEYS]
+
+    calc = PhysicsCalculator()
+    outputs = calc.calculate_motion_batch(scenario, *inputs)
+
+    stored = dict(columns)
+    for key in RESULT_KEYS:
+        name = f"out_{key}" if key in columns else key
+        stored[name] = np.broadcast_to(outputs[key], (n,)).copy()
+    return SweepResult(stored)
+
+
+def chunk_ranges(n_rows, chunk_size):
+    """Split row indices into [start, stop) chunks"""
+    return [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+
+def slice_columns(columns, start, stop):
+    """Rows [start, stop) of every input column"""
+    return {name: values[start:stop] for name, values in columns.items()}
@@ -0,0 +1,338 @@
+"""
+Distributed parameter sweeps for ForceQuest
+A coordinator hands out sweep chunks over TCP (multiprocessing.managers) to
+worker processes on any number of machines and merges their results.
+
+The manager protocol unpickles what it receives, so anyone holding the auth
+key can run code on the coordinator and its workers. The built-in key is
+only accepted on loopback; anything else needs a private key from
+FORCEQUEST_SWEEP_KEY or --authkey.
+
+Usage:
+    export FORCEQUEST_SWEEP_KEY=<shared secret>
+    python sweep_cluster.py coordinator --host 0.0.0.0 --port 50000 --points 64 --out sweep.npz
+    python sweep_cluster.py worker --host 192.168.1.10 --port 50000
+    python sweep_cluster.py local --workers 4 --points 64 --out sweep.npz
+"""
+import argparse
+import collections
+import ipaddress
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+from config import SCENARIOS
+from sweep import SweepResult, build_grid, chunk_ranges, evaluate_columns, slice_columns
+
+DEFAULT_PORT = 50000
+DEFAULT_HOST = "127.0.0.1"
+BUILTIN_AUTHKEY = b"forcequest"  # public, so only good for loopback
+DEFAULT_AUTHKEY = os.environ.get("FORCEQUEST_SWEEP_KEY", "").encode() or BUILTIN_AUTHKEY
+
+
+def is_loopback(host):
+    """True if `host` names this machine only (127.0.0.0/8, ::1 or localhost)"""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def check_authkey(host, authkey):
+    """Refuse the published built-in key for any address other than loopback"""
+    if authkey == BUILTIN_AUTHKEY and not is_loopback(host):
+        raise ValueError(f"{host} is not loopback: set FORCEQUEST_SWEEP_KEY or pass --authkey "
+                         "with a private key (the built-in key is public)")
+
+
+class SweepCoordinator:
+    """Chunk queue with leases; lives in the coordinator process
+
+    A chunk handed to a worker is leased for `lease_timeout` seconds. Workers
+    renew their leases with heartbeats; when a worker goes silent its chunks
+    go back on the queue for someone else. Late results for chunks that were
+    already completed elsewhere are ignored.
+    """
+
+    def __init__(self, columns, chunk_size=4096, defaults=None, lease_timeout=10.0):
+        self.columns = columns
+        self.defaults = defaults or {}
+        self.lease_timeout = lease_timeout
+        self.chunks = chunk_ranges(len(next(iter(columns.values()))), chunk_size)
+        self.pending = collections.deque(range(len(self.chunks)))
+        self.leases = {}      # chunk_id -> (worker_id, deadline)
+        self.results = {}     # chunk_id -> columns
+        self.workers = {}     # worker_id -> stats
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.finished = None
+
+    def register(self, host):
+        """Add a worker and return its id"""
+        with self.lock:
+            worker_id = f"{host}#{len(self.workers) + 1}"
+            self.workers[worker_id] = {'host': host, 'rows': 0, 'chunks': 0, 'busy': 0.0,
+                                       'requeued': 0, 'last_seen': time.monotonic(), 'lost': False}
+            return worker_id
+
+    def next_chunk(self, worker_id):
+        """Lease the next chunk: returns (chunk_id, columns, defaults) or None"""
+        with self.lock:
+            self._touch(worker_id)
+            self._requeue_expired()
+            if not self.pending:
+                return None
+            chunk_id = self.pending.popleft()
+            self.leases[chunk_id] = (worker_id, time.monotonic() + self.lease_timeout)
+            start, stop = self.chunks[chunk_id]
+            return chunk_id, slice_columns(self.columns, start, stop), self.defaults
+
+    def submit(self, worker_id, chunk_id, columns, elapsed):
+        """Store a finished chunk; returns False if it was a duplicate"""
+        with self.lock:
+            self._touch(worker_id)
+            self.leases.pop(chunk_id, None)
+            if chunk_id in self.results:
+                return False
+            if chunk_id in self.pending:
+                self.pending.remove(chunk_id)
+            self.results[chunk_id] = columns
+            stats = self.workers[worker_id]
+            stats['rows'] += len(next(iter(columns.values())))
+            stats['chunks'] += 1
+            stats['busy'] += elapsed
+            if self.finished is None and len(self.results) == len(self.chunks):
+                self.finished = time.monotonic()
+            return True
+
+    def heartbeat(self, worker_id):
+        """Renew every lease held by a worker"""
+        with self.lock:
+            self._touch(worker_id)
+            deadline = time.monotonic() + self.lease_timeout
+            for chunk_id, (owner, _) in self.leases.items():
+                if owner == worker_id:
+                    self.leases[chunk_id] = (owner, deadline)
+
+    def done(self):
+        with self.lock:
+            return len(self.results) == len(self.chunks)
+
+    def progress(self):
+        """(completed chunks, total chunks)"""
+        with self.lock:
+            self._requeue_expired()
+            return len(self.results), len(self.chunks)
+
+    def node_stats(self):
+        """Per-worker throughput summary"""
+        with self.lock:
+            stats = {}
+            for worker_id, s in self.workers.items():
+                rate = s['rows'] / s['busy'] if s['busy'] > 0 else 0.0
+                stats[worker_id] = dict(s, rows_per_s=rate)
+            return stats
+
+    def merged(self):
+        """All chunk results merged in grid order"""
+        with self.lock:
+            parts = [SweepResult(self.results[i]) for i in range(len(self.chunks))]
+        return SweepResult.concat(parts)
+
+    def _touch(self, worker_id):
+        stats = self.workers.get(worker_id)
+        if stats is not None:
+            stats['last_seen'] = time.monotonic()
+            stats['lost'] = False
+
+    def _requeue_expired(self):
+        """Return chunks whose lease ran out to the front of the queue"""
+        now = time.monotonic()
+        for chunk_id, (owner, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[chunk_id]
+                self.pending.appendleft(chunk_id)
+                stats = self.workers.get(owner)
+                if stats is not None:
+                    stats['requeued'] += 1
+                    stats['lost'] = True
+
+
+class _ClusterManager(BaseManager):
+    """Manager class exposing the coordinator to remote workers"""
+
+
+def serve(coordinator, host=DEFAULT_HOST, port=DEFAULT_PORT, authkey=DEFAULT_AUTHKEY):
+    """Serve a coordinator on TCP from a background thread; returns the server"""
+    check_authkey(host, authkey)
+    _ClusterManager.register("coordinator", callable=lambda: coordinator)
+    manager = _ClusterManager(address=(host, port), authkey=authkey)
+    server = manager.get_server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def run_worker(host, port=DEFAULT_PORT, authkey=DEFAULT_AUTHKEY, heartbeat=2.0, poll=0.2):
+    """Connect to a coordinator and evaluate chunks until the sweep is done"""
+    check_authkey(host, authkey)
+    _ClusterManager.register("coordinator")
+    manager = _ClusterManager(address=(host, port), authkey=authkey)
+    manager.connect()
+    coordinator = manager.coordinator()
+    worker_id = coordinator.register(socket.gethostname())
+
+    # Heartbeats go through their own connection so long chunks keep their lease
+    stop = threading.Event()
+
+    def beat():
+        beat_manager = _ClusterManager(address=(host, port), authkey=authkey)
+        beat_manager.connect()
+        beat_proxy = beat_manager.coordinator()
+        while not stop.wait(heartbeat):
+            try:
+                beat_proxy.heartbeat(worker_id)
+            except (EOFError, OSError):
+                return
+
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        while True:
+            task = coordinator.next_chunk(worker_id)
+            if task is None:
+                if coordinator.done():
+                    return worker_id
+                time.sleep(poll)
+                continue
+            chunk_id, columns, defaults = task
+            start = time.perf_counter()
+            result = evaluate_columns(columns, defaults)
+            coordinator.submit(worker_id, chunk_id, result.columns, time.perf_counter() - start)
+    except (EOFError, OSError):
+        # Coordinator went away: nothing left to do
+        return worker_id
+    finally:
+        stop.set()
+
+
+def wait_for(coordinator, poll=0.2, report=None):
+    """Block until every chunk is done, calling report(done, total) on each poll"""
+    while True:
+        done, total = coordinator.progress()
+        if report:
+            report(done, total)
+        if done == total:
+            return coordinator.merged()
+        time.sleep(poll)
+
+
+def print_node_stats(coordinator):
+    """Print throughput for each worker"""
+    elapsed = (coordinator.finished or time.monotonic()) - coordinator.started
+    total_rows = 0
+    for worker_id, s in sorted(coordinator.node_stats().items()):
+        total_rows += s['rows']
+        lost = " (lost)" if s['lost'] else ""
+        print(f"  {worker_id:<24} {s['chunks']:>5} chunks {s['rows']:>9} rows "
+              f"{s['rows_per_s']:>12,.0f} rows/s  requeued {s['requeued']}{lost}")
+    if elapsed > 0:
+        print(f"  total: {total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/s)")
+
+
+def run_local_cluster(columns, workers=4, chunk_size=4096, defaults=None, port=0,
+                      authkey=DEFAULT_AUTHKEY, lease_timeout=10.0):
+    """Run a sweep with `workers` local worker processes over loopback
+
+    Exercises exactly the same TCP path as a multi-machine sweep. Returns the
+    merged SweepResult and the coordinator (for node statistics).
+    """
+    coordinator = SweepCoordinator(columns, chunk_size, defaults, lease_timeout)
+    server = serve(coordinator, DEFAULT_HOST, port, authkey)
+    host, port = server.address
+    processes = [multiprocessing.Process(target=run_worker, args=(host, port, authkey), daemon=True)
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    try:
+        result = wait_for(coordinator)
+    finally:
+        for p in processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        server.stop_event.set()
+    return result, coordinator
+
+
+def default_grid(points):
+    """Standard sweep grid: every scenario over mass × angle × force"""
+    return build_grid({
+        'scenario': SCENARIOS,
+        'm': np.linspace(1.0, 100.0, points),
+        'angle': np.linspace(0.0, 60.0, points),
+        'F': np.linspace(0.0, 1000.0, points),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ForceQuest distributed sweep")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="serve a sweep to remote workers")
+    coord.add_argument("--host", default=DEFAULT_HOST,
+                       help="interface to listen on; anything but loopback needs a private auth key")
+    coord.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coord.add_argument("--lease", type=float, default=10.0, help="seconds before a silent worker's chunks are re-queued")
+
+    worker = sub.add_parser("worker", help="evaluate chunks for a coordinator")
+    worker.add_argument("--host", required=True)
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    for p in (coord, worker):
+        p.add_argument("--authkey", default=None,
+                       help="shared secret (default: FORCEQUEST_SWEEP_KEY); required off loopback")
+
+    local = sub.add_parser("local", help="coordinator plus N workers on loopback")
+    local.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    for p in (coord, local):
+        p.add_argument("--points", type=int, default=64, help="values per swept axis")
+        p.add_argument("--chunk", type=int, default=4096, help="rows per chunk")
+        p.add_argument("--d", type=float, default=10.0, help="distance (m)")
+        p.add_argument("--mu", type=float, default=0.5, help="friction coefficient")
+        p.add_argument("--out", default=None, help="write merged results to this .npz file")
+
+    args = parser.parse_args()
+    authkey = args.authkey.encode() if getattr(args, "authkey", None) else DEFAULT_AUTHKEY
+    if args.role != "local":
+        try:
+            check_authkey(args.host, authkey)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.role == "worker":
+        run_worker(args.host, args.port, authkey)
+        return
+
+    columns = default_grid(args.points)
+    defaults = {'d': args.d, 'mu': args.mu, 'force_angle': 0.0}
+    if args.role == "local":
+        result, coordinator = run_local_cluster(columns, args.workers, args.chunk, defaults)
+    else:
+        coordinator = SweepCoordinator(columns, args.chunk, defaults, args.lease)
+        serve(coordinator, args.host, args.port, authkey)
+        print(f"Serving {len(coordinator.chunks)} chunks on {args.host}:{args.port}")
+        result = wait_for(coordinator, report=lambda done, total: print(f"\r  {done}/{total} chunks", end=""))
+        print()
+
+    print_node_stats(coordinator)
+    if args.out:
+        result.save(args.out)
+        print(f"Saved {len(result)} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Precomputed motion trajectories for ForceQuest
+Turns a calculate_motion result into time-sampled NumPy arrays so playback can
+jump to any moment in O(1)
+"""
+import math
+import numpy as np
+from config import ANIMATION_DELAY, TRAJECTORY_MAX_SAMPLES, TRAJECTORY_MAX_DURATION, GRAVITY
+
+# Net force profile over the run, as a multiple of the average net force.
+# Each profile averages to 1 over the distance so total work matches net_work.
+SUDDEN_PUSH_FRACTION = 0.1
+
+
+def force_profile(push_mode, u):
+    """Net force multiplier at fraction u (0..1) of the distance"""
+    if push_mode == "Sudden Push":
+        return np.where(u < SUDDEN_PUSH_FRACTION, 1.0 / SUDDEN_PUSH_FRACTION, 0.0)
+    elif push_mode == "Increasing Force":
+        return 0.25 + 1.5 * u
+    return np.ones_like(u)
+
+
+def work_profile(push_mode, u):
+    """Integral of force_profile from 0 to u (fraction of the total work done)"""
+    if push_mode == "Sudden Push":
+        return np.minimum(u / SUDDEN_PUSH_FRACTION, 1.0)
+    elif push_mode == "Increasing Force":
+        return 0.25 * u + 0.75 * u * u
+    return u
+
+
+def motion_direction(params):
+    """Unit vector (x right, y up) along which the object moves"""
+    scenario = params['scenario']
+    if scenario == "Lifting Object":
+        return 0.0, 1.0
+    angle = params['angle'] if scenario == "Inclined Plane" else params['force_angle']
+    return math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+
+def force_components(results, trajectory):
+    """Instantaneous forces on the object at every trajectory sample
+
+    Returns {name: (magnitudes, (dir_x, dir_y))} for Fg, Fn, F (applied), Ff
+    (friction) and Fnet, with unit directions x right, y up. The net force
+    follows the push mode's profile and the applied force is whatever it takes
+    on top of gravity and friction, so both vary along the run while the
+    others stay constant.
+    """
+    params = results['params']
+    scenario = params['scenario']
+    d = params['d']
+    weight = params['m'] * GRAVITY
+    n = len(trajectory)
+    ux, uy = motion_direction(params)
+
+    avg_force = results['net_work'] / d if d > 0 else 0.0
+    net = avg_force * force_profile(params['push_mode'], trajectory.s / d if d > 0 else np.zeros(n))
+    normal = 0.0 if scenario == "Lifting Object" else results['Fn']
+    friction = params['mu'] * normal
+
+    if scenario == "Lifting Object":
+        applied, applied_dir = net + weight, (0.0, 1.0)
+        normal_dir, friction_dir = (0.0, 1.0), (0.0, -1.0)
+    elif scenario == "Inclined Plane":
+        rad = math.radians(params['angle'])
+        applied, applied_dir = net + weight * math.sin(rad) + friction, (ux, uy)
+        normal_dir, friction_dir = (-math.sin(rad), math.cos(rad)), (-ux, -uy)
+    else:
+        # The push acts at force_angle; only its horizontal part works against friction
+        cos_fa = math.cos(math.radians(params['force_angle'])) or 1.0
+        applied, applied_dir = (net + friction) / cos_fa, (ux, uy)
+        normal_dir, friction_dir = (0.0, 1.0), (-1.0, 0.0)
+
+    return {
+        'Fg': (np.full(n, weight), (0.0, -1.0)),
+        'Fn': (np.full(n, normal), normal_dir),
+        'F': (applied, applied_dir),
+        'Ff': (np.full(n, friction), friction_dir),
+        'Fnet': (net, (ux, uy)),
+    }
+
+
+class Trajectory:
+    """Time-sampled run: arrays share one index, samples are `dt` apart"""
+
+    FIELDS = ('t', 's', 'x', 'y', 'v', 'work', 'ke')
+
+    def __init__(self, dt, arrays, params):
+        self.dt = dt
+        self.params = params
+        for name in self.FIELDS:
+            setattr(self, name, arrays[name])
+
+    def __len__(self):
+        return len(self.t)
+
+    @property
+    def duration(self):
+        return float(self.t[-1])
+
+    def index_at_time(self, t):
+        """Sample index at time t (O(1): samples are evenly spaced)"""
+        if t <= 0:
+            return 0
+        return min(int(t / self.dt), len(self.t) - 1)
+
+    def index_at_velocity(self, v):
+        """First sample whose speed reaches v, or None"""
+        reached = self.v >= v
+        index = int(np.argmax(reached))
+        return index if reached[index] else None
+
+    def index_at_distance(self, s):
+        """First sample at or beyond distance s"""
+        return min(int(np.searchsorted(self.s, s)), len(self.s) - 1)
+
+    def sample(self, index):
+        """All fields at one index as a dictionary of floats"""
+        return {name: float(getattr(self, name)[index]) for name in self.FIELDS}
+
+
+def compute_trajectory(results, dt=ANIMATION_DELAY, substeps=4):
+    """
+    Integrate the run described by a calculate_motion result
+    Positions come from the equations of motion; work and KE are evaluated
+    from the work-energy theorem at each position so the final sample matches
+    net_work exactly.
+    """
+    params = results['params']
+    d = params['d']
+    m = params['m']
+    push_mode = params['push_mode']
+    net_work = results['net_work']
+    avg_force = net_work / d if d > 0 else 0.0
+
+    if avg_force <= 0 or m <= 0:
+        # Force just balances resistance: uniform motion over the nominal run time
+        duration = 3.0
+        t = np.arange(0.0, duration, dt)
+        t = np.append(t, duration)
+        s = d * t / duration
+        v = np.full_like(t, d / duration)
+        work = np.zeros_like(t)
+        return _build(dt, params, t, s, v, work)
+
+    # Adapt the sample spacing so very long runs stay bounded in memory
+    estimate = math.sqrt(2 * d * m / avg_force) * (1 / SUDDEN_PUSH_FRACTION if push_mode == "Sudden Push" else 2)
+    estimate = min(estimate, TRAJECTORY_MAX_DURATION)
+    dt = max(dt, estimate / TRAJECTORY_MAX_SAMPLES)
+
+    h = dt / substeps
+    positions = [0.0]
+    s = vel = 0.0
+    steps = 0
+    while s < d and steps * dt < TRAJECTORY_MAX_DURATION:
+        for _ in range(substeps):
+            vel += avg_force * float(force_profile(push_mode, s / d)) / m * h
+            s += vel * h
+        positions.append(min(s, d))
+        steps += 1
+
+    s = np.array(positions)
+    t = np.arange(len(s)) * dt
+    if s[-1] >= d and len(s) > 1:
+        # Place the final sample exactly where the object reaches d
+        overshoot = (s[-1] - s[-2]) and (d - s[-2]) / (s[-1] - s[-2])
+        t[-1] = t[-2] + dt * overshoot
+        s[-1] = d
+
+    work = net_work * work_profile(push_mode, s / d)
+    v = np.sqrt(2 * np.maximum(work, 0) / m)
+    return _build(dt, params, t, s, v, work)
+
+
+def _build(dt, params, t, s, v, work):
+    dir_x, dir_y = motion_direction(params)
+    arrays = {'t': t, 's': s, 'x': s * dir_x, 'y': s * dir_y, 'v': v, 'work': work, 'ke': work.copy()}
+    return Trajectory(dt, arrays, params)
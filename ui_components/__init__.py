@@ -2,5 +2,16 @@
 from .input_panel import InputPanel
 from .simulation_canvas import SimulationCanvas
 from .instructions_panel import InstructionsPanel
+from .heatmap_view import HeatmapView
+from .job_tray import JobTray
+from .scene_graph import SceneGraph, SceneNode
+from .compare_view import CompareView
+from .force_overlay import ForceOverlay
+from .particles import ParticleSystem
+from .live_plot import LivePlot
+from .run_scene import RunScene
+from .run_graph import RunGraph
 
-__all__ = ['InputPanel', 'SimulationCanvas', 'InstructionsPanel']
\ No newline at end of file
+__all__ = ['InputPanel', 'SimulationCanvas', 'InstructionsPanel', 'HeatmapView', 'JobTray',
+           'SceneGraph', 'SceneNode', 'CompareView', 'ForceOverlay', 'ParticleSystem', 'LivePlot',
+           'RunScene', 'RunGraph']
\ No newline at end of file
@@ -0,0 +1,316 @@
+"""
+Compare View Component
+Runs 2-4 variants of one setup side by side in split viewports of a single
+canvas. All runs come from one batched engine call and are driven by one
+frame clock, with their energy curves overlaid on a shared graph.
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+from PIL import ImageTk
+from config import (COLORS, FONTS, CANVAS, ANIMATION_DELAY, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES,
+                    PUSH_MODES, SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP, OBJECT_COLORS)
+from physics_engine import PhysicsCalculator
+from trajectory import compute_trajectory
+from ui_components.scene_graph import SceneGraph
+from ui_components.simulation_canvas import fitted_camera, run_layers, scale_layout, object_start
+from utils.backends import TkBackend
+from utils.frame_scheduler import FrameScheduler
+from utils.sprites import SpriteCache, RollingSprite, is_rolling, OBJECT_SIZE
+
+MAX_RUNS = 4
+VIEWPORT_SCALE = 0.6
+RUN_COLORS = ("#ff6f61", "#1f77b4", "#2e7d32", "#9467bd")
+GRAPH_HEIGHT = 200
+GRAPH_MARGIN = 40
+GRAPH_POINTS = 300  # samples per overlaid curve
+COST_SMOOTHING = 0.1
+COST_REFRESH_FRAMES = 10
+SPEEDS = ("0.5×", "1×", "2×", "5×", "10×")
+
+# The input that differs between viewports, and its choices
+COMPARE_FIELDS = {
+    "Surface": SURFACE_MATERIALS,
+    "Shape": OBJECT_SHAPES,
+    "Push Mode": PUSH_MODES,
+    "Force Angle": FORCE_ANGLES,
+}
+
+
+def compare_variants(base, field, values):
+    """One params dict per value of `field`, otherwise copies of `base`
+
+    Varying the surface or shape recomputes μ from the tables, replacing any
+    μ typed into the main window.
+    """
+    runs = []
+    for value in values:
+        params = dict(base)
+        if field == "Surface":
+            params['surface'] = value
+        elif field == "Shape":
+            params['shape'] = value
+        elif field == "Push Mode":
+            params['push_mode'] = value
+        elif field == "Force Angle":
+            params['force_angle'] = FORCE_ANGLE_MAP[value]
+        if field in ("Surface", "Shape"):
+            params['mu'] = SURFACE_FRICTION[params['surface']] * SHAPE_FRICTION_FACTOR[params['shape']]
+        runs.append(params)
+    return runs
+
+
+def viewport_origins(n, width, height):
+    """Top-left corners of n viewports: one row for two, a 2x2 grid for three or four"""
+    return [((i % 2) * width, (i // 2) * height) for i in range(n)]
+
+
+class _Viewport:
+    """One run's slice of the compare canvas"""
+
+    def __init__(self, index, label, results, origin):
+        self.index = index
+        self.label = label
+        self.results = results
+        self.origin = origin
+        self.trajectory = compute_trajectory(results) if results['moves'] else None
+        self.camera = None
+        self.status_item = None
+        self.curve_item = None
+        self.curve = None  # (t, flat screen coords) of the energy curve
+        self.roller = None
+        self.cost = 0.0  # smoothed ms per frame
+
+    @property
+    def name(self):
+        return f"vp{self.index}"
+
+
+class CompareView:
+    """Side-by-side runs on one canvas, one frame clock and one Tk update per frame"""
+
+    def __init__(self, parent, get_base_params):
+        self.parent = parent
+        self.get_base_params = get_base_params
+        self.frame = tk.Frame(parent, bg=COLORS['bg_primary'])
+        self.vp_width = int(CANVAS['width'] * VIEWPORT_SCALE)
+        self.vp_height = int(CANVAS['height'] * VIEWPORT_SCALE)
+        self.viewports = []
+        self.scheduler = None
+        self.sprites = SpriteCache(wrap=ImageTk.PhotoImage)
+        self.t = 0.0
+        self.duration = 0.0
+        self.frames = 0
+        self.frame_cost = 0.0
+        self._setup_ui()
+
+    def _setup_ui(self):
+        controls = tk.Frame(self.frame, bg=COLORS['bg_primary'])
+        controls.pack(fill=tk.X, pady=5)
+        tk.Label(controls, text="Compare:", bg=COLORS['bg_primary'], fg="white",
+                 font=FONTS['label']).pack(side=tk.LEFT, padx=5)
+        self.field = ttk.Combobox(controls, width=12, values=list(COMPARE_FIELDS), state="readonly")
+        self.field.current(0)
+        self.field.bind("<<ComboboxSelected>>", lambda e: self._build_choices())
+        self.field.pack(side=tk.LEFT, padx=5)
+        self.choice_frame = tk.Frame(controls, bg=COLORS['bg_primary'])
+        self.choice_frame.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(controls, text="Speed:", bg=COLORS['bg_primary'], fg="white",
+                 font=FONTS['label']).pack(side=tk.LEFT, padx=(10, 5))
+        self.speed = ttk.Combobox(controls, width=5, values=SPEEDS, state="readonly")
+        self.speed.current(1)
+        self.speed.pack(side=tk.LEFT)
+        tk.Button(controls, text="▶ Run", bg=COLORS['accent_cyan'], fg="black", font=FONTS['button'],
+                  command=self.run).pack(side=tk.LEFT, padx=5)
+        tk.Button(controls, text="⏹ Stop", bg=COLORS['accent_red'], fg="white", font=FONTS['button'],
+                  command=self.stop).pack(side=tk.LEFT)
+        self._build_choices()
+
+        self.canvas = TkBackend(tk.Canvas(self.frame, width=2 * self.vp_width, height=self.vp_height,
+                                          bg="white", highlightthickness=2,
+                                          highlightbackground=COLORS['accent_cyan']))
+        self.canvas.widget.pack(pady=5)
+        self.scene = SceneGraph(self.canvas)
+
+        self.graph = tk.Canvas(self.frame, width=2 * self.vp_width, height=GRAPH_HEIGHT, bg="white",
+                               highlightthickness=2, highlightbackground=COLORS['accent_cyan'])
+        self.graph.pack(pady=5)
+
+        self.status = tk.Label(self.frame, text="Pick 2–4 values and press Run", bg=COLORS['bg_primary'],
+                               fg=COLORS['text_gray'], font=FONTS['label'])
+        self.status.pack(pady=5)
+
+    def _build_choices(self):
+        """Checkbuttons for the selected field; the first two are ticked"""
+        for child in self.choice_frame.winfo_children():
+            child.destroy()
+        self.choices = []
+        for i, value in enumerate(COMPARE_FIELDS[self.field.get()]):
+            var = tk.BooleanVar(value=i < 2)
+            tk.Checkbutton(self.choice_frame, text=value, variable=var, bg=COLORS['bg_primary'], fg="white",
+                           selectcolor=COLORS['bg_secondary'], activebackground=COLORS['bg_primary'],
+                           font=FONTS['label']).pack(side=tk.LEFT)
+            self.choices.append((value, var))
+
+    def get_widget(self):
+        return self.frame
+
+    def run(self):
+        """Batch-calculate the selected variants and play them together"""
+        values = [value for value, var in self.choices if var.get()]
+        if not 2 <= len(values) <= MAX_RUNS:
+            self.status.config(text=f"Pick between 2 and {MAX_RUNS} values to compare", fg=COLORS['accent_red'])
+            return
+        base = self.get_base_params()
+        if base is None:
+            return
+        self.stop()
+
+        runs = compare_variants(base, self.field.get(), values)
+        results = PhysicsCalculator().calculate_motion_many(runs)
+        self._layout(values, results)
+
+        self.t = 0.0
+        self.frames = 0
+        self.frame_cost = 0.0
+        speed = float(self.speed.get().rstrip("×"))
+        self.scheduler = FrameScheduler(self.frame, self._step, self._render, dt=ANIMATION_DELAY,
+                                        speed=lambda: speed, max_steps_per_frame=20, on_finish=self._finished)
+        self._render()
+        self.scheduler.start()
+
+    def stop(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+    def _layout(self, labels, results):
+        """Draw every viewport's static scene and the empty graph"""
+        self.canvas.delete("all")
+        self.scene = SceneGraph(self.canvas)
+        rows = 1 if len(labels) <= 2 else 2
+        self.canvas.widget.config(height=rows * self.vp_height)
+        origins = viewport_origins(len(labels), self.vp_width, self.vp_height)
+        self.viewports = [_Viewport(i, label, result, origin)
+                          for i, (label, result, origin) in enumerate(zip(labels, results, origins))]
+
+        # One zoom for every viewport so distances compare at a glance
+        moving = [vp for vp in self.viewports if vp.trajectory is not None]
+        for vp in moving:
+            vp.camera = fitted_camera(vp.results['params'], vp.trajectory)
+        if moving:
+            scale = min(vp.camera.scale for vp in moving)
+            for vp in moving:
+                vp.camera.scale = scale
+
+        k = VIEWPORT_SCALE
+        for vp in self.viewports:
+            ox, oy = vp.origin
+            params = vp.results['params']
+            if vp.camera is not None:
+                background, obj = run_layers(params, vp.camera)
+                self.scene.set_items(f"{vp.name}:background", scale_layout(background, k, ox, oy))
+                if is_rolling(params):
+                    # Rolling shapes turn by swapping pre-rendered frames on one image item
+                    x, y = object_start(params)
+                    vp.roller = RollingSprite(self.sprites, params['shape'], OBJECT_COLORS[params['scenario']],
+                                              round(OBJECT_SIZE * k))
+                    vp.roller.load(vp.trajectory)
+                    obj = [('image', (x + 25, y + 25), {'image': vp.roller.frames[0], 'anchor': "center"})]
+                ids = self.scene.set_items(f"{vp.name}:object", scale_layout(obj, k, ox, oy))
+                if vp.roller is not None:
+                    vp.roller.item = ids[0]
+                status = ""
+            else:
+                status = "❌ Does not move: F < F_req"
+            color = RUN_COLORS[vp.index]
+            ids = self.scene.set_items(f"{vp.name}:hud", [
+                ('rectangle', (ox, oy, ox + self.vp_width, oy + self.vp_height), {'outline': "#444", 'width': 2}),
+                ('text', (ox + 8, oy + 8), {'text': vp.label, 'anchor': "nw", 'fill': color,
+                                            'font': ("Consolas", 11, "bold")}),
+                ('text', (ox + 8, oy + 28), {'text': status, 'anchor': "nw", 'fill': "black",
+                                             'font': ("Consolas", 9)})])
+            vp.status_item = ids[2]
+
+        self.duration = max((vp.trajectory.duration for vp in moving), default=0.0)
+        self._init_graph()
+
+    def _init_graph(self):
+        """Axes plus one (initially empty) KE curve per run, sharing time and energy scales"""
+        g = self.graph
+        g.delete("all")
+        width = 2 * self.vp_width
+        left, bottom, top, right = GRAPH_MARGIN, GRAPH_HEIGHT - 25, 15, width - 15
+        g.create_line(left, bottom, right, bottom, fill="black")
+        g.create_line(left, bottom, left, top, fill="black")
+        g.create_text(right, bottom + 14, text="Time (s)", anchor="e", font=("Consolas", 9))
+        g.create_text(left - 5, top, text="KE (J)", anchor="ne", font=("Consolas", 9))
+
+        moving = [vp for vp in self.viewports if vp.trajectory is not None]
+        max_t = self.duration or 1.0
+        max_ke = max((float(vp.trajectory.ke[-1]) for vp in moving), default=0.0) or 1.0
+        g.create_text(right, bottom + 3, text=f"{max_t:.2f}", anchor="ne", font=("Consolas", 8))
+        g.create_text(left - 5, top + 12, text=f"{max_ke:.0f}", anchor="ne", font=("Consolas", 8))
+
+        for vp in self.viewports:
+            color = RUN_COLORS[vp.index]
+            g.create_text(left + 10 + 150 * vp.index, top, text=f"— {vp.label}", anchor="nw", fill=color,
+                          font=("Consolas", 9, "bold"))
+            if vp.trajectory is None:
+                continue
+            traj = vp.trajectory
+            idx = np.unique(np.linspace(0, len(traj) - 1, GRAPH_POINTS).astype(int))
+            xs = left + traj.t[idx] / max_t * (right - left)
+            ys = bottom - traj.ke[idx] / max_ke * (bottom - top)
+            coords = np.empty(2 * len(idx))
+            coords[0::2], coords[1::2] = xs, ys
+            vp.curve = (traj.t[idx], coords.tolist())
+            vp.curve_item = g.create_line(left, bottom, left, bottom, fill=color, width=2)
+
+    def _step(self):
+        self.t += ANIMATION_DELAY
+        return self.t < self.duration
+
+    def _render(self):
+        """Position every viewport for the shared clock, then one Tk update for all of them"""
+        start = time.perf_counter()
+        k = VIEWPORT_SCALE
+        for vp in self.viewports:
+            if vp.trajectory is None:
+                continue
+            vp_start = time.perf_counter()
+            traj = vp.trajectory
+            index = traj.index_at_time(self.t)
+            ax, ay = vp.camera.anchor
+            sx, sy = vp.camera.to_screen(traj.x[index], traj.y[index])
+            node = self.scene.node(f"{vp.name}:object")
+            node.move_to((sx - ax) * k, (sy - ay) * k)
+            node.flush()
+            if vp.roller is not None:
+                vp.roller.show(self.canvas, index)
+            self.canvas.itemconfigure(vp.status_item, text=f"t = {traj.t[index]:.2f} s  v = {traj.v[index]:.2f} m/s"
+                                      f"  KE = {traj.ke[index]:.1f} J")
+            times, coords = vp.curve
+            n = max(int(np.searchsorted(times, self.t, side="right")), 2)
+            self.graph.coords(vp.curve_item, *coords[:2 * n])
+            cost = (time.perf_counter() - vp_start) * 1000
+            vp.cost = cost if not self.frames else vp.cost + COST_SMOOTHING * (cost - vp.cost)
+
+        self.canvas.update()
+        cost = (time.perf_counter() - start) * 1000
+        self.frame_cost = cost if not self.frames else self.frame_cost + COST_SMOOTHING * (cost - self.frame_cost)
+        self.frames += 1
+        if self.frames % COST_REFRESH_FRAMES == 0:
+            self._show_costs()
+
+    def _show_costs(self):
+        parts = [f"{vp.label} {vp.cost:.2f}" for vp in self.viewports if vp.trajectory is not None]
+        self.status.config(text=f"ms/frame per viewport: {' | '.join(parts)}   ·   "
+                                f"whole frame {self.frame_cost:.2f} ms", fg=COLORS['text_gray'])
+
+    def _finished(self):
+        self.scheduler = None
+        self._show_costs()
@@ -0,0 +1,55 @@
+"""
+Frame Stats Overlay
+Draws live FPS, frame-time percentiles and dropped frames in a canvas corner
+"""
+from config import COLORS
+
+OVERLAY_TAG = "frame_stats"
+
+
+class FrameStatsOverlay:
+    """Text overlay on a canvas fed by a FrameProfiler"""
+
+    def __init__(self, canvas, profiler, every=10):
+        self.canvas = canvas
+        self.profiler = profiler
+        self.every = every
+        self.visible = False
+        self._last_count = -1
+        self._text = None
+
+    def set_visible(self, visible):
+        self.visible = visible
+        if visible:
+            self.refresh(force=True)
+        else:
+            self.canvas.delete(OVERLAY_TAG)
+            self._text = None
+
+    def refresh(self, force=False):
+        """Redraw the text at most once every `every` recorded frames"""
+        if not self.visible:
+            return
+        count = self.profiler.count
+        if not force and count - self._last_count < self.every and self.canvas.find_withtag(OVERLAY_TAG):
+            return
+        self._last_count = count
+
+        stats = self.profiler.summary()
+        text = (f"{stats['fps']:.1f} fps (target {stats['target_fps']:.0f})\n"
+                f"p95 {stats['interval_p95_ms']:.1f} ms  p99 {stats['interval_p99_ms']:.1f} ms\n"
+                f"work p95 {stats['work_p95_ms']:.2f} ms\n"
+                f"dropped {stats['dropped']}  late {stats['late']}")
+        if stats['time_to_first_frame_ms'] is not None:
+            text += f"\nfirst frame {stats['time_to_first_frame_ms']:.1f} ms"
+        if self._text is None or not self.canvas.find_withtag(self._text):
+            # Created once; later refreshes only swap the text
+            self.canvas.delete(OVERLAY_TAG)
+            self.canvas.create_rectangle(5, 5, 215, 90, fill=COLORS['bg_primary'], outline=COLORS['accent_cyan'],
+                                         tags=OVERLAY_TAG)
+            self._text = self.canvas.create_text(12, 10, text=text, anchor="nw", fill=COLORS['accent_yellow'],
+                                                 font=("Consolas", 9), tags=OVERLAY_TAG)
+        else:
+            self.canvas.itemconfigure(self._text, text=text)
+        # Items drawn since the last refresh would otherwise cover the overlay
+        self.canvas.tag_raise(OVERLAY_TAG)
@@ -0,0 +1,187 @@
+"""
+Sweep Heatmap Component
+Shows "moves vs stuck" and final velocity across a 2D parameter slice
+"""
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+from PIL import Image, ImageTk
+from config import COLORS, FONTS
+from sweep import SWEEP_AXES, compute_slice
+
+# Anchor colors for the velocity colormap (dark blue -> teal -> yellow)
+COLORMAP_ANCHORS = [(0.0, (68, 1, 84)), (0.25, (59, 82, 139)), (0.5, (33, 145, 140)),
+                    (0.75, (94, 201, 98)), (1.0, (253, 231, 37))]
+STUCK_COLOR = (90, 20, 30)
+INVALID_COLOR = (60, 60, 60)
+RESOLUTIONS = ["128", "256", "512"]
+
+
+def build_colormap(anchors, n=256):
+    """Interpolate anchor colors into an (n, 3) uint8 lookup table"""
+    stops = [a[0] for a in anchors]
+    samples = np.linspace(0.0, 1.0, n)
+    channels = [np.interp(samples, stops, [a[1][c] for a in anchors]) for c in range(3)]
+    return np.stack(channels, axis=1).round().astype(np.uint8)
+
+
+class HeatmapView:
+    """Renders a sweep slice as one PhotoImage on a canvas"""
+
+    # Last two LUT entries are reserved for stuck and unsolvable cells
+    STUCK_INDEX = 254
+    INVALID_INDEX = 255
+
+    def __init__(self, parent, params_callback, job_manager=None):
+        self.frame = tk.Frame(parent, bg=COLORS['bg_primary'])
+        self.params_callback = params_callback
+        self.job_manager = job_manager
+        self.job = None
+        self.lut = np.vstack([build_colormap(COLORMAP_ANCHORS, self.STUCK_INDEX),
+                              np.array([STUCK_COLOR, INVALID_COLOR], dtype=np.uint8)])
+        self.result = None
+        self.axes = None  # (x, y) axis names the shown slice was computed for
+        self.x_values = None
+        self.y_values = None
+        self.photo = None
+        self.image_id = None
+        self._setup_ui()
+
+    def get_widget(self):
+        """Return the heatmap frame"""
+        return self.frame
+
+    def _setup_ui(self):
+        """Setup axis selectors, the force slider and the image canvas"""
+        controls = tk.Frame(self.frame, bg=COLORS['bg_primary'])
+        controls.pack(fill='x')
+
+        axes = list(SWEEP_AXES)
+        tk.Label(controls, text="X:", bg=COLORS['bg_primary'], fg=COLORS['text_white'],
+                 font=FONTS['label']).pack(side=tk.LEFT)
+        self.x_axis = ttk.Combobox(controls, values=axes, state="readonly", width=14)
+        self.x_axis.set("Mass (kg)")
+        self.x_axis.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(controls, text="Y:", bg=COLORS['bg_primary'], fg=COLORS['text_white'],
+                 font=FONTS['label']).pack(side=tk.LEFT)
+        self.y_axis = ttk.Combobox(controls, values=axes, state="readonly", width=14)
+        self.y_axis.set("Angle (°)")
+        self.y_axis.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(controls, text="Size:", bg=COLORS['bg_primary'], fg=COLORS['text_white'],
+                 font=FONTS['label']).pack(side=tk.LEFT)
+        self.resolution = ttk.Combobox(controls, values=RESOLUTIONS, state="readonly", width=5)
+        self.resolution.set("256")
+        self.resolution.pack(side=tk.LEFT, padx=5)
+
+        for combo in (self.x_axis, self.y_axis, self.resolution):
+            combo.bind("<<ComboboxSelected>>", lambda e: self.render())
+
+        tk.Button(controls, text="🗺️ Render", bg=COLORS['accent_blue'], fg="black",
+                  font=FONTS['button'], command=self.render).pack(side=tk.LEFT, padx=5)
+
+        slider_row = tk.Frame(self.frame, bg=COLORS['bg_primary'])
+        slider_row.pack(fill='x', pady=(5, 0))
+        tk.Label(slider_row, text="Force (N):", bg=COLORS['bg_primary'], fg=COLORS['text_white'],
+                 font=FONTS['label']).pack(side=tk.LEFT)
+        self.force_label = tk.Label(slider_row, text="", width=7, bg=COLORS['bg_primary'],
+                                    fg=COLORS['accent_yellow'], font=FONTS['timer'])
+        self.force_label.pack(side=tk.RIGHT)
+        self.force_scale = ttk.Scale(slider_row, from_=0.0, to=SWEEP_AXES["Force (N)"][2],
+                                     orient="horizontal", command=lambda v: self.render())
+        self.force_scale.set(200.0)
+        self.force_scale.pack(side=tk.LEFT, fill='x', expand=True, padx=5)
+
+        self.canvas = tk.Canvas(self.frame, width=256, height=256, bg="black",
+                                highlightthickness=2, highlightbackground=COLORS['accent_cyan'])
+        self.canvas.pack(pady=5)
+        self.canvas.bind("<Motion>", self._on_hover)
+        self.canvas.bind("<Leave>", lambda e: self.hover_label.config(text=""))
+
+        self.hover_label = tk.Label(self.frame, text="", bg=COLORS['bg_primary'],
+                                    fg=COLORS['accent_green'], font=FONTS['solution'])
+        self.hover_label.pack()
+
+    def render(self):
+        """Recompute the slice and blit it as a single image"""
+        params = self.params_callback()
+        if params is None:
+            return
+        x_axis, y_axis = self.x_axis.get(), self.y_axis.get()
+        if x_axis == y_axis:
+            self.hover_label.config(text="Pick two different axes")
+            return
+
+        size = int(self.resolution.get())
+        force = self.force_scale.get()
+        self.force_label.config(text=f"{force:.0f}")
+        params = dict(params, F=force)
+        x_values = np.linspace(*SWEEP_AXES[x_axis][1:], size)
+        y_values = np.linspace(*SWEEP_AXES[y_axis][1:], size)
+
+        if self.job_manager is None:
+            self._show(self._compute(None, params, x_axis, x_values, y_axis, y_values))
+            return
+
+        # Only the latest slider position matters; drop any slice still in flight
+        if self.job is not None:
+            self.job.cancel()
+        self.job = self.job_manager.submit("Sweep heatmap", self._compute,
+                                           params, x_axis, x_values, y_axis, y_values,
+                                           on_done=self._show)
+
+    def _compute(self, job, params, x_axis, x_values, y_axis, y_values):
+        """Evaluate and colorize a slice (runs on a worker when a job manager is set)"""
+        result = compute_slice(params, x_axis, x_values, y_axis, y_values)
+        if job is not None:
+            job.token.check()
+        return result, (x_axis, y_axis), x_values, y_values, self.colorize(result)
+
+    def _show(self, computed):
+        """Install a computed slice and blit it (Tk thread)"""
+        self.result, self.axes, self.x_values, self.y_values, rgb = computed
+        self._blit(rgb)
+
+    def colorize(self, result):
+        """Map a slice result to an (H, W, 3) uint8 RGB buffer"""
+        v = result['v_final']
+        v_max = v.max()
+        scale = (self.STUCK_INDEX - 1) / v_max if v_max > 0 else 0.0
+        index = (v * scale).astype(np.uint8)
+        index[~result['moves']] = self.STUCK_INDEX
+        index[~result['valid']] = self.INVALID_INDEX
+        return self.lut.take(index, axis=0)
+
+    def _blit(self, rgb):
+        """Copy the RGB buffer into the canvas image, reusing it when possible"""
+        height, width = rgb.shape[:2]
+        image = Image.frombuffer("RGB", (width, height), np.ascontiguousarray(rgb), "raw", "RGB", 0, 1)
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == (width, height):
+            self.photo.paste(image)
+            return
+        self.photo = ImageTk.PhotoImage(image)
+        self.canvas.config(width=width, height=height)
+        if self.image_id is None:
+            self.image_id = self.canvas.create_image(0, 0, anchor='nw', image=self.photo)
+        else:
+            self.canvas.itemconfig(self.image_id, image=self.photo)
+
+    def _on_hover(self, event):
+        """Show the values under the cursor by indexing the slice arrays"""
+        if self.result is None:
+            return
+        row, col = int(event.y), int(event.x)
+        height, width = self.result['moves'].shape
+        if not (0 <= row < height and 0 <= col < width):
+            return
+        # The axes of the slice on screen, not the comboboxes, which may have changed since
+        x_name, y_name = (SWEEP_AXES[axis][0] for axis in self.axes)
+        if not self.result['valid'][row, col]:
+            state = "cannot solve"
+        elif self.result['moves'][row, col]:
+            state = f"moves, v = {self.result['v_final'][row, col]:.2f} m/s"
+        else:
+            state = f"stuck (F_req = {self.result['F_req'][row, col]:.1f} N)"
+        self.hover_label.config(
+            text=f"{x_name} = {self.x_values[col]:.2f} | {y_name} = {self.y_values[height - 1 - row]:.2f} → {state}")
@@ -0,0 +1,66 @@
+"""
+Job Tray Component
+Compact list of running background jobs with progress and cancel buttons
+"""
+import tkinter as tk
+from tkinter import ttk
+from config import COLORS, FONTS
+
+class JobTray:
+    """Shows active jobs from a JobManager"""
+
+    def __init__(self, parent, job_manager):
+        self.frame = tk.Frame(parent, bg=COLORS['bg_secondary'])
+        self.job_manager = job_manager
+        self.rows = {}
+        self._setup_ui()
+        job_manager.add_listener(self.update_job)
+
+    def get_widget(self):
+        """Return the tray frame"""
+        return self.frame
+
+    def _setup_ui(self):
+        """Setup tray header and idle label"""
+        tk.Label(self.frame, text="⏳ Jobs", bg=COLORS['bg_secondary'], fg=COLORS['accent_cyan'],
+                 font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=5)
+        self.idle_label = tk.Label(self.frame, text="Idle", bg=COLORS['bg_secondary'],
+                                   fg=COLORS['text_gray'], font=FONTS['label'])
+        self.idle_label.pack(anchor="w", padx=5)
+
+    def update_job(self, job):
+        """Create, refresh or remove the row for a job (called on the Tk thread)"""
+        row = self.rows.get(job.id)
+        if not job.active:
+            if row:
+                row['frame'].destroy()
+                del self.rows[job.id]
+            self._update_idle()
+            return
+
+        if row is None:
+            row = self._create_row(job)
+            self.rows[job.id] = row
+        row['bar']['value'] = job.progress * 100
+        text = job.name if not job.message else f"{job.name}: {job.message}"
+        row['label'].config(text=text)
+        self._update_idle()
+
+    def _create_row(self, job):
+        """Build one tray row"""
+        frame = tk.Frame(self.frame, bg=COLORS['bg_secondary'])
+        frame.pack(fill='x', padx=5, pady=2)
+        label = tk.Label(frame, text=job.name, bg=COLORS['bg_secondary'], fg=COLORS['text_white'],
+                         font=("Segoe UI", 8), anchor="w", width=22)
+        label.pack(side=tk.LEFT)
+        tk.Button(frame, text="✖", bg=COLORS['accent_red'], fg="white", font=("Segoe UI", 7),
+                  command=job.cancel, bd=0).pack(side=tk.RIGHT)
+        bar = ttk.Progressbar(frame, length=80, mode="determinate", maximum=100)
+        bar.pack(side=tk.RIGHT, padx=3)
+        return {'frame': frame, 'label': label, 'bar': bar}
+
+    def _update_idle(self):
+        if self.rows:
+            self.idle_label.pack_forget()
+        elif not self.idle_label.winfo_manager():
+            self.idle_label.pack(anchor="w", padx=5)
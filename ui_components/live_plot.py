@@ -0,0 +1,135 @@
+"""
+Live Plot Component
+Real-time line series on a canvas at constant cost per new point. Each series
+is a single polyline: new points are appended with canvas.insert, scrubbing
+back trims it with canvas.dchars, and a change of axis range rescales every
+series with one canvas.scale. Tick labels are rewritten only when the range
+changes. Lines never hold more than a few points per pixel: past that they
+are redrawn from the telemetry buffer through LTTB downsampling.
+"""
+import numpy as np
+from config import GRAPH_POINTS_PER_PIXEL
+from utils.telemetry import lttb
+
+PLOT_TAG = "plot_line"
+SCALE_TAG = "scale"
+TICKS = 4
+
+
+class LivePlot:
+    """Series drawn into the rectangle (x0, y0, width, height) of a canvas
+
+    `series` is a sequence of (channel, line options) plotted against channel
+    `x` of a TelemetryBuffer; `sync` draws whatever the buffer recorded since
+    the last call. Raw points are appended until a line holds `per_pixel`
+    points per pixel of width, then it is redrawn downsampled to half that,
+    so redraws stay rare and the drawn point count stays capped.
+    """
+
+    def __init__(self, canvas, x0, y0, width, height, series, x="s", ticks=TICKS,
+                 per_pixel=GRAPH_POINTS_PER_PIXEL):
+        self.canvas = canvas
+        self.x0, self.y0, self.width, self.height = x0, y0, width, height
+        self.x = x
+        self.names = [name for name, _ in series]
+        self.items = {name: canvas.create_line(x0, y0 + height, x0, y0 + height, state="hidden",
+                                               tags=PLOT_TAG, **options)
+                      for name, options in series}
+        self.budget = max(4, int(width * per_pixel))
+        self.drawn = 0  # points in each polyline
+        self.total = 0  # run samples the lines are drawn up to
+        self.start = 0  # run index of the first sample drawn
+        self.exact = True  # every sample from start to total is drawn, none skipped
+        self.x_max = self.y_max = None
+        self.y_min = 0.0
+        bottom = y0 + height
+        self.y_ticks = [canvas.create_text(x0 - 5, bottom - height / ticks * i, text="", anchor="e", fill="#666",
+                                           font=("Consolas", 8), tags=SCALE_TAG) for i in range(ticks + 1)]
+        self.x_ticks = [canvas.create_text(x0 + width / ticks * i, bottom + 15, text="", fill="#666",
+                                           font=("Consolas", 8), tags=SCALE_TAG) for i in range(ticks + 1)]
+
+    def project(self, xs, ys):
+        """Flat canvas coordinates of data points for the current range"""
+        coords = np.empty(2 * len(xs))
+        coords[0::2] = self.x0 + np.asarray(xs) / self.x_max * self.width
+        coords[1::2] = self.y0 + self.height - (np.asarray(ys) - self.y_min) / (self.y_max - self.y_min) * self.height
+        return coords.tolist()
+
+    def set_range(self, x_max, y_max, y_min=0.0):
+        """Axis range; drawn series are rescaled in place and the ticks relabelled if it changed
+
+        x starts at 0; y runs from y_min (at the bottom) to y_max.
+        """
+        if (x_max, y_max, y_min) == (self.x_max, self.y_max, self.y_min):
+            return
+        bottom = self.y0 + self.height
+        if self.drawn and self.x_max:
+            old_span, span = self.y_max - self.y_min, y_max - y_min
+            self.canvas.scale(PLOT_TAG, self.x0, bottom, self.x_max / x_max, old_span / span)
+            if y_min != self.y_min:
+                self.canvas.move(PLOT_TAG, 0, (y_min - self.y_min) / span * self.height)
+        self.x_max, self.y_max, self.y_min = x_max, y_max, y_min
+        ticks = len(self.y_ticks) - 1
+        for i, item in enumerate(self.y_ticks):
+            self.canvas.itemconfigure(item, text=f"{y_min + (y_max - y_min) / ticks * i:.1f}")
+        for i, item in enumerate(self.x_ticks):
+            self.canvas.itemconfigure(item, text=f"{x_max / ticks * i:.1f}")
+
+    def sync(self, buffer):
+        """Bring the lines up to the samples held in `buffer`"""
+        total = buffer.total
+        if total == self.total:
+            return
+        if total < self.total:
+            if self.exact and total >= self.start:
+                self.truncate(total - self.start)
+                self.total = total
+            else:
+                self.redraw(buffer)
+            return
+        new = total - self.total
+        if not self.drawn or new > len(buffer) or self.drawn + new > self.budget:
+            self.redraw(buffer)
+            return
+        xs = buffer.tail(self.x, new)
+        for name in self.names:
+            self.canvas.insert(self.items[name], "end", self.project(xs, buffer.tail(name, new)))
+        self.drawn += new
+        self.total = total
+
+    def redraw(self, buffer):
+        """Draw every held sample again, downsampled if there are too many"""
+        xs = buffer.channel(self.x)
+        self.total, self.start = buffer.total, buffer.first
+        self.exact = len(xs) <= self.budget
+        if not len(xs):
+            self.truncate(0)
+            return
+        for name in self.names:
+            ys = buffer.channel(name)
+            if not self.exact:
+                index = lttb(xs, ys, self.budget // 2)
+                coords = self.project(xs[index], ys[index])
+            else:
+                coords = self.project(xs, ys)
+            # A line needs two points: the first one is stored twice
+            self.canvas.coords(self.items[name], *(coords[:2] + coords))
+            self.canvas.itemconfigure(self.items[name], state="normal")
+            self.drawn = len(coords) // 2
+
+    def truncate(self, count):
+        """Keep only the first `count` drawn points"""
+        if count >= self.drawn:
+            return
+        for item in self.items.values():
+            if count == 0:
+                self.canvas.itemconfigure(item, state="hidden")
+            else:
+                # +1 for the doubled first point
+                self.canvas.dchars(item, 2 * (count + 1), "end")
+        self.drawn = count
+
+    def clear(self):
+        self.truncate(0)
+        self.total = self.start = 0
+        self.exact = True
@@ -0,0 +1,166 @@
+"""
+Particle Effects Component
+Friction particles and a motion trail drawn from a fixed pool of canvas items.
+The pool is created once per canvas and recycled with coords/itemconfigure,
+so the frame loop never creates or deletes items and the item count stays
+capped however long the run is.
+"""
+import math
+import random
+
+import numpy as np
+from config import SURFACE_COLORS, GRAVITY, PARTICLE_POOL_SIZE, TRAIL_POINTS, TRAIL_SECONDS
+from trajectory import force_components
+
+# Per surface: particles per joule of friction work, lifetime (s), launch
+# speed (m/s), share of gravity felt, dot size (px) and colour
+PARTICLE_STYLES = {
+    "Ice": {'per_joule': 0.4, 'life': 0.3, 'speed': 0.3, 'gravity': 0.0, 'size': 2, 'color': "white"},       # glints
+    "Tile": {'per_joule': 0.1, 'life': 0.4, 'speed': 0.5, 'gravity': 1.0, 'size': 2, 'color': "#bdbdbd"},
+    "Wood": {'per_joule': 0.2, 'life': 1.2, 'speed': 0.2, 'gravity': 1.0, 'size': 2, 'color': "#8b5a2b"},     # scuffs
+    "Concrete": {'per_joule': 0.15, 'life': 0.6, 'speed': 0.8, 'gravity': 1.0, 'size': 2, 'color': "#707070"},
+    "Sand": {'per_joule': 0.3, 'life': 0.9, 'speed': 1.5, 'gravity': 0.5, 'size': 3,
+             'color': SURFACE_COLORS['Sand'][0]},                                                          # dust
+}
+OBJECT_HALF_WIDTH = 25 / 60  # m behind the bottom centre where particles leave the surface
+TRAIL_LIFT = 25  # px from the object's bottom centre to the trail
+TRAIL_COLOR = "#9e9e9e"
+OFFSCREEN = (-10, -10, -10, -10)
+
+
+def effects_layout(color, pool_size=PARTICLE_POOL_SIZE):
+    """Collapsed trail line and particle dots, positioned later by ParticleSystem.update"""
+    items = [('line', OFFSCREEN, {'fill': TRAIL_COLOR, 'width': 2, 'tags': "effect"})]
+    items += [('oval', OFFSCREEN, {'fill': color, 'outline': "", 'tags': "effect"})] * pool_size
+    return items
+
+
+class ParticleSystem:
+    """Friction particles emitted in proportion to friction work, plus a trail behind the object
+
+    Particles live in surface coordinates (distance along the surface, height
+    above it) and are projected through the camera each frame. When the pool
+    is full the oldest particle is recycled.
+    """
+
+    def __init__(self, scene, node="effects", pool_size=PARTICLE_POOL_SIZE, trail_points=TRAIL_POINTS):
+        self.scene = scene
+        self.node = node
+        self.pool_size = pool_size
+        self.trail_points = trail_points
+        self.enabled = True
+        self.trajectory = None
+        self.trail = None
+        self.dots = []
+        self.color = None  # fill of the dots in the pool
+        self.particles = [None] * pool_size  # [along, height, v_along, v_height, life] or None
+        self.next_slot = 0
+        self.index = 0
+        self.pending = 0.0
+        self.random = random.Random(0)
+
+    def load(self, results, trajectory, surface):
+        """Take a new run; the pool is built on first use and only recoloured afterwards"""
+        self.style = PARTICLE_STYLES.get(surface, PARTICLE_STYLES["Wood"])
+        color = self.style['color']
+        built = self.scene.ensure(self.node, self.pool_size, lambda: effects_layout(color, self.pool_size))
+        ids = self.scene.node(self.node).ids
+        self.trail, self.dots = ids[0], ids[1:]
+        if not built and color != self.color:
+            for dot in self.dots:
+                self.scene.canvas.itemconfigure(dot, fill=color)
+        self.color = color
+
+        params = results['params']
+        self.trajectory = trajectory
+        self.friction = float(force_components(results, trajectory)['Ff'][0][0])
+        if params['scenario'] == "Inclined Plane":
+            rad = math.radians(params['angle'])
+            self.surface = (math.cos(rad), math.sin(rad))
+        else:
+            self.surface = (1.0, 0.0)
+        self.random.seed(0)
+        self.reset()
+
+    def reset(self):
+        """Drop all particles and collapse the items"""
+        canvas = self.scene.canvas
+        for i, particle in enumerate(self.particles):
+            if particle is not None:
+                canvas.coords(self.dots[i], *OFFSCREEN)
+                self.particles[i] = None
+        if self.trail is not None:
+            canvas.coords(self.trail, *OFFSCREEN)
+        self.index = 0
+        self.pending = 0.0
+
+    def clear(self):
+        self.reset()
+        self.trajectory = None
+
+    def set_enabled(self, enabled):
+        if self.enabled and not enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def update(self, index, camera):
+        """Advance to trajectory sample `index` and redraw through `camera`"""
+        trajectory = self.trajectory
+        if trajectory is None or not self.enabled:
+            return
+        if index < self.index:
+            # Scrubbed backwards: particles from the future make no sense
+            self.reset()
+        dt = float(trajectory.t[index] - trajectory.t[self.index])
+        travelled = float(trajectory.s[index] - trajectory.s[self.index])
+        self.index = index
+
+        self._emit(index, travelled)
+        self._advance(dt, camera)
+
+        # Trail: the last TRAIL_SECONDS of the path, sampled evenly
+        first = max(0, index - int(TRAIL_SECONDS / trajectory.dt))
+        if index > first:
+            picks = np.unique(np.linspace(first, index, self.trail_points).astype(int))
+            sx, sy = camera.to_screen(trajectory.x[picks], trajectory.y[picks])
+            points = np.empty(2 * len(picks))
+            points[0::2], points[1::2] = sx, sy - TRAIL_LIFT
+            self.scene.canvas.coords(self.trail, *points.tolist())
+
+    def _emit(self, index, travelled):
+        style = self.style
+        self.pending += style['per_joule'] * self.friction * travelled
+        count = min(int(self.pending), self.pool_size)
+        self.pending -= int(self.pending)
+        along = float(self.trajectory.s[index]) - OBJECT_HALF_WIDTH
+        for _ in range(count):
+            spread = self.random.uniform(0.2, 1.0)
+            direction = self.random.uniform(0.3, 1.3)  # radians above the surface, backwards
+            self.particles[self.next_slot] = [along, 0.0, -style['speed'] * spread * math.cos(direction),
+                                              style['speed'] * spread * math.sin(direction),
+                                              style['life'] * self.random.uniform(0.5, 1.0)]
+            self.next_slot = (self.next_slot + 1) % self.pool_size
+
+    def _advance(self, dt, camera):
+        canvas = self.scene.canvas
+        ux, uy = self.surface
+        fall = GRAVITY * self.style['gravity'] * dt
+        r = self.style['size']
+        for i, particle in enumerate(self.particles):
+            if particle is None:
+                continue
+            particle[4] -= dt
+            if particle[4] <= 0:
+                self.particles[i] = None
+                canvas.coords(self.dots[i], *OFFSCREEN)
+                continue
+            particle[0] += particle[2] * dt
+            particle[1] += particle[3] * dt
+            particle[3] -= fall
+            if particle[1] < 0:
+                # Landed: stays where it fell
+                particle[1] = particle[2] = particle[3] = 0.0
+            x = particle[0] * ux - particle[1] * uy
+            y = particle[0] * uy + particle[1] * ux
+            sx, sy = camera.to_screen(x, y)
+            canvas.coords(self.dots[i], sx - r, sy - r, sx + r, sy + r)
@@ -0,0 +1,181 @@
+"""
+Run Graph Component
+The main window's live graph: axes, legend and a LivePlot of the selected
+telemetry channels against distance or time, with faint curves of earlier
+runs behind them. Samples are copied from the run's precomputed channels into
+a TelemetryBuffer as playback advances. Drawing goes through a drawing
+backend (utils.backends), so the graph can be driven without a display.
+"""
+import numpy as np
+from config import CANVAS, GRAPH_HEIGHT
+from ui_components.live_plot import LivePlot
+from ui_components.run_scene import ghost_color
+from utils.run_history import HISTORY_FIELDS
+from utils.telemetry import TelemetryBuffer, channel_extents, downsample
+
+# Views: y-axis label and series as (telemetry channel, legend label, line style)
+GRAPH_VIEWS = {
+    "Energy": ("Energy (J)", (('work', "Net Work", {'fill': "blue", 'width': 2}),
+                              ('ke', "Kinetic Energy", {'fill': "red", 'width': 2, 'dash': (4, 2)}),
+                              ('pe', "Potential Energy", {'fill': "green", 'width': 2, 'dash': (2, 2)}))),
+    "Velocity": ("Velocity (m/s)", (('v', "Velocity v", {'fill': "purple", 'width': 2}),)),
+    "Acceleration": ("Acceleration (m/s²)", (('a', "Acceleration a", {'fill': "darkorange", 'width': 2}),)),
+    "Power": ("Power (W)", (('power', "Power P", {'fill': "teal", 'width': 2}),)),
+}
+# X axes: telemetry channel and label
+GRAPH_AXES = {"Distance": ('s', "Distance (m)"), "Time": ('t', "Time (s)")}
+
+
+class RunGraph:
+    """A run's telemetry plotted live on a canvas of `size` pixels
+
+    `view` and `axis` name entries of GRAPH_VIEWS and GRAPH_AXES. `load`
+    takes the channel arrays of a whole run (utils.telemetry.run_channels),
+    which fix the axis range; `seek` then makes the telemetry end at a
+    sample and `redraw` draws whatever it gained or lost since the last call.
+    """
+
+    def __init__(self, canvas, size=(CANVAS['width'], GRAPH_HEIGHT), view="Energy", axis="Distance"):
+        self.canvas = canvas
+        self.size = size
+        self.view = view
+        self.axis = axis
+        self.telemetry = TelemetryBuffer()
+        self.source = None  # channel arrays of the whole trajectory being played
+        self.extents = {}  # (min, max) per channel, fixing the graph range
+        self.ghost_records = []
+        self.ghosts_visible = True
+        self.layout()
+
+    def layout(self):
+        """Draw the axes, labels and legend of the current view, with empty series"""
+        self.canvas.delete("all")
+        width, height = self.size
+
+        margin_left = 60
+        margin_right = 30
+        margin_top = 20
+        margin_bottom = 40
+
+        self.width = width - margin_left - margin_right
+        self.height = height - margin_top - margin_bottom
+        self.x0 = margin_left
+        self.y0 = margin_top
+
+        # Draw axes
+        self.canvas.create_line(margin_left, margin_top, margin_left,
+                                height - margin_bottom, fill="black", width=2)
+        self.canvas.create_line(margin_left, height - margin_bottom,
+                                width - margin_right, height - margin_bottom, fill="black", width=2)
+
+        # Labels
+        x, x_label = GRAPH_AXES[self.axis]
+        y_label, series = GRAPH_VIEWS[self.view]
+        self.canvas.create_text(width//2, height - 10, text=x_label,
+                                fill="#333", font=("Segoe UI", 9, "bold"))
+        self.canvas.create_text(20, height//2 + 10, text=y_label, angle=90,
+                                fill="#333", font=("Segoe UI", 9, "bold"))
+
+        # Legend, anchored to the right edge
+        for i, (_, label, style) in enumerate(series):
+            y = 15 + 20 * i
+            self.canvas.create_line(width - 280, y, width - 240, y, **style)
+            self.canvas.create_text(width - 230, y, text=label, anchor="w", fill=style['fill'],
+                                    font=("Segoe UI", 8, "bold"))
+
+        # One polyline per series, extended as points arrive
+        self.plot = LivePlot(self.canvas, self.x0, self.y0, self.width, self.height,
+                             [(channel, style) for channel, _, style in series], x=x)
+        self.plot.set_range(*self.range())
+
+    def range(self):
+        """(x_max, y_max, y_min) of the current view, from the extents of the whole run"""
+        x = GRAPH_AXES[self.axis][0]
+        extents = self.extents
+        spans = [extents[channel] for channel, _, _ in GRAPH_VIEWS[self.view][1] if channel in extents]
+        x_max = extents.get(x, (0.0, 0.0))[1]
+        y_min = min([0.0] + [lo for lo, _ in spans])
+        y_max = max([0.0] + [hi for _, hi in spans])
+        # Headroom above the top of the curves, and below any negative part
+        pad = 0.1 * (y_max - y_min)
+        y_min, y_max = (y_min - pad if y_min < 0 else 0.0), y_max + pad
+        return (x_max if x_max > 0 else 1.0), (y_max if y_max > y_min else y_min + 1.0), y_min
+
+    def set_view(self, view, axis):
+        """Show other channels or another x axis; `redraw` then plots the telemetry already held"""
+        self.view, self.axis = view, axis
+        self.layout()
+        self.draw_ghosts()
+
+    def resize(self, size):
+        """Lay the graph out again for a canvas of `size`; False if nothing changed"""
+        if size == self.size or min(size) <= 0:
+            return False
+        self.size = size
+        self.layout()
+        self.draw_ghosts()
+        return True
+
+    def clear(self):
+        """Drop the run: empty telemetry and axes"""
+        self.telemetry.clear()
+        self.source = None
+        self.extents = {}
+        self.layout()
+
+    def load(self, channels):
+        """Take a run's channel arrays; the axis range is fixed from their extents"""
+        self.source = channels
+        self.extents = channel_extents(channels)
+        self.plot.set_range(*self.range())
+
+    def seek(self, index):
+        """Make the telemetry end at sample `index`, growing or truncating it"""
+        telemetry = self.telemetry
+        count = index + 1
+        if count < telemetry.first:
+            # Scrubbed back past what the ring buffer still holds: refill its window
+            telemetry.clear(start=max(0, count - telemetry.capacity))
+        elif count < telemetry.total:
+            telemetry.truncate(count)
+        if count > telemetry.total:
+            start = telemetry.total
+            telemetry.extend({name: values[start:count] for name, values in self.source.items()})
+
+    def redraw(self):
+        """Bring the plot up to date with the telemetry; only points added since the last call are drawn"""
+        self.plot.set_range(*self.range())
+        self.plot.sync(self.telemetry)
+
+    def draw_ghosts(self, records=None):
+        """Faint curves of run history records for the first series the history keeps
+
+        Without `records` the last ones given are drawn again, e.g. after a
+        change of view.
+        """
+        if records is not None:
+            self.ghost_records = records
+        self.canvas.delete("ghost")
+        records = self.ghost_records
+        x0, y0, w, h = self.x0, self.y0, self.width, self.height
+        channel = next((name for name in self.plot.names if name in HISTORY_FIELDS), None)
+        if channel is None or self.plot.x not in HISTORY_FIELDS:
+            records = []
+        for age, record in enumerate(reversed(records)):
+            xs, ys = downsample(record.field(self.plot.x), record.field(channel), w)
+            if len(xs) < 2:
+                continue
+            coords = np.array(self.plot.project(xs, ys))
+            coords[0::2] = np.clip(coords[0::2], x0, x0 + w)
+            coords[1::2] = np.clip(coords[1::2], y0, y0 + h)
+            color = ghost_color((230, 140, 140), age, len(records))
+            self.canvas.create_line(*coords.tolist(), fill=color, width=1, tags="ghost")
+        self.set_ghosts_visible(self.ghosts_visible)
+
+    def clear_ghosts(self):
+        self.ghost_records = []
+        self.canvas.delete("ghost")
+
+    def set_ghosts_visible(self, visible):
+        self.ghosts_visible = visible
+        self.canvas.itemconfigure("ghost", state="normal" if visible else "hidden")
@@ -0,0 +1,336 @@
+"""
+Run Scene Component
+The main window's simulation canvas: surface texture, terrain, ruler, ghosts,
+effects, object, force arrows and the ΔKE indicator, kept in SceneGraph
+layers and followed by the camera. Everything is drawn through a drawing
+backend (utils.backends), so the frame path the window plays can also run
+without a display.
+"""
+import math
+
+import numpy as np
+from config import CANVAS, PIXELS_PER_METER, RULER_STEPS, RULER_MIN_SPACING, QUALITY_LEVELS
+from ui_components.force_overlay import ForceOverlay
+from ui_components.particles import ParticleSystem
+from ui_components.scene_graph import SceneGraph
+from ui_components.simulation_canvas import object_layout, ke_indicator_layout
+from utils.camera import Camera
+from utils.sprites import SpriteCache, RollingSprite, is_rolling, OBJECT_SIZE
+from utils.texture_cache import TextureCache
+
+# Canvas layers, bottom to top; each is rebuilt only when its inputs change
+LAYERS = ("texture", "terrain", "ruler", "labels", "ghosts", "effects", "object", "vectors", "ke")
+
+SURFACE_LABELS = {
+    "Ice": ("#b3e5fc", "❄️ ICE"),
+    "Tile": ("#65aade", "🏠 TILE"),
+    "Wood": ("#705b40", "🪵 WOOD"),
+    "Concrete": ("#6e5d5d", "🏗️ CONCRETE"),
+    "Sand": ("#e69f00", "🏖️ SAND")
+}
+
+
+def ghost_color(rgb, age, count):
+    """`rgb` for the newest ghost, fading towards white with age"""
+    fade = 0.7 * age / max(count - 1, 1)
+    return "#" + "".join(f"{int(c + (255 - c) * fade):02x}" for c in rgb)
+
+
+class RunScene:
+    """A run drawn on a simulation canvas: `set_background`, then `load`, then `show` per sample
+
+    `canvas` is a drawing backend. `textures` (a TextureCache) and `sprites`
+    (a SpriteCache) hand out images in the form that backend draws:
+    PhotoImages for Tk, PIL images offscreen. Items tagged "world" are drawn
+    for the resting camera and reprojected as it zooms and follows; "ground"
+    items span the canvas and only move vertically.
+    """
+
+    def __init__(self, canvas, textures=None, sprites=None):
+        self.canvas = canvas
+        self.textures = textures if textures is not None else TextureCache({})
+        self.sprites = sprites if sprites is not None else SpriteCache()
+        self.scene = SceneGraph(canvas, LAYERS)
+        self.camera = Camera(CANVAS['width'], CANVAS['height'])
+        self.force_overlay = ForceOverlay(self.scene)
+        self.effects = ParticleSystem(self.scene)
+        self.settings = QUALITY_LEVELS[0]
+        self.texture_surface = None  # surface whose texture the tiles show, if any
+        self.texture_image = None
+        self.object_origin = (0, 0)
+        self.ghosts_visible = True
+        self.reset()
+
+    def reset(self):
+        """Clear the canvas down to plain ground"""
+        self.scene.set_items("terrain", [
+            ('rectangle', (0, CANVAS['ground_y'], CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height']),
+             {'fill': "#ddd", 'outline': ""}),
+            ('text', (CANVAS['width']//2, CANVAS['ground_y'] + 25),
+             {'text': "Ground Level", 'fill': "#666", 'font': ("Consolas", 10)})])
+        self.effects.clear()
+        for name in ("texture", "ruler", "labels", "ghosts", "effects", "object", "vectors", "ke"):
+            self.scene.node(name).clear()
+        self.object = None
+        self.roller = None
+        self.trajectory = None
+        self.ghost_view = (1.0, 0.0, 0.0)  # camera zoom and offset the ghost polylines are drawn for
+        self.world_items = {}
+        self.ground_items = {}
+        self.texture_tiles = []
+        self.ruler_items = []
+        self.ruler_text = []
+
+    def texture_layout(self, bg_image):
+        """Two side-by-side copies of a texture, scrolled as tiles by the camera"""
+        self.texture_image = bg_image
+        return [('image', (tile_x, 0), {'anchor': 'nw', 'image': bg_image, 'tags': "texture"})
+                for tile_x in (0, CANVAS['width'])]
+
+    def refresh_texture(self):
+        """Point the texture tiles at the cached variant for the current canvas size"""
+        if not self.texture_tiles or self.texture_surface is None:
+            return
+        image = self.textures.get(self.texture_surface, CANVAS['width'] * self.canvas.zoom, fast=True)
+        self.texture_image = image
+        for tile in self.texture_tiles:
+            self.canvas.itemconfigure(tile, image=image)
+
+    def set_background(self, params):
+        """Lay out the scenario and put the object at its start
+
+        Each layer is keyed by the inputs it depends on and rebuilt only when
+        they change: a re-run with the same scenario just puts the object
+        back, and a surface change swaps the texture image.
+        """
+        scenario = params['scenario']
+        angle = params['angle']
+        surface_name = params['surface']
+        bg_image = self.textures.get(surface_name, CANVAS['width'] * self.canvas.zoom, fast=True)
+        color, label = SURFACE_LABELS.get(surface_name, ("#ddd", "GROUND"))
+        scene = self.scene
+
+        if scene.ensure("texture", (surface_name, bg_image is not None),
+                        lambda: self.texture_layout(bg_image) if bg_image else []):
+            self.texture_tiles = scene.node("texture").ids
+        self.texture_surface = surface_name if bg_image is not None else None
+
+        if scenario == "Pushing Object":
+            terrain_key = (scenario, color)
+        elif scenario == "Lifting Object":
+            terrain_key = (scenario, bg_image is not None, params['d'])
+        else:
+            terrain_key = (scenario, color, angle, params['d'])
+        if scene.ensure("terrain", terrain_key, lambda: self.terrain_layout(params, color, bg_image is not None)):
+            self._capture_projection("terrain")
+
+        if scenario == "Lifting Object":
+            label = "🏗️ CRANE"
+        elif scenario == "Inclined Plane":
+            label = f"⛰️ θ={angle:.1f}°"
+        scene.ensure("labels", label, lambda: [('text', (700, 420), {
+            'text': label, 'fill': "black", 'font': ("Consolas", 11, "bold"), 'tags': "annotation"})])
+
+        if scene.ensure("ruler", scenario == "Pushing Object",
+                        lambda: self.ruler_layout() if scenario == "Pushing Object" else []):
+            self.ruler_items = list(zip(self.canvas.find_withtag("ruler_tick"),
+                                        self.canvas.find_withtag("ruler_label")))
+            self.ruler_text = [None] * len(self.ruler_items)
+
+        if scenario == "Pushing Object":
+            obj_x, obj_y = 50, 350
+        elif scenario == "Lifting Object":
+            obj_x, obj_y = 365, 350
+        else:
+            obj_x, obj_y = 50, 450 - (math.tan(math.radians(angle)) * 100) - 50
+        self.draw_object(obj_x, obj_y, params['shape'], "#73ff61", rolling=is_rolling(params))
+        # The force arrows stay hidden until a run is loaded; they are then drawn live from its trajectory
+        self.force_overlay.clear()
+        scene.node("ke").hide()
+        scene.flush()
+
+        self.camera.reset(anchor=self.object_origin)
+        self.apply_camera()
+        self.apply_quality(self.settings)
+
+    def terrain_layout(self, params, color, textured):
+        """Ground, crane or ramp primitives for a scenario"""
+        scenario = params['scenario']
+        travel = params['d'] * PIXELS_PER_METER
+        ground = (0, CANVAS['ground_y'], CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height'])
+        if scenario == "Pushing Object":
+            return [('rectangle', ground, {'fill': color, 'outline': "black", 'tags': "ground"})]
+        elif scenario == "Lifting Object":
+            items = [] if textured else [('rectangle', ground, {'fill': "#9ecae1", 'outline': "", 'tags': "ground"})]
+            # The crane reaches past the top of the lift
+            items.append(('line', (390, min(50, 350 - travel - 100), 390, 400),
+                          {'fill': "#666", 'width': 4, 'tags': "world"}))
+            return items
+
+        # Ramp at the true slope, long enough for the whole run, with flat
+        # ground to its left and fill below so zooming out leaves no gaps
+        angle = params['angle']
+        slope = math.tan(math.radians(angle))
+        ramp_end = max(CANVAS['width'], 100 + travel * math.cos(math.radians(angle)) + CANVAS['width'])
+        fill_below = 450 + CANVAS['height'] * 4
+        return [('polygon', (-CANVAS['width'], 450, 0, 450, ramp_end, 450 - slope * ramp_end,
+                             ramp_end, fill_below, -CANVAS['width'], fill_below),
+                 {'fill': color, 'outline': "black", 'width': 2, 'tags': "world"})]
+
+    def _capture_projection(self, layer):
+        """Record the freshly built (resting-camera) coords of a layer's world and ground items"""
+        world = set(self.canvas.find_withtag("world"))
+        ground = set(self.canvas.find_withtag("ground"))
+        ids = self.scene.node(layer).ids
+        self.world_items[layer] = {item: self.canvas.coords(item) for item in ids if item in world}
+        self.ground_items[layer] = {item: self.canvas.coords(item) for item in ids if item in ground}
+
+    def ruler_layout(self):
+        """Pool of distance ticks along the ground, repositioned by apply_camera"""
+        items = []
+        for _ in range(CANVAS['width'] // RULER_MIN_SPACING + 2):
+            items.append(('line', (0, 0, 0, 0), {'fill': "black", 'width': 2, 'tags': ("annotation", "ruler_tick")}))
+            items.append(('text', (0, 0), {'text': "", 'fill': "black", 'font': ("Consolas", 8),
+                                           'tags': ("annotation", "ruler_label")}))
+        return items
+
+    def apply_camera(self):
+        """Project world items, ground, texture tiles and ruler for the current camera"""
+        camera = self.camera
+        for layer in self.world_items.values():
+            for item, coords in layer.items():
+                self.canvas.coords(item, *camera.reproject(coords))
+        for layer in self.ground_items.values():
+            for item, coords in layer.items():
+                projected = camera.reproject(coords)
+                self.canvas.coords(item, coords[0], projected[1], coords[2], projected[3])
+
+        # Ghost polylines are long, so they are transformed in place with two tag-wide calls
+        view = (camera.scale / camera.native_scale, -camera.x * camera.scale, camera.y * camera.scale)
+        if view != self.ghost_view:
+            k, ox, oy = self.ghost_view
+            ax, ay = camera.anchor
+            self.canvas.scale("ghost", ax + ox, ay + oy, view[0] / k, view[0] / k)
+            self.canvas.move("ghost", view[1] - ox, view[2] - oy)
+            self.ghost_view = view
+
+        offset = camera.scroll_offset(CANVAS['width'])
+        for i, tile in enumerate(self.texture_tiles):
+            self.canvas.coords(tile, offset + i * CANVAS['width'], 0)
+
+        if self.ruler_items:
+            ground_y = camera.reproject((0, CANVAS['ground_y']))[1]
+            spacing = next((step for step in RULER_STEPS if step * camera.scale >= RULER_MIN_SPACING),
+                           RULER_STEPS[-1])
+            left, _ = camera.to_world(0, 0)
+            first = math.ceil(left / spacing) * spacing
+            for i, (tick, label) in enumerate(self.ruler_items):
+                meters = first + i * spacing
+                sx, _ = camera.to_screen(meters, 0)
+                self.canvas.coords(tick, sx, ground_y, sx, ground_y + 8)
+                self.canvas.coords(label, sx, ground_y + 18)
+                text = f"{meters:g} m"
+                if self.ruler_text[i] != text:
+                    self.canvas.itemconfigure(label, text=text)
+                    self.ruler_text[i] = text
+
+    def draw_object(self, x, y, shape, color, rolling=False):
+        """Draw the object on canvas; a rolling Cylinder or Sphere is a rotating sprite"""
+        # The camera anchors the world origin at the object's bottom center
+        self.object_origin = (x + 25, y + 50)
+        node = self.scene.node("object")
+        if rolling:
+            self.roller = RollingSprite(self.sprites, shape, color, round(OBJECT_SIZE * self.canvas.zoom))
+            layout = lambda: [('image', (x + 25, y + 25), {'image': self.roller.frames[0], 'anchor': "center"})]
+        else:
+            self.roller = None
+            layout = lambda: object_layout(x, y, shape, color)
+        if not self.scene.ensure("object", (x, y, shape, color, rolling), layout):
+            # Same object as last run: just put it back at the start
+            node.move_to(0, 0)
+            self.scene.flush()
+            if rolling:
+                self.canvas.itemconfigure(node.ids[0], image=self.roller.frames[0])
+        if self.roller is not None:
+            self.roller.item = node.ids[0]
+        self.object = node.tag if node.items else None
+
+    def draw_ghosts(self, records):
+        """One faint polyline per run history record, newest last, from the object's start"""
+        ax, ay = self.object_origin
+
+        def build():
+            items = []
+            for age, record in enumerate(reversed(records)):
+                x, y = record.field('x'), record.field('y')
+                if len(x) < 2:
+                    continue
+                coords = np.empty(2 * len(x))
+                coords[0::2] = ax + x * PIXELS_PER_METER
+                coords[1::2] = ay - y * PIXELS_PER_METER
+                items.append(('line', tuple(coords.tolist()),
+                              {'fill': ghost_color((153, 153, 153), age, len(records)), 'width': 2,
+                               'tags': "ghost"}))
+            return items
+
+        # Ghosts are drawn for the resting camera; apply_camera moves them from there
+        if self.scene.ensure("ghosts", (tuple(r.key for r in records), self.object_origin), build):
+            self.ghost_view = (1.0, 0.0, 0.0)
+            self.apply_camera()
+        self.set_ghosts_visible(self.ghosts_visible)
+
+    def clear_ghosts(self):
+        self.scene.node("ghosts").clear()
+        self.ghost_view = (1.0, 0.0, 0.0)
+
+    def set_ghosts_visible(self, visible):
+        self.ghosts_visible = visible
+        self.canvas.itemconfigure("ghost", state="normal" if visible else "hidden")
+
+    def load(self, results, trajectory):
+        """Take the run's trajectory: fit the camera to it and prime the arrows, sprite and effects"""
+        self.trajectory = trajectory
+        # Zoom out for long runs; the camera follows whatever still doesn't fit
+        self.camera.fit(float(trajectory.x[-1]), float(trajectory.y[-1]))
+        self.apply_camera()
+        self.force_overlay.load(results, trajectory)
+        if self.roller is not None:
+            self.roller.load(trajectory)
+        self.effects.load(results, trajectory, results['params']['surface'])
+        # Showing the overlay un-hides its annotation items; let the quality level decide again
+        self.apply_quality(self.settings)
+
+    def show(self, index):
+        """Draw trajectory sample `index`: camera, object, arrows and effects"""
+        trajectory = self.trajectory
+        wx, wy = float(trajectory.x[index]), float(trajectory.y[index])
+        if self.camera.follow(wx, wy):
+            self.apply_camera()
+        # The object node is offset from where it was drawn by the projected displacement
+        sx, sy = self.camera.to_screen(wx, wy)
+        x, y = sx - self.camera.anchor[0], sy - self.camera.anchor[1]
+        self.scene.node("object").move_to(x, y)
+        if self.roller is not None:
+            self.roller.show(self.canvas, index)
+        # Arrows start from the middle of the 50 px object body
+        self.force_overlay.update(index, self.object_origin[0] + x, self.object_origin[1] - 25 + y)
+        self.effects.update(index, self.camera)
+        if index < len(trajectory) - 1:
+            self.scene.node("ke").hide()
+        self.scene.flush()
+
+    def draw_ke_indicator(self, text):
+        """Draw the ΔKE indicator under the object, labelled from `text` ("... = value J")"""
+        bbox = self.scene.node("object").bbox()
+        if bbox is None:
+            return
+        self.scene.node("ke").show()
+        self.scene.set_items("ke", ke_indicator_layout(bbox, text, color="#73ff61"))
+        self.scene.flush()
+
+    def apply_quality(self, settings):
+        """Show or hide textures, annotations and effects for a quality level"""
+        self.settings = settings
+        self.canvas.itemconfigure("texture", state="normal" if settings['textures'] else "hidden")
+        self.canvas.itemconfigure("annotation", state="normal" if settings['annotations'] else "hidden")
+        self.effects.set_enabled(settings['effects'])
@@ -0,0 +1,168 @@
+"""
+Scene Graph Component
+Retained-mode groups of canvas items with dirty tracking and item reuse
+
+Each node owns the canvas items drawn for it and tags them all with its own
+tag, so moving or hiding a node is a single Tk call. Content is described with
+the layout primitives `(kind, coords, options)` used by simulation_canvas;
+setting new content reuses existing items of the same kind instead of
+deleting and recreating them.
+"""
+
+# Key of a node whose content was set without one
+_UNKEYED = object()
+
+
+class SceneNode:
+    """A tagged group of canvas items that moves and shows/hides as one"""
+
+    def __init__(self, canvas, name):
+        self.canvas = canvas
+        self.name = name
+        self.tag = f"node:{name}"
+        self.items = []  # [kind, id, options] per item, in stacking order
+        self.key = _UNKEYED
+        self.offset = (0.0, 0.0)
+        self.visible = True
+        self._pending = (0.0, 0.0)
+        self._state_dirty = False
+
+    @property
+    def ids(self):
+        return [item[1] for item in self.items]
+
+    @property
+    def dirty(self):
+        return self._pending != (0.0, 0.0) or self._state_dirty
+
+    def set_items(self, primitives):
+        """Hold exactly these primitives, reusing items by position and kind
+
+        Coordinates are absolute, so the node offset resets to zero. Reused
+        items always get their coords and options re-applied, since camera or
+        quality code may have changed them directly. Returns True if any item
+        had to be created.
+        """
+        created = False
+        state = "normal" if self.visible else "hidden"
+        for i, (kind, coords, options) in enumerate(primitives):
+            options = dict(options)
+            extra = options.pop('tags', ())
+            options['tags'] = (self.tag,) + ((extra,) if isinstance(extra, str) else tuple(extra))
+            options['state'] = state
+
+            if i < len(self.items) and self.items[i][0] == kind:
+                _, item, old_options = self.items[i]
+                self.canvas.coords(item, *coords)
+                applied = dict(options)
+                # Options the new primitive leaves out go back to their defaults
+                for key in old_options.keys() - options.keys():
+                    applied[key] = self.canvas.itemconfigure(item, key)[3]
+                self.canvas.itemconfigure(item, **applied)
+                self.items[i] = [kind, item, options]
+            else:
+                if i < len(self.items):
+                    self.canvas.delete(self.items[i][1])
+                item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+                entry = [kind, item, options]
+                if i < len(self.items):
+                    self.items[i] = entry
+                else:
+                    self.items.append(entry)
+                created = True
+
+        for _, item, _ in self.items[len(primitives):]:
+            self.canvas.delete(item)
+        del self.items[len(primitives):]
+
+        self.offset = (0.0, 0.0)
+        self._pending = (0.0, 0.0)
+        self._state_dirty = False
+        self.key = _UNKEYED
+        return created
+
+    def clear(self):
+        self.set_items([])
+
+    def move_by(self, dx, dy):
+        self._pending = (self._pending[0] + dx, self._pending[1] + dy)
+
+    def move_to(self, x, y):
+        """Translate so the node sits at offset (x, y) from where it was drawn"""
+        self._pending = (x - self.offset[0], y - self.offset[1])
+
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self._state_dirty = True
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self._state_dirty = True
+
+    def flush(self):
+        """Push pending changes to Tk: one move and at most one itemconfigure"""
+        dx, dy = self._pending
+        if dx or dy:
+            self.canvas.move(self.tag, dx, dy)
+            self.offset = (self.offset[0] + dx, self.offset[1] + dy)
+            self._pending = (0.0, 0.0)
+        if self._state_dirty:
+            state = "normal" if self.visible else "hidden"
+            self.canvas.itemconfigure(self.tag, state=state)
+            self._state_dirty = False
+
+    def bbox(self):
+        """Bounding box of the node's items after pending changes"""
+        self.flush()
+        return self.canvas.bbox(self.tag) if self.items else None
+
+
+class SceneGraph:
+    """Ordered set of SceneNodes on one canvas; later nodes stack above earlier ones"""
+
+    def __init__(self, canvas, names=()):
+        self.canvas = canvas
+        self.nodes = {}
+        for name in names:
+            self.node(name)
+
+    def node(self, name):
+        """Get a node, creating it (on top) if needed"""
+        if name not in self.nodes:
+            self.nodes[name] = SceneNode(self.canvas, name)
+        return self.nodes[name]
+
+    def set_items(self, name, primitives):
+        """Replace a node's content; restack only if items were created"""
+        node = self.node(name)
+        if node.set_items(primitives):
+            self.restack()
+        return node.ids
+
+    def ensure(self, name, key, build):
+        """Rebuild a node from `build()` only when `key` differs from its last key
+
+        Keys describe a layer's inputs (scenario, surface, angle...), so a
+        re-run with the same inputs leaves the layer's items untouched.
+        Returns True if the node was rebuilt.
+        """
+        node = self.node(name)
+        if node.key == key:
+            return False
+        self.set_items(name, build())
+        node.key = key
+        return True
+
+    def restack(self):
+        """Raise every item in node order so the stacking matches the graph"""
+        for node in self.nodes.values():
+            for item in node.ids:
+                self.canvas.tag_raise(item)
+
+    def flush(self):
+        """Apply pending moves and visibility; clean nodes make no Tk calls"""
+        for node in self.nodes.values():
+            if node.dirty:
+                node.flush()
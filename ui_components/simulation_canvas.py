@@ -1,175 +1,262 @@
 """
 Simulation Canvas Component
 Handles all canvas drawing operations for the simulation
+
+Scene geometry is described by the layout functions below as a list of
+primitives `(kind, coords, options)` using Tk canvas item kinds and options,
+so the same scene can be drawn on the Tk canvas or rendered offscreen.
 """
 import tkinter as tk
 import math
-from config import CANVAS, SURFACE_COLORS, OBJECT_COLORS
+from config import CANVAS, SURFACE_COLORS, OBJECT_COLORS, PIXELS_PER_METER, FIT_MIN_PIXELS_PER_METER
+from ui_components.scene_graph import SceneGraph
+from utils.backends import TkBackend
+from utils.camera import Camera
+
+
+def surface_for_friction(mu):
+    """Pick the surface color and label that matches a friction coefficient"""
+    if mu <= 0.15:
+        return SURFACE_COLORS['Ice']
+    elif mu <= 0.35:
+        return SURFACE_COLORS['Tile']
+    elif mu <= 0.6:
+        return SURFACE_COLORS['Wood']
+    elif mu <= 0.8:
+        return SURFACE_COLORS['Concrete']
+    return SURFACE_COLORS['Sand']
+
+
+def object_start(params):
+    """Top-left corner of the object at the start of a run"""
+    scenario = params['scenario']
+    if scenario == "Lifting Object":
+        return 315, 350
+    if scenario == "Inclined Plane":
+        return 50, (CANVAS['ground_y'] + CANVAS['ground_height']) - (math.tan(math.radians(params['angle'])) * 100) - 50
+    return 50, 350
+
+
+def object_layout(x, y, shape, color):
+    """Primitives for the object; a Cylinder is drawn as bottom oval, body, top oval"""
+    style = {'fill': color, 'outline': "black", 'width': 2}
+    if shape == "Box":
+        return [('rectangle', (x, y, x + 50, y + 50), style)]
+    elif shape == "Cylinder":
+        return [('oval', (x, y + 40, x + 50, y + 60), style),
+                ('rectangle', (x, y + 10, x + 50, y + 50), style),
+                ('oval', (x, y, x + 50, y + 20), style)]
+    elif shape == "Sphere":
+        radius = 25
+        cx, cy = x + radius, y + 25
+        return [('oval', (cx - radius, cy - radius, cx + radius, cy + radius), style)]
+    return []
+
+
+def background_layout(params, travel=0):
+    """Primitives for the scenario background (everything except the object)
+
+    `travel` is the run length in pixels; when given, the crane and ramp are
+    extended so they still reach the object at the end of a long run.
+    """
+    scenario = params['scenario']
+    ground = (0, CANVAS['ground_y'], CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height'])
+    if scenario == "Pushing Object":
+        color, label = surface_for_friction(params['mu'])
+        return [('rectangle', ground, {'fill': color, 'outline': ""}),
+                ('text', (600, 420), {'text': f"{label}", 'fill': "black", 'font': ("Consolas", 11, "bold")})]
+    elif scenario == "Lifting Object":
+        return [('rectangle', ground, {'fill': "#9ecae1", 'outline': ""}),
+                ('line', (340, min(50, 250 - travel), 340, CANVAS['ground_y']), {'fill': "#666", 'width': 4}),
+                ('text', (600, 420), {'text': "🏗️ CRANE", 'fill': "black", 'font': ("Consolas", 11, "bold")})]
+    elif scenario == "Inclined Plane":
+        angle = params['angle']
+        base = CANVAS['ground_y'] + CANVAS['ground_height']
+        if travel:
+            ramp_end = max(CANVAS['width'], 175 + travel * math.cos(math.radians(angle)))
+            incline_height = math.tan(math.radians(angle)) * ramp_end
+        else:
+            ramp_end = CANVAS['width']
+            incline_height = min(math.tan(math.radians(angle)) * CANVAS['width'], 350)
+        return [('polygon', (0, base, ramp_end, base, ramp_end, base - incline_height),
+                 {'fill': "#c7e9b4", 'outline': "black", 'width': 2}),
+                ('text', (600, 420), {'text': f"⛰️ θ={angle:.1f}°", 'fill': "black",
+                                      'font': ("Consolas", 11, "bold")})]
+    return []
+
+
+def force_vector_layout(params, x_center, y_center):
+    """Primitives for the inclined plane force vectors around the object center"""
+    if params['scenario'] != "Inclined Plane":
+        return []
+
+    angle = params['angle']
+    length = 60
+    angle_rad = math.radians(angle)
+    label_font = ("Consolas", 9, "bold")
+
+    # Gravity force (down)
+    items = [('line', (x_center, y_center, x_center, y_center + length),
+              {'arrow': tk.LAST, 'fill': "green", 'width': 3}),
+             ('text', (x_center + 30, y_center + length), {'text': "Fg", 'fill': "green", 'font': label_font})]
+
+    # Normal force (perpendicular to surface)
+    fn_dx = -length * math.sin(angle_rad)
+    fn_dy = -length * math.cos(angle_rad)
+    items += [('line', (x_center, y_center, x_center + fn_dx, y_center + fn_dy),
+               {'arrow': tk.LAST, 'fill': "orange", 'width': 3}),
+              ('text', (x_center + fn_dx - 15, y_center + fn_dy), {'text': "Fn", 'fill': "orange", 'font': label_font})]
+
+    # Applied force (parallel to surface)
+    f_dx = length * math.cos(angle_rad)
+    f_dy = -length * math.sin(angle_rad)
+    items += [('line', (x_center, y_center, x_center + f_dx, y_center + f_dy),
+               {'arrow': tk.LAST, 'fill': "#00e6e6", 'width': 3}),
+              ('text', (x_center + f_dx + 20, y_center + f_dy), {'text': "F", 'fill': "#00e6e6", 'font': label_font})]
+    return items
+
+
+def scene_layout(params):
+    """Full start-of-run scene: background, object and force vectors"""
+    x, y = object_start(params)
+    obj = object_layout(x, y, params['shape'], OBJECT_COLORS[params['scenario']])
+    # Force vectors are anchored on the object body (the middle part of a Cylinder)
+    body = obj[1] if len(obj) == 3 else obj[0]
+    coords = body[1]
+    x_center = (coords[0] + coords[2]) / 2
+    y_center = (coords[1] + coords[3]) / 2
+    return background_layout(params) + obj + force_vector_layout(params, x_center, y_center)
+
+
+def ke_indicator_layout(bbox, ke_text, color="#ffaa00"):
+    """Primitives for the KE bar and label under an object bounding box"""
+    x1, _, x2, y2 = bbox
+    y = y2 + 20
+    items = [('line', (x1, y, x2, y), {'fill': color, 'width': 3})]
+    if "=" in ke_text:
+        ke_val = ke_text.split("=")[1].strip().split()[0]
+        items.append(('text', ((x1 + x2) / 2, y + 15), {'text': f"ΔKE={ke_val}J", 'fill': color,
+                                                        'font': ("Consolas", 11, "bold")}))
+    return items
+
+
+def project_for_camera(primitive, camera):
+    """Move a primitive drawn for the resting camera into the camera's view
+
+    HUD text stays put and the ground strip keeps spanning the frame; only its
+    height follows the camera.
+    """
+    kind, coords, options = primitive
+    if kind == 'text':
+        return primitive
+    projected = camera.reproject(coords)
+    if kind == 'rectangle' and coords[0] <= 0 and coords[2] >= CANVAS['width']:
+        projected = [coords[0], projected[1], coords[2], coords[3]]
+    return kind, tuple(projected), options
+
+
+def scale_layout(items, k, dx=0.0, dy=0.0):
+    """Primitives resized by k (including line widths and fonts), then moved by dx, dy"""
+    if k == 1.0 and not dx and not dy:
+        return items
+    out = []
+    for kind, coords, options in items:
+        options = dict(options)
+        if 'width' in options:
+            options['width'] = max(1, round(options['width'] * k))
+        if 'font' in options:
+            options['font'] = (options['font'][0], options['font'][1] * k) + tuple(options['font'][2:])
+        out.append((kind, tuple(c * k + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords)), options))
+    return out
+
+
+def fitted_camera(params, trajectory, min_scale=FIT_MIN_PIXELS_PER_METER):
+    """Camera anchored on the object's start, zoomed out so the whole run fits"""
+    x, y = object_start(params)
+    camera = Camera(CANVAS['width'], CANVAS['height'], min_scale=min_scale)
+    camera.reset(anchor=(x + 25, y + 50))
+    camera.fit(trajectory.x[-1], trajectory.y[-1])
+    return camera
+
+
+def run_layers(params, camera):
+    """Static background (projected for `camera`, with force vectors) and the object at its start"""
+    x, y = object_start(params)
+    obj = object_layout(x, y, params['shape'], OBJECT_COLORS[params['scenario']])
+    body = (obj[1] if len(obj) == 3 else obj[0])[1]
+    vectors = force_vector_layout(params, (body[0] + body[2]) / 2, (body[1] + body[3]) / 2)
+    background = [project_for_camera(p, camera) for p in background_layout(params, params['d'] * PIXELS_PER_METER)]
+    return background + vectors, obj
+
 
 class SimulationCanvas:
-    """Manages the simulation canvas and drawing operations"""
-    
-    def __init__(self, parent):
-        self.canvas = tk.Canvas(parent, width=CANVAS['width'], height=CANVAS['height'],
-                                bg="white", highlightthickness=2, highlightbackground="#00e6e6")
+    """Manages the simulation canvas and drawing operations
+
+    Drawing goes through a SceneGraph, so runs reuse canvas items and the
+    object moves with one call however many parts its shape has. Pass a
+    drawing backend (utils.backends) to draw somewhere other than a new Tk
+    canvas, e.g. headless for profiling.
+    """
+
+    def __init__(self, parent, backend=None):
+        if backend is None:
+            backend = TkBackend(tk.Canvas(parent, width=CANVAS['width'], height=CANVAS['height'],
+                                          bg="white", highlightthickness=2, highlightbackground="#00e6e6"))
+        self.canvas = backend
+        self.scene = SceneGraph(self.canvas, ("background", "object", "vectors", "ke"))
         self.object = None
-    
+
     def get_widget(self):
-        """Return the canvas widget"""
-        return self.canvas
-    
+        """Return the canvas widget (None for offscreen backends)"""
+        return self.canvas.widget
+
     def reset(self):
         """Clear canvas and draw ground"""
-        self.canvas.delete("all")
-        self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'],
-                                      CANVAS['ground_y'] + CANVAS['ground_height'],
-                                      fill="#ddd", outline="")
-        self.canvas.create_text(350, 425, text="Ground Level", fill="#666", font=("Consolas", 10))
+        self.scene.set_items("background", [
+            ('rectangle', (0, CANVAS['ground_y'], CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height']),
+             {'fill': "#ddd", 'outline': ""}),
+            ('text', (350, 425), {'text': "Ground Level", 'fill': "#666", 'font': ("Consolas", 10)})])
+        for name in ("object", "vectors", "ke"):
+            self.scene.node(name).clear()
         self.object = None
-    
+
     def update_background(self, params):
         """Update canvas background based on scenario"""
-        self.canvas.delete("all")
-        scenario = params['scenario']
-        angle = params['angle']
-        mu = params['mu']
-        shape = params['shape']
-        
-        if scenario == "Pushing Object":
-            self._draw_pushing_background(mu, shape)
-        elif scenario == "Lifting Object":
-            self._draw_lifting_background(shape)
-        elif scenario == "Inclined Plane":
-            self._draw_incline_background(angle, shape)
-    
-    def _draw_pushing_background(self, mu, shape):
-        """Draw background for pushing scenario"""
-        # Determine surface type based on friction
-        if mu <= 0.15:
-            color, label = SURFACE_COLORS['Ice']
-        elif mu <= 0.35:
-            color, label = SURFACE_COLORS['Tile']
-        elif mu <= 0.6:
-            color, label = SURFACE_COLORS['Wood']
-        elif mu <= 0.8:
-            color, label = SURFACE_COLORS['Concrete']
-        else:
-            color, label = SURFACE_COLORS['Sand']
-        
-        self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'],
-                                      CANVAS['ground_y'] + CANVAS['ground_height'],
-                                      fill=color, outline="")
-        self.canvas.create_text(600, 420, text=f"{label}", fill="black", font=("Consolas", 11, "bold"))
-        self.draw_object(50, 350, shape, OBJECT_COLORS['Pushing Object'])
-    
-    def _draw_lifting_background(self, shape):
-        """Draw background for lifting scenario"""
-        self.canvas.create_rectangle(0, CANVAS['ground_y'], CANVAS['width'],
-                                      CANVAS['ground_y'] + CANVAS['ground_height'],
-                                      fill="#9ecae1", outline="")
-        self.canvas.create_line(340, 50, 340, CANVAS['ground_y'], fill="#666", width=4)
-        self.canvas.create_text(600, 420, text="🏗️ CRANE", fill="black", font=("Consolas", 11, "bold"))
-        self.draw_object(315, 350, shape, OBJECT_COLORS['Lifting Object'])
-    
-    def _draw_incline_background(self, angle, shape):
-        """Draw background for inclined plane scenario"""
-        incline_height = min(math.tan(math.radians(angle)) * CANVAS['width'], 350)
-        self.canvas.create_polygon(0, CANVAS['ground_y'] + CANVAS['ground_height'],
-                                     CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height'],
-                                     CANVAS['width'], CANVAS['ground_y'] + CANVAS['ground_height'] - incline_height,
-                                     fill="#c7e9b4", outline="black", width=2)
-        self.canvas.create_text(600, 420, text=f"⛰️ θ={angle:.1f}°", fill="black", font=("Consolas", 11, "bold"))
-        
-        obj_y = (CANVAS['ground_y'] + CANVAS['ground_height']) - (math.tan(math.radians(angle)) * 100) - 50
-        self.draw_object(50, obj_y, shape, OBJECT_COLORS['Inclined Plane'])
-    
+        self.scene.set_items("background", background_layout(params))
+        self.scene.node("vectors").clear()
+        self.scene.node("ke").clear()
+        x, y = object_start(params)
+        self.draw_object(x, y, params['shape'], OBJECT_COLORS[params['scenario']])
+
     def draw_object(self, x, y, shape, color):
         """Draw the object based on shape"""
-        if shape == "Box":
-            self.object = self.canvas.create_rectangle(x, y, x + 50, y + 50,
-                                                        fill=color, outline="black", width=2)
-        elif shape == "Cylinder":
-            rect = self.canvas.create_rectangle(x, y + 10, x + 50, y + 50,
-                                                 fill=color, outline="black", width=2)
-            oval_top = self.canvas.create_oval(x, y, x + 50, y + 20,
-                                                fill=color, outline="black", width=2)
-            oval_bottom = self.canvas.create_oval(x, y + 40, x + 50, y + 60,
-                                                   fill=color, outline="black", width=2)
-            self.object = [oval_bottom, rect, oval_top]
-        elif shape == "Sphere":
-            radius = 25
-            cx, cy = x + radius, y + 25
-            self.object = self.canvas.create_oval(cx - radius, cy - radius,
-                                                   cx + radius, cy + radius,
-                                                   fill=color, outline="black", width=2)
-    
+        ids = self.scene.set_items("object", object_layout(x, y, shape, color))
+        # `object` is the node tag: canvas.move / coords calls on it hit every part
+        self.object = self.scene.node("object").tag if ids else None
+
     def draw_force_vectors(self, params):
         """Draw force vectors for inclined plane"""
-        if params['scenario'] != "Inclined Plane":
+        bbox = self.scene.node("object").bbox()
+        if params['scenario'] != "Inclined Plane" or bbox is None:
             return
-        
-        if isinstance(self.object, list):
-            coords = self.canvas.coords(self.object[1])
-        else:
-            coords = self.canvas.coords(self.object)
-        
-        x_center = (coords[0] + coords[2]) / 2
-        y_center = (coords[1] + coords[3]) / 2
-        
-        angle = params['angle']
-        length = 60
-        angle_rad = math.radians(angle)
-        
-        # Gravity force (down)
-        self.canvas.create_line(x_center, y_center, x_center, y_center + length,
-                                 arrow=tk.LAST, fill="green", width=3)
-        self.canvas.create_text(x_center + 30, y_center + length, text="Fg",
-                                 fill="green", font=("Consolas", 9, "bold"))
-        
-        # Normal force (perpendicular to surface)
-        fn_dx = -length * math.sin(angle_rad)
-        fn_dy = -length * math.cos(angle_rad)
-        self.canvas.create_line(x_center, y_center, x_center + fn_dx, y_center + fn_dy,
-                                 arrow=tk.LAST, fill="orange", width=3)
-        self.canvas.create_text(x_center + fn_dx - 15, y_center + fn_dy, text="Fn",
-                                 fill="orange", font=("Consolas", 9, "bold"))
-        
-        # Applied force (parallel to surface)
-        f_dx = length * math.cos(angle_rad)
-        f_dy = -length * math.sin(angle_rad)
-        self.canvas.create_line(x_center, y_center, x_center + f_dx, y_center + f_dy,
-                                 arrow=tk.LAST, fill="#00e6e6", width=3)
-        self.canvas.create_text(x_center + f_dx + 20, y_center + f_dy, text="F",
-                                 fill="#00e6e6", font=("Consolas", 9, "bold"))
-    
+        x_center = (bbox[0] + bbox[2]) / 2
+        y_center = (bbox[1] + bbox[3]) / 2
+        self.scene.set_items("vectors", force_vector_layout(params, x_center, y_center))
+
     def move_object(self, dx, dy):
         """Move the drawn object by dx, dy"""
-        if isinstance(self.object, list):
-            for part in self.object:
-                self.canvas.move(part, dx, dy)
-        else:
-            self.canvas.move(self.object, dx, dy)
-    
+        self.scene.node("object").move_by(dx, dy)
+        self.scene.flush()
+
     def draw_ke_indicator(self, ke_text):
         """Draw kinetic energy indicator below object"""
-        if isinstance(self.object, list):
-            all_coords = []
-            for part in self.object:
-                all_coords.extend(self.canvas.coords(part))
-            x1, x2 = min(all_coords[::2]), max(all_coords[::2])
-            y2 = max(all_coords[1::2])
-        else:
-            coords = self.canvas.coords(self.object)
-            x1, x2, y2 = coords[0], coords[2], coords[3]
-        
-        y = y2 + 20
-        self.canvas.create_line(x1, y, x2, y, fill="#ffaa00", width=3, tags="ke_line")
-        
-        if "=" in ke_text:
-            ke_val = ke_text.split("=")[1].strip().split()[0]
-            self.canvas.create_text((x1 + x2) / 2, y + 15, text=f"ΔKE={ke_val}J",
-                                     fill="#ffaa00", font=("Consolas", 11, "bold"), tags="ke_text")
-    
+        bbox = self.scene.node("object").bbox()
+        if bbox is None:
+            return
+        self.scene.node("ke").show()
+        self.scene.set_items("ke", ke_indicator_layout(bbox, ke_text))
+        self.scene.flush()
+
     def update(self):
         """Update the canvas display"""
-        self.canvas.update()
\ No newline at end of file
+        self.canvas.update()
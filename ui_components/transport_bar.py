@@ -0,0 +1,114 @@
+"""
+Transport Bar Component
+Play/pause, scrub slider, playback speed and jump-to-velocity for a TrajectoryPlayer
+"""
+import math
+import tkinter as tk
+from tkinter import ttk
+from config import COLORS, FONTS, MIN_PLAYBACK_SPEED, MAX_PLAYBACK_SPEED
+
+
+class TransportBar:
+    """Controls for a TrajectoryPlayer; the player reads its speed from here"""
+
+    def __init__(self, parent, player):
+        self.frame = tk.Frame(parent, bg=COLORS['bg_primary'])
+        self.player = player
+        self._updating = False
+        self._setup_ui()
+        player.speed = self.get_speed
+        self.clear()
+
+    def get_widget(self):
+        """Return the transport frame"""
+        return self.frame
+
+    def _setup_ui(self):
+        """Setup playback controls"""
+        self.play_btn = tk.Button(self.frame, text="▶", width=3, bg=COLORS['accent_cyan'], fg="black",
+                                  font=FONTS['button'], command=self.toggle)
+        self.play_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.scrub = ttk.Scale(self.frame, from_=0, to=1, orient="horizontal", length=260,
+                               command=self._on_scrub)
+        self.scrub.pack(side=tk.LEFT, padx=5)
+
+        self.time_label = tk.Label(self.frame, text="", width=24, anchor="w", bg=COLORS['bg_primary'],
+                                   fg=COLORS['accent_yellow'], font=FONTS['label'])
+        self.time_label.pack(side=tk.LEFT, padx=5)
+
+        # Log scale so 0.1× and 100× are equally easy to reach
+        self.speed_scale = ttk.Scale(self.frame, from_=math.log10(MIN_PLAYBACK_SPEED),
+                                     to=math.log10(MAX_PLAYBACK_SPEED), orient="horizontal",
+                                     length=100, command=self._on_speed)
+        self.speed_scale.set(0.0)
+        self.speed_scale.pack(side=tk.LEFT, padx=5)
+        self.speed_label = tk.Label(self.frame, text="1.0×", width=6, bg=COLORS['bg_primary'],
+                                    fg="white", font=FONTS['label'])
+        self.speed_label.pack(side=tk.LEFT)
+
+        tk.Label(self.frame, text="v =", bg=COLORS['bg_primary'], fg="white",
+                 font=FONTS['label']).pack(side=tk.LEFT, padx=(10, 2))
+        self.velocity_entry = tk.Entry(self.frame, width=5, font=FONTS['normal'])
+        self.velocity_entry.pack(side=tk.LEFT)
+        self.velocity_entry.bind("<Return>", lambda e: self.jump_to_velocity())
+        tk.Button(self.frame, text="Jump", bg=COLORS['accent_blue'], fg="black", font=FONTS['label'],
+                  command=self.jump_to_velocity).pack(side=tk.LEFT, padx=2)
+
+    def get_speed(self):
+        """Current playback speed multiplier"""
+        return 10 ** float(self.speed_scale.get())
+
+    def load(self, trajectory):
+        """Size the scrub slider to a new trajectory"""
+        self._updating = True
+        self.scrub.configure(to=max(len(trajectory) - 1, 1))
+        self.scrub.set(0)
+        self._updating = False
+        self.scrub.state(["!disabled"])
+        self.play_btn.config(state="normal")
+        self.update_state()
+
+    def clear(self):
+        """Disable the controls until a trajectory is loaded"""
+        self._updating = True
+        self.scrub.set(0)
+        self._updating = False
+        self.scrub.state(["disabled"])
+        self.play_btn.config(state="disabled", text="▶")
+        self.time_label.config(text="")
+
+    def update_position(self, index):
+        """Move the slider to a rendered frame without seeking again"""
+        trajectory = self.player.trajectory
+        self._updating = True
+        self.scrub.set(index)
+        self._updating = False
+        self.time_label.config(text=f"t = {trajectory.t[index]:.2f}/{trajectory.duration:.2f} s  "
+                                    f"v = {trajectory.v[index]:.2f} m/s")
+
+    def update_state(self):
+        """Show play or pause depending on the player"""
+        self.play_btn.config(text="⏸" if self.player.playing else "▶")
+
+    def toggle(self):
+        self.player.toggle()
+        self.update_state()
+
+    def jump_to_velocity(self):
+        """Seek to the first moment the object reaches the entered speed"""
+        try:
+            target = float(self.velocity_entry.get())
+        except ValueError:
+            return
+        self.player.pause()
+        if not self.player.seek_velocity(target):
+            self.time_label.config(text=f"never reaches {target:.2f} m/s")
+        self.update_state()
+
+    def _on_scrub(self, value):
+        if not self._updating:
+            self.player.seek(float(value))
+
+    def _on_speed(self, value):
+        self.speed_label.config(text=f"{10 ** float(value):.1f}×")
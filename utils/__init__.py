@@ -1,5 +1,8 @@
 """Utilities package for ForceQuest"""
 from .timer import SimulationTimer
-from .plotting import GraphGenerator
+from .plotting import EnergyFigure
+from .jobs import JobManager, CancelToken, JobCancelled
+from .backends import DrawingBackend, TkBackend, PILBackend, RecordingBackend
 
-__all__ = ['SimulationTimer', 'GraphGenerator']
\ No newline at end of file
+__all__ = ['SimulationTimer', 'EnergyFigure', 'JobManager', 'CancelToken', 'JobCancelled',
+           'DrawingBackend', 'TkBackend', 'PILBackend', 'RecordingBackend']
\ No newline at end of file
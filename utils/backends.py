@@ -0,0 +1,477 @@
+"""
+Drawing backends for ForceQuest scenes
+Scene code draws through the subset of the tk.Canvas item API defined by
+DrawingBackend, so the same drawing can go to a Tk canvas, to a PIL image, or
+to a recorder that counts and serializes every call without a display.
+"""
+import itertools
+import json
+from collections import Counter
+
+from PIL import Image, ImageDraw
+from config import CANVAS
+from utils.offscreen import draw_primitive
+
+ITEM_KINDS = ('rectangle', 'oval', 'line', 'polygon', 'text', 'image')
+
+# Defaults reported by itemconfigure(item, option), as Tk does for unset options
+OPTION_DEFAULTS = {'width': 1.0, 'state': "", 'fill': "", 'outline': "black", 'text': "", 'anchor': "center"}
+
+# Rough glyph size relative to the font's point size, for text bounding boxes
+_CHAR_WIDTH = 0.8
+_LINE_HEIGHT = 1.6
+
+
+class DrawingBackend:
+    """Canvas item API shared by all backends (names and semantics follow tk.Canvas)
+
+    Items are addressed by integer id or by tag; `tags` may be a string or a
+    tuple. `coords(item)` returns the first matching item's coordinates and
+    `itemconfigure(item, option)` returns a Tk-style 5-tuple whose index 3 is
+    the option's default.
+    """
+
+    widget = None
+    zoom = 1.0  # offscreen backends draw at the logical (CANVAS) size
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create('polygon', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def _create(self, kind, coords, options):
+        raise NotImplementedError
+
+    def coords(self, item, *coords):
+        raise NotImplementedError
+
+    def insert(self, item, index, coords):
+        """Insert flat `coords` into a line or polygon before coordinate `index` (or "end")"""
+        raise NotImplementedError
+
+    def dchars(self, item, first, last=None):
+        """Delete coordinates `first`..`last` (inclusive, or "end") of a line or polygon"""
+        raise NotImplementedError
+
+    def itemconfigure(self, item, option=None, **options):
+        raise NotImplementedError
+
+    def itemcget(self, item, option):
+        raise NotImplementedError
+
+    def move(self, item, dx, dy):
+        raise NotImplementedError
+
+    def scale(self, item, x_origin, y_origin, x_scale, y_scale):
+        raise NotImplementedError
+
+    def delete(self, *items):
+        raise NotImplementedError
+
+    def bbox(self, *items):
+        raise NotImplementedError
+
+    def tag_raise(self, item):
+        raise NotImplementedError
+
+    def tag_lower(self, item):
+        raise NotImplementedError
+
+    def find_withtag(self, item):
+        raise NotImplementedError
+
+    def update(self):
+        """Make pending drawing visible (a no-op for offscreen backends)"""
+
+
+class TkBackend(DrawingBackend):
+    """Draws on a tk.Canvas; `widget` is the canvas for packing and binding
+
+    Callers always work in logical (CANVAS-sized) coordinates. `set_zoom`
+    scales the whole drawing to a resized widget: coordinates and font sizes
+    are converted on the way in and out, line widths stay as given, and image
+    items keep their image (swap it for a resized one to scale it).
+    """
+
+    def __init__(self, canvas):
+        self.widget = canvas
+        self.zoom = 1.0
+        self._fonts = {}  # text item -> logical font
+
+    def _scaled(self, coords):
+        if self.zoom == 1.0:
+            return coords
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        return [c * self.zoom for c in coords]
+
+    def _font(self, font):
+        if self.zoom == 1.0 or not isinstance(font, tuple) or len(font) < 2:
+            return font
+        return (font[0], max(1, round(font[1] * self.zoom))) + tuple(font[2:])
+
+    def _create(self, kind, coords, options):
+        font = options.get('font')
+        if font is not None:
+            options = dict(options, font=self._font(font))
+        item = getattr(self.widget, f"create_{kind}")(*self._scaled(coords), **options)
+        if font is not None:
+            self._fonts[item] = font
+        return item
+
+    def set_zoom(self, zoom):
+        """Rescale everything drawn so far, and everything drawn later, by `zoom`"""
+        if zoom == self.zoom:
+            return
+        ratio = zoom / self.zoom
+        self.widget.scale("all", 0, 0, ratio, ratio)
+        self.zoom = zoom
+        for item, font in list(self._fonts.items()):
+            if self.widget.type(item):
+                self.widget.itemconfigure(item, font=self._font(font))
+            else:
+                del self._fonts[item]
+
+    def coords(self, item, *coords):
+        if coords:
+            return self.widget.coords(item, *self._scaled(coords))
+        return [c / self.zoom for c in self.widget.coords(item)]
+
+    def insert(self, item, index, coords):
+        self.widget.insert(item, index, self._scaled(list(coords)))
+
+    def dchars(self, item, first, last=None):
+        if last is None:
+            self.widget.dchars(item, first)
+        else:
+            self.widget.dchars(item, first, last)
+
+    def itemconfigure(self, item, option=None, **options):
+        if 'font' in options:
+            for i in self.widget.find_withtag(item):
+                self._fonts[i] = options['font']
+            options['font'] = self._font(options['font'])
+        return self.widget.itemconfigure(item, option, **options)
+
+    def itemcget(self, item, option):
+        return self.widget.itemcget(item, option)
+
+    def move(self, item, dx, dy):
+        self.widget.move(item, dx * self.zoom, dy * self.zoom)
+
+    def scale(self, item, x_origin, y_origin, x_scale, y_scale):
+        self.widget.scale(item, x_origin * self.zoom, y_origin * self.zoom, x_scale, y_scale)
+
+    def delete(self, *items):
+        if self._fonts:
+            # Forget the fonts of deleted text items, whether named by id or by tag
+            for item in items:
+                for i in self.widget.find_withtag(item):
+                    self._fonts.pop(i, None)
+        self.widget.delete(*items)
+
+    def bbox(self, *items):
+        box = self.widget.bbox(*items)
+        if box is None or self.zoom == 1.0:
+            return box
+        return tuple(int(c / self.zoom) for c in box)
+
+    def tag_raise(self, item):
+        self.widget.tag_raise(item)
+
+    def tag_lower(self, item):
+        self.widget.tag_lower(item)
+
+    def find_withtag(self, item):
+        return self.widget.find_withtag(item)
+
+    def update(self):
+        self.widget.update_idletasks()
+
+
+class RetainedBackend(DrawingBackend):
+    """In-memory item store with Tk's id, tag and stacking semantics"""
+
+    def __init__(self, width=CANVAS['width'], height=CANVAS['height']):
+        self.width = width
+        self.height = height
+        self.items = {}  # id -> [kind, coords, options, tags]
+        self.order = []  # ids, bottom to top
+        self._ids = itertools.count(1)
+
+    def _match(self, item):
+        if isinstance(item, int):
+            return [item] if item in self.items else []
+        if item == "all":
+            return list(self.order)
+        return [i for i in self.order if item in self.items[i][3]]
+
+    @staticmethod
+    def _tags(tags):
+        return (tags,) if isinstance(tags, str) else tuple(tags)
+
+    def _create(self, kind, coords, options):
+        if len(coords) == 1:
+            coords = coords[0]
+        options = dict(options)
+        tags = self._tags(options.pop('tags', ()))
+        item = next(self._ids)
+        self.items[item] = [kind, [float(c) for c in coords], options, tags]
+        self.order.append(item)
+        return item
+
+    def coords(self, item, *coords):
+        matches = self._match(item)
+        if not matches:
+            return []
+        if coords:
+            if len(coords) == 1:
+                coords = coords[0]
+            self.items[matches[0]][1] = [float(c) for c in coords]
+        return list(self.items[matches[0]][1])
+
+    def insert(self, item, index, coords):
+        for i in self._match(item):
+            current = self.items[i][1]
+            at = len(current) if index == "end" else int(index)
+            current[at:at] = [float(c) for c in coords]
+
+    def dchars(self, item, first, last=None):
+        for i in self._match(item):
+            current = self.items[i][1]
+            end = len(current) - 1 if last == "end" else first if last is None else int(last)
+            del current[int(first):end + 1]
+
+    def itemconfigure(self, item, option=None, **options):
+        matches = self._match(item)
+        if option is not None and not options:
+            if not matches:
+                return None
+            current = self.itemcget(matches[0], option)
+            default = OPTION_DEFAULTS.get(option, "")
+            return (f"-{option}", option, "", default, current)
+        for i in matches:
+            entry = self.items[i]
+            for key, value in options.items():
+                if key == 'tags':
+                    entry[3] = self._tags(value)
+                else:
+                    entry[2][key] = value
+
+    def itemcget(self, item, option):
+        matches = self._match(item)
+        if not matches:
+            return ""
+        entry = self.items[matches[0]]
+        if option == 'tags':
+            return " ".join(entry[3])
+        return entry[2].get(option, OPTION_DEFAULTS.get(option, ""))
+
+    def move(self, item, dx, dy):
+        for i in self._match(item):
+            coords = self.items[i][1]
+            for k in range(0, len(coords), 2):
+                coords[k] += dx
+                coords[k + 1] += dy
+
+    def scale(self, item, x_origin, y_origin, x_scale, y_scale):
+        for i in self._match(item):
+            coords = self.items[i][1]
+            for k in range(0, len(coords), 2):
+                coords[k] = x_origin + (coords[k] - x_origin) * x_scale
+                coords[k + 1] = y_origin + (coords[k + 1] - y_origin) * y_scale
+
+    def delete(self, *items):
+        for item in items:
+            for i in self._match(item):
+                del self.items[i]
+                self.order.remove(i)
+
+    def _item_bbox(self, entry):
+        kind, coords, options, _ = entry
+        if kind == 'text':
+            size = options.get('font', ("Consolas", 10))[1]
+            lines = str(options.get('text', "")).split("\n")
+            w = max(len(line) for line in lines) * size * _CHAR_WIDTH
+            h = len(lines) * size * _LINE_HEIGHT
+            x, y = coords[:2]
+            anchor = options.get('anchor', "center")
+            if anchor == "center":
+                anchor = ""
+            x0 = x if "w" in anchor else x - w if "e" in anchor else x - w / 2
+            y0 = y if "n" in anchor else y - h if "s" in anchor else y - h / 2
+            return x0, y0, x0 + w, y0 + h
+        if kind == 'image':
+            # PIL images have width/height attributes, PhotoImages have methods
+            image = options.get('image')
+            w, h = (getattr(image, name, 0) for name in ('width', 'height'))
+            w, h = (w() if callable(w) else w), (h() if callable(h) else h)
+            x, y = coords[:2]
+            if options.get('anchor', "center") == "center":
+                x, y = x - w / 2, y - h / 2
+            return x, y, x + w, y + h
+        xs, ys = coords[0::2], coords[1::2]
+        pad = float(options.get('width', 1)) / 2
+        return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+    def bbox(self, *items):
+        boxes = [self._item_bbox(self.items[i]) for item in items for i in self._match(item)
+                 if self.items[i][2].get('state') != "hidden"]
+        if not boxes:
+            return None
+        return (int(min(b[0] for b in boxes)), int(min(b[1] for b in boxes)),
+                int(max(b[2] for b in boxes)) + 1, int(max(b[3] for b in boxes)) + 1)
+
+    def tag_raise(self, item):
+        matches = self._match(item)
+        self.order = [i for i in self.order if i not in matches] + matches
+
+    def tag_lower(self, item):
+        matches = self._match(item)
+        self.order = matches + [i for i in self.order if i not in matches]
+
+    def find_withtag(self, item):
+        return tuple(self._match(item))
+
+    def visible_items(self):
+        """(kind, coords, options) for every shown item, bottom to top"""
+        for i in self.order:
+            kind, coords, options, _ = self.items[i]
+            if options.get('state') != "hidden":
+                yield kind, coords, options
+
+
+class PILBackend(RetainedBackend):
+    """Retained items rasterized with PIL on demand; `image` options must be PIL images"""
+
+    def __init__(self, width=CANVAS['width'], height=CANVAS['height'], background="white"):
+        super().__init__(width, height)
+        self.background = background
+
+    def render(self):
+        """Draw the current items into a new RGB image"""
+        image = Image.new("RGB", (self.width, self.height), self.background)
+        draw = ImageDraw.Draw(image)
+        for kind, coords, options in self.visible_items():
+            if kind == 'image':
+                tile = options.get('image')
+                if isinstance(tile, Image.Image):
+                    x, y = int(coords[0]), int(coords[1])
+                    if options.get('anchor', "center") == "center":
+                        x, y = x - tile.width // 2, y - tile.height // 2
+                    image.paste(tile, (x, y), tile if tile.mode == "RGBA" else None)
+            else:
+                draw_primitive(draw, kind, coords, options)
+        return image
+
+
+class RecordingBackend(RetainedBackend):
+    """Keeps the scene in memory and logs every call, for headless profiling
+
+    `counts` tallies calls per operation; `ops` holds them in order as
+    (name, args, options) when `keep_ops` is true. Queries (coords without new
+    values, bbox, find_withtag, itemcget) are counted like Tk round trips.
+    """
+
+    def __init__(self, width=CANVAS['width'], height=CANVAS['height'], keep_ops=True):
+        super().__init__(width, height)
+        self.keep_ops = keep_ops
+        self.counts = Counter()
+        self.ops = []
+
+    def _log(self, name, args, options=None):
+        self.counts[name] += 1
+        if self.keep_ops:
+            self.ops.append((name, args, options or {}))
+
+    def reset_counts(self):
+        self.counts.clear()
+        self.ops.clear()
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def _create(self, kind, coords, options):
+        self._log(f"create_{kind}", coords, options)
+        return super()._create(kind, coords, options)
+
+    def coords(self, item, *coords):
+        self._log("coords", (item,) + coords)
+        return super().coords(item, *coords)
+
+    def insert(self, item, index, coords):
+        self._log("insert", (item, index, tuple(coords)))
+        super().insert(item, index, coords)
+
+    def dchars(self, item, first, last=None):
+        self._log("dchars", (item, first, last))
+        super().dchars(item, first, last)
+
+    def itemconfigure(self, item, option=None, **options):
+        self._log("itemconfigure", (item,) if option is None else (item, option), options)
+        return super().itemconfigure(item, option, **options)
+
+    def itemcget(self, item, option):
+        self._log("itemcget", (item, option))
+        return super().itemcget(item, option)
+
+    def move(self, item, dx, dy):
+        self._log("move", (item, dx, dy))
+        super().move(item, dx, dy)
+
+    def scale(self, item, x_origin, y_origin, x_scale, y_scale):
+        self._log("scale", (item, x_origin, y_origin, x_scale, y_scale))
+        super().scale(item, x_origin, y_origin, x_scale, y_scale)
+
+    def delete(self, *items):
+        self._log("delete", items)
+        super().delete(*items)
+
+    def bbox(self, *items):
+        self._log("bbox", items)
+        return super().bbox(*items)
+
+    def tag_raise(self, item):
+        self._log("tag_raise", (item,))
+        super().tag_raise(item)
+
+    def tag_lower(self, item):
+        self._log("tag_lower", (item,))
+        super().tag_lower(item)
+
+    def find_withtag(self, item):
+        self._log("find_withtag", (item,))
+        return super().find_withtag(item)
+
+    def serialize(self):
+        """JSON text of the op counts and, if kept, the ordered op log"""
+        ops = [[name, [_plain(a) for a in args], {k: _plain(v) for k, v in options.items()}]
+               for name, args, options in self.ops]
+        return json.dumps({'counts': dict(self.counts), 'total': self.total, 'ops': ops}, ensure_ascii=False)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.serialize())
+
+
+def _plain(value):
+    """JSON-safe form of an op argument (images and other objects become their repr)"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return repr(value)
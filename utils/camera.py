@@ -0,0 +1,92 @@
+"""
+World-to-screen camera for ForceQuest scenes
+World coordinates are meters with y up and the origin at the object's start;
+screen coordinates are canvas pixels with y down.
+"""
+from config import PIXELS_PER_METER, MIN_PIXELS_PER_METER
+
+
+class Camera:
+    """Maps world meters to canvas pixels, zooming out and following the object
+
+    `anchor` is where the world origin sits on screen when the camera is at
+    rest, i.e. where the object starts. `margin` keeps the object's sprite,
+    which does not scale, clear of the canvas edges. `x`, `y` is the world point currently
+    shown at the anchor and `scale` is pixels per meter.
+    """
+
+    def __init__(self, width, height, scale=PIXELS_PER_METER, min_scale=MIN_PIXELS_PER_METER, margin=80):
+        self.width = width
+        self.height = height
+        self.native_scale = scale
+        self.min_scale = min_scale
+        self.margin = margin
+        self.anchor = (0.0, 0.0)
+        self.reset()
+
+    def reset(self, anchor=None):
+        """Native zoom, no scroll; optionally move the anchor"""
+        if anchor is not None:
+            self.anchor = anchor
+        self.x = self.y = 0.0
+        self.scale = self.native_scale
+
+    def to_screen(self, wx, wy):
+        ax, ay = self.anchor
+        return ax + (wx - self.x) * self.scale, ay - (wy - self.y) * self.scale
+
+    def to_world(self, sx, sy):
+        ax, ay = self.anchor
+        return self.x + (sx - ax) / self.scale, self.y - (sy - ay) / self.scale
+
+    def reproject(self, coords):
+        """Screen coords drawn for the resting camera, moved to the current view"""
+        ax, ay = self.anchor
+        k = self.scale / self.native_scale
+        offset_x = -self.x * self.scale
+        offset_y = self.y * self.scale
+        out = list(coords)
+        for i in range(0, len(out), 2):
+            out[i] = ax + (out[i] - ax) * k + offset_x
+            out[i + 1] = ay + (out[i + 1] - ay) * k + offset_y
+        return out
+
+    def fit(self, x_end, y_end):
+        """Auto-zoom so a path from the origin to (x_end, y_end) fits, down to min_scale"""
+        ax, ay = self.anchor
+        scale = self.native_scale
+        room_right = self.width - self.margin - ax
+        room_left = ax - self.margin
+        room_up = ay - self.margin
+        room_down = self.height - self.margin - ay
+        for extent, room_pos, room_neg in ((x_end, room_right, room_left), (y_end, room_up, room_down)):
+            room = room_pos if extent > 0 else room_neg
+            if abs(extent) * scale > room > 0:
+                scale = room / abs(extent)
+        self.scale = max(self.min_scale, min(scale, self.native_scale))
+
+    def follow(self, wx, wy):
+        """Scroll just enough to keep a world point inside the margins; True if the view moved"""
+        sx, sy = self.to_screen(wx, wy)
+        ax, ay = self.anchor
+        # The resting anchor always counts as inside, even when it sits in a margin
+        left, right = min(ax, self.margin), max(ax, self.width - self.margin)
+        top, bottom = min(ay, self.margin), max(ay, self.height - self.margin)
+        dx = dy = 0.0
+        if sx > right:
+            dx = sx - right
+        elif sx < left:
+            dx = sx - left
+        if sy < top:
+            dy = sy - top
+        elif sy > bottom:
+            dy = sy - bottom
+        if not dx and not dy:
+            return False
+        self.x += dx / self.scale
+        self.y -= dy / self.scale
+        return True
+
+    def scroll_offset(self, tile_width):
+        """Left edge (-tile_width, 0] of the first tile of a texture scrolled with the camera"""
+        return -((self.x * self.scale) % tile_width)
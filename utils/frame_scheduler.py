@@ -0,0 +1,130 @@
+"""
+Frame scheduler for ForceQuest animations
+Fixed-timestep simulation loop driven by `after` on the Tk main thread
+"""
+import contextlib
+import time
+from config import ANIMATION_DELAY
+
+
+class FrameScheduler:
+    """Runs simulation steps at a fixed timestep and renders on Tk's main loop
+
+    Every tick the real time elapsed (scaled by `speed()`) is added to an
+    accumulator and as many `step()` calls as fit are made, so the simulation
+    catches up after a slow frame instead of drifting. When a frame overruns
+    its budget the next render is skipped (at most `max_skipped_renders` in a
+    row) to let the simulation recover. `speed` is read every tick, so speed
+    changes take effect mid-run.
+
+    step() advances one fixed timestep and returns False once finished.
+    render() draws the current state.
+    An optional FrameProfiler gets one frame per tick with the step loop
+    timed as its 'simulate' phase.
+    """
+
+    def __init__(self, widget, step, render, dt=ANIMATION_DELAY, speed=None,
+                 frame_interval=ANIMATION_DELAY, max_steps_per_frame=10,
+                 max_skipped_renders=3, on_finish=None, profiler=None):
+        self.widget = widget
+        self.step = step
+        self.render = render
+        self.dt = dt
+        self.speed = speed or (lambda: 1.0)
+        self.frame_interval = frame_interval
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_skipped_renders = max_skipped_renders
+        self.on_finish = on_finish
+        self.profiler = profiler
+
+        self.running = False
+        self.after_id = None
+        self.accumulator = 0.0
+        self.last_time = 0.0
+        self.next_frame = 0.0
+        self.skipped_in_row = 0
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self.steps_taken = 0
+
+    def start(self):
+        """Begin ticking on the main loop"""
+        if self.running:
+            return
+        self.running = True
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+        self.next_frame = self.last_time + self.frame_interval
+        self.after_id = self.widget.after(int(self.frame_interval * 1000), self._tick)
+
+    def stop(self):
+        """Stop without calling on_finish"""
+        self.running = False
+        if self.profiler:
+            self.profiler.stop()
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def _tick(self):
+        self.after_id = None
+        if not self.running:
+            return
+
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+        self.accumulator += elapsed * self.speed()
+
+        profiler = self.profiler
+        if profiler:
+            profiler.begin_frame()
+        finished = False
+        steps = 0
+        with profiler.phase('simulate') if profiler else contextlib.nullcontext():
+            while self.accumulator >= self.dt and steps < self.max_steps_per_frame:
+                self.accumulator -= self.dt
+                steps += 1
+                if not self.step():
+                    finished = True
+                    break
+        self.steps_taken += steps
+
+        if steps == self.max_steps_per_frame:
+            # Too far behind to catch up: drop the backlog rather than spiral
+            self.accumulator = min(self.accumulator, self.dt)
+
+        if finished:
+            self.running = False
+            self.render()
+            self.frames_rendered += 1
+            if profiler:
+                profiler.end_frame()
+                profiler.stop()
+            if self.on_finish:
+                self.on_finish()
+            return
+
+        behind = elapsed > self.frame_interval * 1.5
+        if behind and self.skipped_in_row < self.max_skipped_renders:
+            self.skipped_in_row += 1
+            self.frames_skipped += 1
+            if profiler:
+                profiler.mark_dropped()
+        elif steps:
+            self.render()
+            self.skipped_in_row = 0
+            self.frames_rendered += 1
+        if profiler:
+            profiler.end_frame()
+
+        # Aim for evenly spaced frames; after a long stall restart the cadence
+        self.next_frame += self.frame_interval
+        now = time.perf_counter()
+        if self.next_frame < now:
+            self.next_frame = now + self.frame_interval
+        delay_ms = max(1, int((self.next_frame - now) * 1000))
+        self.after_id = self.widget.after(delay_ms, self._tick)
@@ -0,0 +1,151 @@
+"""
+Frame-time instrumentation for ForceQuest animations
+Records per-frame phase timings in a ring buffer and exports them to CSV/JSON
+"""
+import contextlib
+import csv
+import json
+import platform
+import time
+import numpy as np
+from config import ANIMATION_DELAY
+
+# Late frames arrive this many target intervals after the previous one
+LATE_FACTOR = 1.5
+
+
+class FrameProfiler:
+    """Per-frame timing broken down by phase, kept in a fixed-size ring buffer
+
+    The FrameScheduler opens and closes frames; render code wraps its work in
+    `with profiler.phase(name):`. Phases timed outside a frame (e.g. while
+    scrubbing) are ignored.
+    """
+
+    PHASES = ('simulate', 'graph', 'canvas_move', 'tk_update')
+    COLUMNS = ('interval',) + PHASES + ('total', 'dropped')
+
+    def __init__(self, capacity=4096, target_interval=ANIMATION_DELAY):
+        self.capacity = capacity
+        self.target_interval = target_interval
+        self.buffer = np.zeros((capacity, len(self.COLUMNS)))
+        self._column = {name: i for i, name in enumerate(self.COLUMNS)}
+        self._row = None
+        self._last_start = None
+        self.count = 0
+        # Seconds from pressing Run to the first drawn frame, set by the app
+        self.time_to_first_frame = None
+
+    def reset(self):
+        """Forget all recorded frames"""
+        self.count = 0
+        self.time_to_first_frame = None
+        self._row = None
+        self._last_start = None
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self._row = np.zeros(len(self.COLUMNS))
+        if self._last_start is not None:
+            self._row[0] = now - self._last_start
+        self._last_start = now
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Add the time spent in the block to `name` for the current frame"""
+        if self._row is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._row is not None:
+                self._row[self._column[name]] += time.perf_counter() - start
+
+    def mark_dropped(self):
+        """The current frame skipped its render"""
+        if self._row is not None:
+            self._row[self._column['dropped']] = 1.0
+
+    def end_frame(self):
+        if self._row is None:
+            return
+        row = self._row
+        row[self._column['total']] = row[1:1 + len(self.PHASES)].sum()
+        self.buffer[self.count % self.capacity] = row
+        self.count += 1
+        self._row = None
+
+    def stop(self):
+        """End of playback: the next frame starts a new interval"""
+        self._row = None
+        self._last_start = None
+
+    def last(self, name):
+        """Value of `name` in the most recently recorded frame (0 if none)"""
+        if not self.count:
+            return 0.0
+        return float(self.buffer[(self.count - 1) % self.capacity, self._column[name]])
+
+    def frames(self):
+        """Recorded rows, oldest first"""
+        if self.count <= self.capacity:
+            return self.buffer[:self.count].copy()
+        start = self.count % self.capacity
+        return np.concatenate([self.buffer[start:], self.buffer[:start]])
+
+    def summary(self):
+        """FPS, frame-time percentiles (ms), dropped/late counts and phase means"""
+        frames = self.frames()
+        intervals = frames[:, 0][frames[:, 0] > 0]
+        col = self._column
+        stats = {'frames': len(frames), 'target_fps': 1.0 / self.target_interval}
+        if len(intervals):
+            stats['fps'] = float(1.0 / intervals.mean())
+            stats['interval_p95_ms'] = float(np.percentile(intervals, 95) * 1000)
+            stats['interval_p99_ms'] = float(np.percentile(intervals, 99) * 1000)
+        else:
+            stats['fps'] = stats['interval_p95_ms'] = stats['interval_p99_ms'] = 0.0
+        if len(frames):
+            stats['work_p95_ms'] = float(np.percentile(frames[:, col['total']], 95) * 1000)
+            stats['work_p99_ms'] = float(np.percentile(frames[:, col['total']], 99) * 1000)
+        else:
+            stats['work_p95_ms'] = stats['work_p99_ms'] = 0.0
+        ttff = self.time_to_first_frame
+        stats['time_to_first_frame_ms'] = ttff * 1000 if ttff is not None else None
+        stats['dropped'] = int(frames[:, col['dropped']].sum())
+        stats['late'] = int((intervals > self.target_interval * LATE_FACTOR).sum())
+        for name in self.PHASES:
+            stats[f'{name}_mean_ms'] = float(frames[:, col[name]].mean() * 1000) if len(frames) else 0.0
+        return stats
+
+    def export_csv(self, path):
+        """One row per frame, times in milliseconds"""
+        frames = self.frames()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{name}_ms" if name != 'dropped' else name for name in self.COLUMNS])
+            for row in frames:
+                writer.writerow([f"{v * 1000:.4f}" for v in row[:-1]] + [int(row[-1])])
+
+    def export_json(self, path):
+        """Machine info, summary and per-frame rows (ms) for comparing machines"""
+        frames = self.frames()
+        data = {
+            'machine': {'node': platform.node(), 'platform': platform.platform(),
+                        'processor': platform.processor(), 'python': platform.python_version()},
+            'target_interval_ms': self.target_interval * 1000,
+            'summary': self.summary(),
+            'columns': list(self.COLUMNS),
+            'frames': [[round(v * 1000, 4) for v in row[:-1]] + [int(row[-1])] for row in frames],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def export(self, path):
+        """Export as JSON or CSV depending on the file extension"""
+        if path.lower().endswith(".json"):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
@@ -0,0 +1,194 @@
+"""
+Background job utilities for ForceQuest
+Runs slow work on a worker pool and delivers results on the Tk main loop
+"""
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation token has been triggered"""
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared between the UI and a worker"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation"""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    """Handle for a submitted job
+
+    The worker function receives the job as its first argument and may call
+    `job.report(fraction, message)` and `job.token.check()` while running.
+    """
+
+    def __init__(self, manager, job_id, name):
+        self.manager = manager
+        self.id = job_id
+        self.name = name
+        self.token = CancelToken()
+        self.future = None
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+
+    def report(self, fraction, message=""):
+        """Report progress from the worker thread (thread-safe)"""
+        self.manager._post(self, "progress", (fraction, message))
+
+    def cancel(self):
+        """Cancel the job; queued jobs never start, running jobs stop at the next check"""
+        self.token.cancel()
+        if self.future is not None and self.future.cancel():
+            self.manager._post(self, "cancelled", None)
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+
+class JobManager:
+    """Worker pool whose progress and results are marshalled onto the Tk thread
+
+    Workers never touch Tk. They push events onto a queue that the main loop
+    drains every `poll_ms` milliseconds via `root.after`; completion callbacks
+    and listeners therefore always run on the main thread. An exception from
+    one of them is reported and dropped, so it cannot stop the polling.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="forcequest-job")
+        self.jobs = {}
+        self.listeners = []
+        self._events = queue.Queue()
+        self._callbacks = {}
+        self._ids = itertools.count(1)
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Run `fn(job, *args, **kwargs)` on the pool and return the Job
+
+        `on_done(result)` / `on_error(exception)` are called on the Tk thread.
+        """
+        job = Job(self, next(self._ids), name)
+        self.jobs[job.id] = job
+        self._callbacks[job.id] = (on_done, on_error)
+        job.future = self.executor.submit(self._run, job, fn, args, kwargs)
+        self._notify(job)
+        return job
+
+    def cancel_all(self):
+        """Cancel every active job"""
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel outstanding work and stop polling"""
+        self.cancel_all()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def add_listener(self, callback):
+        """Register `callback(job)`, called on the Tk thread whenever a job changes"""
+        self.listeners.append(callback)
+
+    def _run(self, job, fn, args, kwargs):
+        """Worker-side wrapper translating outcomes into queue events"""
+        if job.token.cancelled:
+            self._post(job, "cancelled", None)
+            return
+        self._post(job, "running", None)
+        try:
+            result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            self._post(job, "cancelled", None)
+        except Exception as e:
+            self._post(job, "failed", e)
+        else:
+            if job.token.cancelled:
+                self._post(job, "cancelled", None)
+            else:
+                self._post(job, "done", result)
+
+    def _post(self, job, kind, payload):
+        self._events.put((job, kind, payload))
+
+    def _poll(self):
+        """Drain worker events on the Tk thread"""
+        changed = {}
+        try:
+            while True:
+                job, kind, payload = self._events.get_nowait()
+                self._apply(job, kind, payload)
+                changed[job.id] = job
+        except queue.Empty:
+            pass
+
+        # Listeners see each job once per poll, however many progress events arrived
+        for job in changed.values():
+            self._notify(job)
+            if not job.active:
+                self.jobs.pop(job.id, None)
+
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _apply(self, job, kind, payload):
+        """Update job state and fire completion callbacks"""
+        if not job.active:
+            return
+        if kind == "progress":
+            job.progress, job.message = payload
+            return
+        if kind == "running":
+            job.status = "running"
+            return
+
+        on_done, on_error = self._callbacks.pop(job.id, (None, None))
+        job.status = kind
+        if kind == "done":
+            job.progress = 1.0
+            job.result = payload
+            if on_done:
+                self._call(job, on_done, payload)
+        elif kind == "failed":
+            job.error = payload
+            if on_error:
+                self._call(job, on_error, payload)
+            else:
+                print(f"⚠ Job '{job.name}' failed: {payload}")
+
+    def _notify(self, job):
+        for callback in self.listeners:
+            self._call(job, callback, job)
+
+    @staticmethod
+    def _call(job, callback, arg):
+        """Run a callback on the Tk thread, reporting instead of raising its errors"""
+        try:
+            callback(arg)
+        except Exception as e:
+            print(f"⚠ Callback for job '{job.name}' failed: {e}")
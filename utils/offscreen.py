@@ -0,0 +1,97 @@
+"""
+Offscreen rendering for ForceQuest scenes
+Draws SimulationCanvas layouts with PIL so no display is needed
+"""
+import functools
+import math
+import unicodedata
+from PIL import Image, ImageDraw, ImageFont
+from config import CANVAS
+
+# Tk font sizes are points; PIL sizes are pixels
+POINTS_TO_PIXELS = 96 / 72
+ARROW_LENGTH = 10
+ARROW_HALF_WIDTH = 5
+
+
+@functools.lru_cache(maxsize=16)
+def load_font(size):
+    """PIL font for a Tk point size, cached per process"""
+    pixels = max(int(round(size * POINTS_TO_PIXELS)), 6)
+    for name in ("DejaVuSansMono-Bold.ttf", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(name, pixels)
+        except OSError:
+            continue
+    return ImageFont.load_default(pixels)
+
+
+def plain_text(text):
+    """Drop emoji and variation selectors that PIL fonts cannot draw"""
+    kept = (c for c in text if ord(c) < 0x2000 or unicodedata.category(c) not in ("So", "Mn"))
+    return "".join(kept).strip()
+
+
+def _color(value):
+    return value or None
+
+
+def _text_anchor(anchor):
+    """PIL anchor for a Tk text anchor (center, n, sw, ...)"""
+    if anchor == "center":
+        return "mm"
+    horizontal = "l" if "w" in anchor else "r" if "e" in anchor else "m"
+    vertical = "a" if "n" in anchor else "d" if "s" in anchor else "m"
+    return horizontal + vertical
+
+
+def draw_primitive(draw, kind, coords, options):
+    """Draw one (kind, coords, options) layout primitive"""
+    fill = _color(options.get('fill'))
+    outline = _color(options.get('outline'))
+    width = int(options.get('width', 1))
+    if kind == 'rectangle':
+        draw.rectangle(coords, fill=fill, outline=outline, width=width)
+    elif kind == 'oval':
+        draw.ellipse(coords, fill=fill, outline=outline, width=width)
+    elif kind == 'polygon':
+        points = list(zip(coords[::2], coords[1::2]))
+        draw.polygon(points, fill=fill, outline=outline, width=width)
+    elif kind == 'line':
+        draw.line(coords, fill=fill or "black", width=width)
+        if options.get('arrow') == 'last':
+            _draw_arrowhead(draw, coords[-4:], fill or "black")
+    elif kind == 'text':
+        font = options.get('font', ("Consolas", 10))
+        draw.text(coords, plain_text(options.get('text', "")), fill=fill or "black",
+                  font=load_font(font[1]), anchor=_text_anchor(options.get('anchor', "center")))
+
+
+def _draw_arrowhead(draw, segment, fill):
+    """Filled triangle at the end of a line segment, like Tk's arrow=LAST"""
+    x1, y1, x2, y2 = segment
+    angle = math.atan2(y2 - y1, x2 - x1)
+    back_x = x2 - ARROW_LENGTH * math.cos(angle)
+    back_y = y2 - ARROW_LENGTH * math.sin(angle)
+    off_x = ARROW_HALF_WIDTH * math.sin(angle)
+    off_y = -ARROW_HALF_WIDTH * math.cos(angle)
+    draw.polygon([(x2, y2), (back_x + off_x, back_y + off_y), (back_x - off_x, back_y - off_y)], fill=fill)
+
+
+def render_layout(items, width=CANVAS['width'], height=CANVAS['height'], background="white"):
+    """Render layout primitives into a new RGB image"""
+    image = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(image)
+    for kind, coords, options in items:
+        draw_primitive(draw, kind, coords, options)
+    return image
+
+
+def render_scene(params, scale=1.0):
+    """Render the SimulationCanvas start-of-run scene for params"""
+    from ui_components.simulation_canvas import scene_layout
+    image = render_layout(scene_layout(params))
+    if scale != 1.0:
+        size = (int(CANVAS['width'] * scale), int(CANVAS['height'] * scale))
+        image = image.resize(size, Image.LANCZOS)
+    return image
@@ -1,46 +1,86 @@
 """
 Plotting utilities for energy graphs
+Figures are built on matplotlib.figure.Figure rather than pyplot, so they are
+owned by the widget embedding them and never pile up in pyplot's registry.
 """
-import numpy as np
-import matplotlib.pyplot as plt
-from tkinter import messagebox
-
-
-class GraphGenerator:
-    """Generates matplotlib graphs for physics data"""
-    
-    @staticmethod
-    def show_energy_graph(physics_results, params):
-        """Display Work and Kinetic Energy vs Distance graph"""
-        try:
-            if not physics_results or not physics_results.get('moves'):
-                messagebox.showerror("Error", "Run a successful simulation first!")
-                return
-            
-            d = params['d']
-            F_req = physics_results['F_req']
-            F = params['F']
-            
-            # Calculate net force
-            net_force = F - F_req
-            
-            # Generate data
-            x = np.linspace(0, d, 50)
-            work = net_force * x
-            ke = work  # W_net = ΔKE
-            
-            # Create plot
-            plt.figure(figsize=(10, 6))
-            plt.plot(x, work, 'b-', linewidth=2, label='Net Work (W_net)')
-            plt.plot(x, ke, 'r--', linewidth=2, label='Kinetic Energy (ΔKE)')
-            plt.title('Energy vs Distance (Work-Energy Theorem)', 
-                     fontsize=14, fontweight='bold')
-            plt.xlabel('Distance (m)', fontsize=12)
-            plt.ylabel('Energy (J)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.legend()
-            plt.tight_layout()
-            plt.show()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not generate graph: {str(e)}")
\ No newline at end of file
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from utils.telemetry import downsample
+
+
+class EnergyFigure:
+    """Work and kinetic energy against distance (or time) on one Figure embedded in Tk
+
+    The figure, axes and lines are made once and reused. A change of axis
+    range or label redraws the whole figure and caches its background without
+    the lines; new data then only restores that background, draws the two
+    lines and blits the axes area, so updates during playback stay cheap.
+    Like the live graph, each line is reduced with LTTB to a few points per
+    pixel of the axes before it is drawn.
+    """
+
+    def __init__(self, master, figsize=(7, 3), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot()
+        self.work_line, = self.ax.plot([], [], 'b-', linewidth=2, label='Net Work (W_net)', animated=True)
+        self.ke_line, = self.ax.plot([], [], 'r--', linewidth=2, label='Kinetic Energy (ΔKE)', animated=True)
+        self.x_axis = None
+        self.set_x_axis('Distance', 'Distance (m)')
+        self.ax.set_ylabel('Energy (J)')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.legend(loc='upper left')
+        self.figure.tight_layout()
+        self.limits = None
+        self.background = None
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        # Every full draw (including Tk resizes) refreshes the cached background
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def get_widget(self):
+        return self.canvas.get_tk_widget()
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        self.ax.draw_artist(self.work_line)
+        self.ax.draw_artist(self.ke_line)
+
+    def set_x_axis(self, name, label):
+        """Title and label for the quantity on the x axis; takes effect with the next full redraw"""
+        if (name, label) == self.x_axis:
+            return
+        self.x_axis = (name, label)
+        self.ax.set_title(f'Energy vs {name} (Work-Energy Theorem)', fontsize=11, fontweight='bold')
+        self.ax.set_xlabel(label)
+        self.limits = None
+
+    def set_range(self, x_max, y_max):
+        """Axis maxima; a full redraw only if they changed"""
+        if (x_max, y_max) == self.limits:
+            return
+        self.limits = (x_max, y_max)
+        self.ax.set_xlim(0, x_max)
+        self.ax.set_ylim(0, y_max)
+        self.canvas.draw()
+
+    def set_data(self, x, work, ke):
+        """Show new curves by blitting over the cached background"""
+        width = self.ax.bbox.width
+        self.work_line.set_data(*downsample(x, work, width))
+        self.ke_line.set_data(*downsample(x, ke, width))
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+        self.canvas.blit(self.ax.bbox)
+
+    def close(self):
+        """Destroy the widget and release the figure"""
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self.canvas.get_tk_widget().destroy()
+        self.figure.clear()
+        self.background = None
@@ -0,0 +1,70 @@
+"""
+Adaptive rendering quality for ForceQuest animations
+Steps visual fidelity down when frames cost too much and back up when they don't
+"""
+from config import ANIMATION_DELAY, QUALITY_LEVELS
+
+
+class QualityController:
+    """Chooses a QUALITY_LEVELS entry from measured per-frame cost
+
+    `update(cost)` takes the work time of the last frame in seconds. The cost
+    is smoothed; after `down_after` consecutive frames above `high` × budget
+    the level drops one step, and after `up_after` frames below `low` × budget
+    it rises one step. Stepping up waits longer so the level doesn't flap.
+    """
+
+    def __init__(self, budget=ANIMATION_DELAY, levels=QUALITY_LEVELS, on_change=None,
+                 high=0.75, low=0.35, down_after=10, up_after=90, smoothing=0.2):
+        self.budget = budget
+        self.levels = levels
+        self.on_change = on_change
+        self.high = high
+        self.low = low
+        self.down_after = down_after
+        self.up_after = up_after
+        self.smoothing = smoothing
+        self.enabled = True
+        self.level = 0
+        self.cost = 0.0
+        self._over = 0
+        self._under = 0
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def set_level(self, level):
+        """Jump to a level and notify on_change if it differs"""
+        level = max(0, min(level, len(self.levels) - 1))
+        self._over = self._under = 0
+        if level != self.level:
+            self.level = level
+            if self.on_change:
+                self.on_change(self.settings)
+
+    def set_enabled(self, enabled):
+        """Turning adaptation off restores full quality"""
+        self.enabled = enabled
+        if not enabled:
+            self.set_level(0)
+
+    def update(self, cost):
+        """Feed one frame's cost (seconds); may change the level"""
+        if not self.enabled:
+            return
+        self.cost += self.smoothing * (cost - self.cost)
+        if self.cost > self.high * self.budget:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.down_after and self.level < len(self.levels) - 1:
+                self.set_level(self.level + 1)
+                # Give the cheaper level a fresh measurement window
+                self.cost = self.low * self.budget
+        elif self.cost < self.low * self.budget:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.up_after and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self._over = self._under = 0
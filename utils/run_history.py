@@ -0,0 +1,91 @@
+"""
+Compact history of previous runs for ForceQuest
+Keeps recent trajectories as zlib-compressed float32 deltas under a byte
+budget, evicting the least recently used runs first.
+"""
+import itertools
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from config import RUN_HISTORY_BUDGET, RUN_HISTORY_POINTS
+
+# Trajectory arrays kept per run
+HISTORY_FIELDS = ('t', 's', 'x', 'y', 'ke', 'work')
+
+
+def encode_array(values):
+    """float32 first value + successive differences, zlib-compressed"""
+    values = np.asarray(values, dtype=np.float64)
+    deltas = np.empty(len(values), dtype=np.float32)
+    if len(values):
+        deltas[0] = values[0]
+        deltas[1:] = np.diff(values)
+    return zlib.compress(deltas.tobytes(), 6)
+
+
+def decode_array(blob):
+    """Inverse of encode_array (the running sum is taken in float64)"""
+    deltas = np.frombuffer(zlib.decompress(blob), dtype=np.float32)
+    return np.cumsum(deltas, dtype=np.float64)
+
+
+class RunRecord:
+    """One stored run: params, a label and its encoded, downsampled arrays"""
+
+    def __init__(self, key, label, params, trajectory, points=RUN_HISTORY_POINTS):
+        self.key = key
+        self.label = label
+        self.params = dict(params)
+        n = len(trajectory)
+        index = np.unique(np.linspace(0, n - 1, min(n, points)).astype(int))
+        self.length = len(index)
+        self._blobs = {name: encode_array(getattr(trajectory, name)[index]) for name in HISTORY_FIELDS}
+
+    @property
+    def nbytes(self):
+        return sum(len(blob) for blob in self._blobs.values())
+
+    def field(self, name):
+        return decode_array(self._blobs[name])
+
+
+class RunHistory:
+    """Most recent runs within `budget` bytes (and at most `max_runs`), LRU-evicted"""
+
+    def __init__(self, budget=RUN_HISTORY_BUDGET, max_runs=None):
+        self.budget = budget
+        self.max_runs = max_runs
+        self._records = OrderedDict()  # key -> RunRecord, least recently used first
+        self._keys = itertools.count(1)
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, label, params, trajectory):
+        """Store a run and evict old ones to stay within budget; returns its record"""
+        record = RunRecord(next(self._keys), label, params, trajectory)
+        self._records[record.key] = record
+        self.nbytes += record.nbytes
+        while len(self._records) > 1 and (self.nbytes > self.budget or
+                                          (self.max_runs and len(self._records) > self.max_runs)):
+            _, old = self._records.popitem(last=False)
+            self.nbytes -= old.nbytes
+        return record
+
+    def get(self, key):
+        """A record by key, marking it recently used"""
+        record = self._records.get(key)
+        if record is not None:
+            self._records.move_to_end(key)
+        return record
+
+    def records(self, match=None, limit=None):
+        """Records oldest first, optionally filtered by `match(record)` and capped to the newest `limit`"""
+        records = [r for r in self._records.values() if match is None or match(r)]
+        return records[-limit:] if limit else records
+
+    def clear(self):
+        self._records.clear()
+        self.nbytes = 0
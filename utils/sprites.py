@@ -0,0 +1,131 @@
+"""
+Rotating sprites for rolling objects
+Cylinders and spheres roll without slipping, so their angle is the distance
+travelled over the radius. Each (shape, colour, size) is pre-rendered with
+PIL at every SPRITE_ANGLE_STEP and cached, so turning the object during
+playback is one image swap on an existing canvas item.
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+from config import PIXELS_PER_METER, SPRITE_ANGLE_STEP, SPRITE_CACHE_SIZE
+
+ROLLING_SHAPES = ("Cylinder", "Sphere")
+OBJECT_SIZE = 50  # pixels at native scale, as drawn by object_layout
+OBJECT_RADIUS = OBJECT_SIZE / 2 / PIXELS_PER_METER  # meters
+SUPERSAMPLE = 3
+
+# Degrees after which a shape's markings repeat (three spokes on a cylinder end)
+MARKING_PERIOD = {"Cylinder": 120, "Sphere": 360}
+
+
+def is_rolling(params):
+    """Cylinders and spheres roll along surfaces; lifted objects just rise"""
+    return params['shape'] in ROLLING_SHAPES and params['scenario'] != "Lifting Object"
+
+
+def _shade(color, factor):
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return tuple(int(c * factor) for c in (r, g, b)) + (255,)
+
+
+def _markings(shape, color, d):
+    """The part of the sprite that turns: spokes for a cylinder end, a band and spot for a sphere"""
+    layer = Image.new("RGBA", (d, d), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    c, r = d / 2, d / 2
+    dark = _shade(color, 0.55)
+    if shape == "Cylinder":
+        for k in range(3):
+            a = math.radians(90 + 120 * k)
+            draw.line((c, c, c + 0.82 * r * math.cos(a), c - 0.82 * r * math.sin(a)), fill=dark, width=d // 12)
+        draw.ellipse((c - 0.2 * r, c - 0.2 * r, c + 0.2 * r, c + 0.2 * r), fill=dark)
+    else:
+        draw.line((c - r, c, c + r, c), fill=dark, width=d // 10)
+        draw.ellipse((c - 0.2 * r, c - 0.7 * r, c + 0.2 * r, c - 0.3 * r), fill=dark)
+    return layer
+
+
+def render_frames(shape, color, size, step=SPRITE_ANGLE_STEP):
+    """PIL frames of a rolling object, turned clockwise by `step` degrees each
+
+    The disk, outline and highlight stay put; only the markings are rotated.
+    """
+    d = size * SUPERSAMPLE
+    outline = d // 25
+    base = Image.new("RGBA", (d, d), (0, 0, 0, 0))
+    ImageDraw.Draw(base).ellipse((0, 0, d - 1, d - 1), fill=_shade(color, 1.0))
+    top = Image.new("RGBA", (d, d), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(top)
+    if shape == "Sphere":
+        draw.ellipse((d * 0.22, d * 0.15, d * 0.45, d * 0.32), fill=(255, 255, 255, 110))
+    else:
+        draw.ellipse((d * 0.08, d * 0.08, d * 0.92, d * 0.92), outline=_shade(color, 0.8), width=outline)
+    draw.ellipse((0, 0, d - 1, d - 1), outline=(0, 0, 0, 255), width=outline)
+
+    markings = _markings(shape, color, d)
+    frames = []
+    for k in range(MARKING_PERIOD[shape] // step):
+        image = Image.alpha_composite(base, markings.rotate(-k * step, resample=Image.BICUBIC))
+        frames.append(Image.alpha_composite(image, top).resize((size, size), Image.BOX))
+    return frames
+
+
+def roll_frames(trajectory, count, step=SPRITE_ANGLE_STEP, radius=OBJECT_RADIUS):
+    """Frame number for every trajectory sample (angle = distance / radius)"""
+    angle = np.degrees(trajectory.s / radius)
+    return (np.rint(angle / step).astype(int) % count).tolist()
+
+
+class SpriteCache:
+    """Pre-rendered rotation frames per (shape, colour, size), least recently used evicted
+
+    `wrap` turns each PIL frame into what the canvas draws (ImageTk.PhotoImage
+    for Tk).
+    """
+
+    def __init__(self, wrap=None, step=SPRITE_ANGLE_STEP, max_sets=SPRITE_CACHE_SIZE):
+        self.wrap = wrap or (lambda image: image)
+        self.step = step
+        self.max_sets = max_sets
+        self._sets = OrderedDict()
+
+    def frames(self, shape, color, size):
+        key = (shape, color, size)
+        if key in self._sets:
+            self._sets.move_to_end(key)
+        else:
+            self._sets[key] = [self.wrap(f) for f in render_frames(shape, color, size, self.step)]
+            while len(self._sets) > self.max_sets:
+                self._sets.popitem(last=False)
+        return self._sets[key]
+
+
+class RollingSprite:
+    """An image item that turns with the trajectory by swapping cached frames"""
+
+    def __init__(self, cache, shape, color, size):
+        self.cache = cache
+        self.shape = shape
+        self.color = color
+        self.frames = cache.frames(shape, color, size)
+        self.item = None
+        self.angles = []
+        self.shown = 0
+
+    def load(self, trajectory):
+        self.angles = roll_frames(trajectory, len(self.frames), self.cache.step)
+
+    def show(self, canvas, index):
+        """Show the frame for trajectory sample `index` (no call if it is already shown)"""
+        frame = self.angles[index] if self.angles else 0
+        if frame != self.shown:
+            canvas.itemconfigure(self.item, image=self.frames[frame])
+            self.shown = frame
+
+    def resize(self, canvas, size):
+        """Switch to frames of another pixel size, keeping the current angle"""
+        self.frames = self.cache.frames(self.shape, self.color, size)
+        canvas.itemconfigure(self.item, image=self.frames[self.shown])
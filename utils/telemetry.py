@@ -0,0 +1,164 @@
+"""
+Run telemetry for ForceQuest
+Per-sample channels of a run are kept in a preallocated NumPy ring buffer of
+fixed capacity, so memory stays flat however long a run lasts. Graphs draw
+them through Largest-Triangle-Three-Buckets downsampling, which caps the
+points handed to the canvas at a few per pixel while keeping peaks and
+turns that plain decimation would drop.
+"""
+import numpy as np
+from config import TELEMETRY_CAPACITY, GRAPH_POINTS_PER_PIXEL, GRAVITY
+from trajectory import force_components
+
+# Distance along the path is `s`, as in Trajectory (`x` there is horizontal)
+CHANNELS = ('t', 's', 'v', 'a', 'work', 'ke', 'power', 'pe')
+
+
+def trajectory_channels(trajectory, net_force):
+    """Telemetry channel arrays for a whole trajectory, computed once per run
+
+    Acceleration is the rate of change of velocity; power is the net force
+    (the Fnet magnitudes of force_components) times the velocity at each
+    sample; potential energy is m·g·h from the height above the start.
+    """
+    if len(trajectory) > 1:
+        a = np.gradient(trajectory.v, trajectory.t)
+    else:
+        a = np.zeros(len(trajectory))
+    power = net_force * trajectory.v
+    pe = trajectory.params['m'] * GRAVITY * trajectory.y
+    return {'t': trajectory.t, 's': trajectory.s, 'v': trajectory.v, 'a': a,
+            'work': trajectory.work, 'ke': trajectory.ke, 'power': power, 'pe': pe}
+
+
+def run_channels(results, trajectory):
+    """trajectory_channels plus the applied force F and the friction at each sample"""
+    forces = force_components(results, trajectory)
+    channels = trajectory_channels(trajectory, forces['Fnet'][0])
+    channels['F'] = forces['F'][0]
+    channels['friction'] = forces['Ff'][0]
+    return channels
+
+
+def channel_extents(channels):
+    """(min, max) of every non-empty channel array"""
+    return {name: (float(np.min(values)), float(np.max(values)))
+            for name, values in channels.items() if len(values)}
+
+
+def lttb(x, y, threshold):
+    """Indices of `threshold` points of (x, y) chosen by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The points in between are
+    split into threshold - 2 buckets, and each bucket keeps the point that
+    makes the largest triangle with the point kept before it and the
+    average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)  # bucket i is edges[i]:edges[i + 1]
+    sums_x = np.concatenate(([0.0], np.cumsum(x)))
+    sums_y = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = edges[1:] - edges[:-1]
+    # Average of the bucket after each one; the last bucket looks at the last point
+    next_x = np.append(((sums_x[edges[1:]] - sums_x[edges[:-1]]) / sizes)[1:], x[-1])
+    next_y = np.append(((sums_y[edges[1:]] - sums_y[edges[:-1]]) / sizes)[1:], y[-1])
+
+    picked = np.empty(threshold, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def downsample(x, y, width, per_pixel=GRAPH_POINTS_PER_PIXEL):
+    """(x, y) reduced with LTTB to at most `per_pixel` points per pixel of `width`"""
+    index = lttb(x, y, max(3, int(width * per_pixel)))
+    return np.asarray(x)[index], np.asarray(y)[index]
+
+
+class TelemetryBuffer:
+    """Fixed-capacity ring buffer of telemetry samples, one float64 row per channel
+
+    Once full, each new sample overwrites the oldest. `total` counts the
+    samples recorded in the run so far and `first` is the run index of the
+    oldest one still held, so readers can tell what is new since they last
+    looked. Channels missing from a sample are stored as NaN.
+    """
+
+    def __init__(self, capacity=TELEMETRY_CAPACITY, channels=CHANNELS):
+        self.capacity = capacity
+        self.channels = tuple(channels)
+        self.rows = {name: i for i, name in enumerate(self.channels)}
+        self.data = np.full((len(self.channels), capacity), np.nan)
+        self.total = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def first(self):
+        return self.total - self.size
+
+    def append(self, **values):
+        """Record one sample given as channel=value"""
+        self.data[:, self.total % self.capacity] = [values.get(name, np.nan) for name in self.channels]
+        self.total += 1
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, block):
+        """Record samples given as {channel: array}, all arrays the same length
+
+        Only the last `capacity` of them can be held; the rest are counted
+        but never stored.
+        """
+        count = len(next(iter(block.values())))
+        skip = max(0, count - self.capacity)
+        slots = (self.total + skip + np.arange(count - skip)) % self.capacity
+        for name in self.channels:
+            values = block.get(name)
+            self.data[self.rows[name], slots] = np.nan if values is None else values[skip:]
+        self.total += count
+        self.size = min(self.size + count, self.capacity)
+
+    def truncate(self, total):
+        """Forget the newest samples so that `total` have been recorded
+
+        If that goes back past the oldest sample held, the buffer is emptied
+        and restarts at `total`.
+        """
+        if total >= self.total:
+            return
+        self.size = max(0, self.size - (self.total - total))
+        self.total = total
+
+    def clear(self, start=0):
+        """Drop every sample; the next one recorded is run sample `start`"""
+        self.total = start
+        self.size = 0
+
+    def channel(self, name):
+        """All held samples of a channel, oldest first"""
+        return self.tail(name, self.size)
+
+    def tail(self, name, count):
+        """The newest `count` held samples of a channel, oldest first
+
+        This is a view into the buffer when the samples are contiguous, so
+        use it before recording more.
+        """
+        count = min(count, self.size)
+        row = self.data[self.rows[name]]
+        start = (self.total - count) % self.capacity
+        if start + count <= self.capacity:
+            return row[start:start + count]
+        return np.concatenate((row[start:], row[:start + count - self.capacity]))
@@ -0,0 +1,185 @@
+"""
+Streaming telemetry export for ForceQuest
+Per-step state of a run (time, distance, velocity, applied force, friction,
+work, kinetic energy, power) is written to CSV or .npz while the run plays.
+The caller only groups samples into blocks and offers them to a bounded
+queue; a writer thread does the disk I/O, flushing block by block into a
+temporary file next to the target. Once the run ends the file is moved into
+place with os.replace, so a half-written export never appears under its name.
+"""
+import os
+import queue
+import tempfile
+import threading
+
+import numpy as np
+from config import TELEMETRY_BLOCK_ROWS, TELEMETRY_QUEUE_BLOCKS, TELEMETRY_PENDING_BLOCKS
+from trajectory import compute_trajectory
+from utils.telemetry import run_channels
+
+# Distance along the path is `s`, as everywhere else in the telemetry
+EXPORT_CHANNELS = ('t', 's', 'v', 'F', 'friction', 'work', 'ke', 'power')
+POLL_SECONDS = 0.05
+
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp creates its file as 0600; an export gets the mode a plain open() would
+# give it. The umask can only be read by setting it, so that happens once, at import.
+FILE_MODE = 0o666 & ~_umask()
+
+
+class TelemetryWriter:
+    """Streams telemetry to `path` (.npz, otherwise CSV) from a background thread
+
+    `write` never waits on the disk or the queue: samples are grouped into
+    blocks of `block_rows`, and a block that finds the queue full stays with
+    the caller and is merged into the next one. If the disk stalls, at most
+    `pending_blocks` blocks' worth is kept back: older samples are dropped
+    and counted in `dropped` (None keeps everything). `close` hands over whatever
+    is left and returns at once; the thread then finalizes the file, and
+    `join` waits for that, re-raising any error from the thread. The thread
+    is not a daemon, so an export still finishes if the window closes.
+    """
+
+    def __init__(self, path, channels=EXPORT_CHANNELS, block_rows=TELEMETRY_BLOCK_ROWS,
+                 queue_blocks=TELEMETRY_QUEUE_BLOCKS, pending_blocks=TELEMETRY_PENDING_BLOCKS):
+        self.path = path
+        self.channels = tuple(channels)
+        self.block_rows = block_rows
+        self.max_pending = None if pending_blocks is None else pending_blocks * block_rows
+        self.rows = 0  # samples handed to the writer so far and not dropped
+        self.dropped = 0  # samples dropped because the disk fell behind
+        self.error = None
+        self._pending = []  # blocks kept back from the queue, oldest first
+        self._pending_rows = 0
+        self._tail = None
+        self._queue = queue.Queue(maxsize=queue_blocks)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="forcequest-telemetry")
+        self._thread.start()
+
+    def write(self, block):
+        """Add samples given as {channel: array}, all arrays the same length"""
+        if self._closed.is_set():
+            raise ValueError("telemetry writer is closed")
+        if self.error is not None:
+            raise self.error
+        count = len(block[self.channels[0]])
+        if not count:
+            return
+        self._pending.append(np.column_stack([np.asarray(block[name], dtype=np.float64)
+                                              for name in self.channels]))
+        self._pending_rows += count
+        self.rows += count
+        if self._pending_rows >= self.block_rows:
+            self._hand_over()
+
+    def _take_pending(self):
+        block = self._pending[0] if len(self._pending) == 1 else np.concatenate(self._pending)
+        self._pending = []
+        self._pending_rows = 0
+        return block
+
+    def _hand_over(self):
+        block = self._take_pending()
+        try:
+            self._queue.put_nowait(block)
+        except queue.Full:
+            # The disk is behind: keep the samples and offer them with the next block
+            excess = 0 if self.max_pending is None else len(block) - self.max_pending
+            if excess > 0:
+                # ...but not without bound: a stalled disk loses the oldest samples instead
+                block = block[excess:]
+                self.dropped += excess
+                self.rows -= excess
+            self._pending = [block]
+            self._pending_rows = len(block)
+
+    def close(self):
+        """Hand over the remaining samples; the thread finalizes the file"""
+        if self._closed.is_set():
+            return
+        if self._pending:
+            self._tail = self._take_pending()
+        self._closed.set()
+
+    def join(self, timeout=None):
+        """Wait for the file to be finalized and return the number of samples written"""
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.rows
+
+    def _run(self):
+        """Writer thread: drain blocks into a temporary file, then move it into place"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        as_npz = self.path.lower().endswith(".npz")
+        part = None
+        try:
+            fd, part = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                if not as_npz:
+                    f.write((",".join(self.channels) + "\n").encode("utf-8"))
+                for block in self._blocks():
+                    if as_npz:
+                        # Raw rows now; packed into the .npz once the run is complete
+                        block.tofile(f)
+                    else:
+                        np.savetxt(f, block, fmt="%.9g", delimiter=",")
+                    f.flush()
+            if as_npz:
+                self._pack_npz(part)
+            os.chmod(part, FILE_MODE)
+            os.replace(part, self.path)
+        except Exception as e:
+            self.error = e
+            if part is not None and os.path.exists(part):
+                os.remove(part)
+
+    def _blocks(self):
+        """Queued blocks in order until the writer is closed, then the tail"""
+        while True:
+            try:
+                yield self._queue.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                if self._closed.is_set():
+                    break
+        # Every put happened before close(), but may have landed after the last timeout
+        while True:
+            try:
+                yield self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._tail is not None:
+            yield self._tail
+
+    def _pack_npz(self, part):
+        """Rewrite the raw rows in `part` as an .npz with one array per channel"""
+        rows = np.fromfile(part, dtype=np.float64).reshape(-1, len(self.channels))
+        with open(part, "wb") as f:
+            np.savez(f, **{name: rows[:, i] for i, name in enumerate(self.channels)})
+
+
+def export_run(results, path, trajectory=None, **kwargs):
+    """Stream a whole run's telemetry to `path` without a display and return the sample count
+
+    The headless counterpart of live capture: the same writer, fed one block
+    at a time from the precomputed trajectory. The whole run is in memory
+    already, so nothing is dropped if the disk falls behind.
+    """
+    if trajectory is None:
+        trajectory = compute_trajectory(results)
+    channels = run_channels(results, trajectory)
+    kwargs.setdefault('pending_blocks', None)
+    writer = TelemetryWriter(path, **kwargs)
+    try:
+        for start in range(0, len(trajectory), writer.block_rows):
+            writer.write({name: channels[name][start:start + writer.block_rows] for name in writer.channels})
+    finally:
+        writer.close()
+    return writer.join()
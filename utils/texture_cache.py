@@ -0,0 +1,84 @@
+"""
+Size-bucketed texture cache for ForceQuest
+Surface textures are resized to the canvas width rounded up to a bucket, so
+nearby sizes share one variant. A quick draft can be made while the window is
+being dragged and replaced by a high-quality resize once it settles; variants
+are evicted least recently used first, keyed by (surface, bucket).
+"""
+import math
+from collections import OrderedDict
+
+from PIL import Image
+from config import CANVAS, TEXTURE_BUCKET, TEXTURE_CACHE_SIZE
+
+FAST_RESAMPLE = Image.NEAREST
+HIGH_QUALITY_RESAMPLE = Image.LANCZOS
+
+
+def bucket_width(width, step=TEXTURE_BUCKET):
+    """Smallest bucket at least `width` pixels wide"""
+    return max(step, int(math.ceil(width / step)) * step)
+
+
+def bucket_size(width, step=TEXTURE_BUCKET):
+    """(width, height) of the bucket variant; textures keep the canvas aspect ratio"""
+    w = bucket_width(width, step)
+    return w, int(math.ceil(w * CANVAS['height'] / CANVAS['width']))
+
+
+class TextureCache:
+    """Resized variants of source images, at most `max_entries` of them
+
+    `sources` maps surface names to full-size PIL images (or None when a
+    texture is missing). `wrap` turns a resized PIL image into whatever the
+    canvas draws, e.g. ImageTk.PhotoImage; it is only called from `put` and
+    `get`, so `render` is safe to run off the Tk thread.
+    """
+
+    def __init__(self, sources, max_entries=TEXTURE_CACHE_SIZE, wrap=None):
+        self.sources = sources
+        self.max_entries = max_entries
+        self.wrap = wrap or (lambda image: image)
+        self._entries = OrderedDict()  # (surface, bucket) -> [image, high_quality]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, surface, width, fast=False):
+        """Resized PIL image for `surface` at the bucket covering `width` (no caching)"""
+        source = self.sources.get(surface)
+        if source is None:
+            return None
+        return source.resize(bucket_size(width), FAST_RESAMPLE if fast else HIGH_QUALITY_RESAMPLE)
+
+    def put(self, surface, width, image, high_quality=True):
+        """Store a rendered variant, replacing a draft, and return its wrapped image"""
+        key = (surface, bucket_width(width))
+        entry = [self.wrap(image), high_quality]
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry[0]
+
+    def get(self, surface, width, fast=False):
+        """Wrapped texture covering `width`, rendering it on a miss
+
+        A draft satisfies a fast request; a high-quality request re-renders it.
+        """
+        if self.sources.get(surface) is None:
+            return None
+        key = (surface, bucket_width(width))
+        entry = self._entries.get(key)
+        if entry is not None and (entry[1] or fast):
+            self._entries.move_to_end(key)
+            return entry[0]
+        return self.put(surface, width, self.render(surface, width, fast), not fast)
+
+    def is_draft(self, surface, width):
+        """True if the cached variant covering `width` still needs a high-quality resize"""
+        entry = self._entries.get((surface, bucket_width(width)))
+        return entry is not None and not entry[1]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,162 @@
+"""
+Printable worksheet generator for ForceQuest
+Builds self-contained HTML worksheets (problems, diagrams and answer key)
+from random scenarios, spread across a process pool.
+
+Usage:
+    python worksheets.py --count 200 --problems 8 --out worksheets
+"""
+import argparse
+import base64
+import functools
+import html
+import io
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+
+from config import (SCENARIOS, SURFACE_MATERIALS, OBJECT_SHAPES, FORCE_ANGLES, PUSH_MODES,
+                    SURFACE_FRICTION, SHAPE_FRICTION_FACTOR, FORCE_ANGLE_MAP)
+from physics_engine import PhysicsCalculator
+from utils.offscreen import render_scene
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'templates')
+TEMPLATE_NAMES = ('worksheet', 'problem', 'answer')
+DIAGRAM_SCALE = 0.6
+
+# Per-process template cache, filled once by the pool initializer
+_TEMPLATES = {}
+
+
+def read_templates(directory=TEMPLATE_DIR):
+    """Read the HTML templates once so they can be shared with every worker"""
+    templates = {}
+    for name in TEMPLATE_NAMES:
+        with open(os.path.join(directory, f"{name}.html"), encoding="utf-8") as f:
+            templates[name] = f.read()
+    return templates
+
+
+def _init_worker(templates):
+    """Pool initializer: compile the shared templates in this process"""
+    _TEMPLATES.clear()
+    _TEMPLATES.update({name: Template(text) for name, text in templates.items()})
+
+
+def random_problem(rng):
+    """Random scenario params; about one in eight problems has too little force"""
+    scenario = rng.choice(SCENARIOS)
+    surface = rng.choice(SURFACE_MATERIALS)
+    shape = rng.choice(OBJECT_SHAPES)
+    force_angle_mode = rng.choice(FORCE_ANGLES) if scenario == "Pushing Object" else "Horizontal"
+    params = {
+        'F': None,
+        'd': float(rng.randint(2, 30)),
+        'm': round(rng.uniform(2.0, 50.0), 1),
+        'angle': float(rng.randint(10, 45)) if scenario == "Inclined Plane" else 0.0,
+        'mu': SURFACE_FRICTION[surface] * SHAPE_FRICTION_FACTOR[shape],
+        'force_angle': FORCE_ANGLE_MAP[force_angle_mode],
+        'scenario': scenario,
+        'shape': shape,
+        'surface': surface,
+        'push_mode': rng.choice(PUSH_MODES),
+    }
+
+    # Size the applied force against the required force
+    F_req = PhysicsCalculator().calculate_motion(dict(params))['F_req']
+    factor = rng.uniform(0.6, 0.95) if rng.random() < 0.125 else rng.uniform(1.1, 2.0)
+    params['F'] = float(round(F_req * factor))
+    return params
+
+
+@functools.lru_cache(maxsize=256)
+def _diagram(scenario, shape, angle, mu):
+    """Base64 PNG diagram, cached per process by layout inputs"""
+    image = render_scene({'scenario': scenario, 'shape': shape, 'angle': angle, 'mu': mu}, DIAGRAM_SCALE)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def problem_statement(params):
+    """Plain-language problem text for params"""
+    scenario = params['scenario']
+    shape = params['shape'].lower()
+    if scenario == "Lifting Object":
+        setup = f"A crane lifts a {params['m']} kg {shape} straight up through {params['d']:.0f} m"
+        setup += f" with a force of {params['F']:.0f} N."
+    elif scenario == "Inclined Plane":
+        setup = (f"A {params['m']} kg {shape} is pushed {params['d']:.0f} m up a {params['angle']:.0f}° "
+                 f"{params['surface'].lower()} ramp with a force of {params['F']:.0f} N parallel to the slope.")
+    else:
+        direction = {0: "horizontally", 30: "angled 30° upward", -30: "angled 30° downward"}
+        setup = (f"A {params['m']} kg {shape} on {params['surface'].lower()} is pushed {params['d']:.0f} m "
+                 f"with a force of {params['F']:.0f} N {direction.get(params['force_angle'], '')}.")
+    return (f"{setup} The effective friction coefficient is μ = {params['mu']:.3f} (g = 9.81 m/s²). "
+            f"Does the object move? If so, find the net work, the change in kinetic energy "
+            f"and the final velocity.")
+
+
+def build_worksheet(number, seed, n_problems, out_dir):
+    """Generate one worksheet file and return its path (runs in a worker)"""
+    rng = random.Random(seed)
+    calc = PhysicsCalculator()
+    problems, answers = [], []
+    for i in range(1, n_problems + 1):
+        params = random_problem(rng)
+        statement = problem_statement(params)
+        results = calc.calculate_motion(dict(params))
+
+        problems.append(_TEMPLATES['problem'].safe_substitute(
+            number=i, scenario=html.escape(params['scenario']),
+            diagram=_diagram(params['scenario'], params['shape'], params['angle'], params['mu']),
+            statement=html.escape(statement),
+            blanks="Moves? ______ &nbsp; W<sub>net</sub> = ________ J &nbsp; "
+                   "ΔKE = ________ J &nbsp; v = ________ m/s"))
+
+        if results['moves']:
+            summary = (f"Moves. W_net = {results['net_work']:.2f} J, ΔKE = {results['ke_final']:.2f} J, "
+                       f"v = {results['v_final']:.2f} m/s")
+        else:
+            summary = "Does not move: the applied force is below the required force."
+        answers.append(_TEMPLATES['answer'].safe_substitute(
+            number=i, summary=html.escape(summary), solution=html.escape(results['solution'].strip())))
+
+    page = _TEMPLATES['worksheet'].safe_substitute(
+        title="P6Quest Worksheet — Work, Energy &amp; Power", number=number, seed=seed,
+        problems="\n".join(problems), answers="\n".join(answers))
+    path = os.path.join(out_dir, f"worksheet_{number:03d}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return path
+
+
+def generate_worksheets(count, n_problems, out_dir, seed=0, workers=None):
+    """Build `count` worksheets across a process pool; returns their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    templates = read_templates()
+    numbers = range(1, count + 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(templates,)) as pool:
+        return list(pool.map(build_worksheet, numbers, [seed + n for n in numbers],
+                             [n_problems] * count, [out_dir] * count, chunksize=4))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate ForceQuest worksheets with answer keys")
+    parser.add_argument("--count", type=int, default=10, help="number of worksheets")
+    parser.add_argument("--problems", type=int, default=8, help="problems per worksheet")
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument("--out", default="worksheets", help="output directory")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = generate_worksheets(args.count, args.problems, args.out, args.seed, args.workers)
+    print(f"Wrote {len(paths)} worksheets to {args.out} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()